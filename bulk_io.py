@@ -0,0 +1,129 @@
+"""Streaming JSON Lines / CSV import and export for snippets and clipboard history.
+
+Files are read and written one record at a time, so exports and imports of
+any size run in constant memory. The format is chosen by file extension:
+`.csv` is CSV, anything else is JSON Lines. Binary payloads are base64
+encoded; timestamps are the database's UTC 'YYYY-MM-DD HH:MM:SS' values.
+"""
+import base64
+import csv
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+SNIPPET_FIELDS = ('title', 'content', 'category', 'expansion_trigger', 'created_at', 'updated_at')
+CLIPBOARD_FIELDS = ('content_type', 'content_text', 'preview', 'created_at', 'content_data', 'formats')
+
+FILE_FILTER = 'JSON Lines (*.jsonl);;CSV (*.csv);;All files (*)'
+
+# CSV cells may hold whole documents or base64 images
+csv.field_size_limit(2 ** 31 - 1)
+
+
+def _is_csv(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() == '.csv'
+
+
+def _b64encode(data: Optional[bytes]) -> Optional[str]:
+    return base64.b64encode(data).decode('ascii') if data else None
+
+
+def _b64decode(text: Optional[str]) -> Optional[bytes]:
+    return base64.b64decode(text) if text else None
+
+
+def _read_records(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if _is_csv(path):
+            yield from csv.DictReader(f)
+            return
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f'{os.path.basename(path)} line {line_no}: {e}') from None
+
+
+def _write_records(path: str, fields, records: Iterable[Dict[str, Any]],
+                   progress: Optional[Callable[[int], None]] = None, every: int = 1000) -> int:
+    """Write to `path` + '.tmp', moved into place only once complete.
+
+    A failed export, or one cancelled by `progress` raising, leaves `path` as it was.
+    """
+    count = 0
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            if _is_csv(path):
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                writer.writeheader()
+                write = writer.writerow
+            else:
+                def write(record):
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write('\n')
+            for record in records:
+                write(record)
+                count += 1
+                if progress and count % every == 0:
+                    progress(count)
+        if progress:
+            progress(count)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+# ----- snippets -----
+
+def export_snippets(db, path: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    """Write all snippets to `path`. Returns the number written."""
+    records = ({k: s.get(k) for k in SNIPPET_FIELDS} for s in db.iter_snippets())
+    return _write_records(path, SNIPPET_FIELDS, records, progress)
+
+
+def import_snippets(db, path: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    """Load snippets from `path` in one transaction. Returns the number imported."""
+    return db.import_snippets(_read_records(path), progress=progress)
+
+
+# ----- clipboard history -----
+
+def _clipboard_record(item: Dict[str, Any], csv_format: bool) -> Dict[str, Any]:
+    formats = {mime: _b64encode(data) for mime, data in (item.get('formats') or {}).items()}
+    record = {k: item.get(k) for k in CLIPBOARD_FIELDS}
+    record['content_data'] = _b64encode(item.get('content_data'))
+    # CSV cells are flat; nest the format map as a JSON string there
+    record['formats'] = (json.dumps(formats) if formats else '') if csv_format else formats
+    return record
+
+
+def _clipboard_item(record: Dict[str, Any]) -> Dict[str, Any]:
+    formats = record.get('formats') or {}
+    if isinstance(formats, str):
+        formats = json.loads(formats)
+    return {
+        'content_type': record.get('content_type') or 'text',
+        'content_text': record.get('content_text') or None,
+        'preview': record.get('preview') or None,
+        'created_at': record.get('created_at') or None,
+        'content_data': _b64decode(record.get('content_data')),
+        'formats': {mime: _b64decode(data) for mime, data in formats.items() if data},
+    }
+
+
+def export_clipboard_history(db, path: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    """Write the whole clipboard history, including rich formats, to `path`."""
+    csv_format = _is_csv(path)
+    records = (_clipboard_record(item, csv_format) for item in db.iter_clipboard_items())
+    return _write_records(path, CLIPBOARD_FIELDS, records, progress, every=200)
+
+
+def import_clipboard_history(db, path: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    """Load clipboard history from `path` in one transaction. Returns the number imported."""
+    return db.import_clipboard_items((_clipboard_item(r) for r in _read_records(path)), progress=progress)
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class RecentClipboardItems:
+    """Bounded in-memory ring of the most recently captured clipboard items.
+
+    Items use the same dict shape as `Database.get_clipboard_items` rows
+    (id, content_type, content_data, content_text, preview, created_at with
+    created_at as a local 'YYYY-MM-DD HH:MM:SS' string). Payloads larger than
+    `payload_limit` bytes/characters are dropped from the ring; such items are
+    still listed but `get(..., need_payload=True)` returns None so callers fall
+    back to the database.
+    """
+
+    def __init__(self, capacity: int = 200, payload_limit: int = 256 * 1024):
+        self.capacity = max(1, int(capacity))
+        self.payload_limit = payload_limit
+        self._items: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()  # oldest first
+        self._partial = set()  # ids whose payload was not kept in memory
+        self._truncated = False  # True once older items exist only in the database
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def prime(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Reset the ring from database rows ordered newest first."""
+        self._items.clear()
+        self._partial.clear()
+        rows = list(rows)
+        for row in reversed(rows[:self.capacity]):
+            self._store(dict(row))
+        # If the query filled the ring there may be older rows left behind
+        self._truncated = len(rows) >= self.capacity
+
+    def add(self, item: Dict[str, Any]) -> None:
+        """Append a freshly captured item, evicting the oldest when full."""
+        self._store(dict(item))
+        while len(self._items) > self.capacity:
+            old_id, _ = self._items.popitem(last=False)
+            self._partial.discard(old_id)
+            self._truncated = True
+
+    def remove(self, item_id: int) -> None:
+        self._items.pop(item_id, None)
+        self._partial.discard(item_id)
+
+    def get(self, item_id: int, need_payload: bool = False) -> Optional[Dict[str, Any]]:
+        """Return a cached item, or None if absent (or its payload was dropped)."""
+        item = self._items.get(item_id)
+        if item is None or (need_payload and item_id in self._partial):
+            return None
+        return item
+
+    def latest(self, content_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent item, optionally of a given content type."""
+        for item in reversed(self._items.values()):
+            if content_type is None or item.get('content_type') == content_type:
+                return item
+        return None
+
+    def items(self, content_type: Optional[str] = None, date: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Cached items newest first, filtered by type and local date (YYYY-MM-DD)."""
+        result = []
+        for item in reversed(self._items.values()):
+            if content_type and content_type != 'all' and item.get('content_type') != content_type:
+                continue
+            if date and not (item.get('created_at') or '').startswith(date):
+                continue
+            result.append(item)
+            if limit and len(result) >= limit:
+                break
+        return result
+
+    def covers_date(self, date: str) -> bool:
+        """True if every item captured on `date` (YYYY-MM-DD) is in the ring."""
+        if not self._truncated:
+            return True
+        if not self._items:
+            return False
+        oldest = next(iter(self._items.values()))
+        return (oldest.get('created_at') or '')[:10] < date
+
+    def _store(self, item: Dict[str, Any]) -> None:
+        item_id = item['id']
+        data = item.get('content_data')
+        text = item.get('content_text')
+        if (data is not None and len(data) > self.payload_limit) or \
+                (text is not None and len(text) > self.payload_limit):
+            # Keep metadata only; the full payload is fetched from the database
+            item['content_data'] = None
+            item['content_text'] = None
+            self._partial.add(item_id)
+        else:
+            self._partial.discard(item_id)
+        self._items[item_id] = item
@@ -1,8 +1,13 @@
 import sqlite3
 import os
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import hashlib
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, Callable
+
+from metrics import REGISTRY as metrics
+from migrations import Migration, run_migrations
 
 # Set up logging
 logging.basicConfig(
@@ -15,204 +20,483 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Payloads smaller than this are stored raw; compressing them rarely pays off
+BLOB_COMPRESS_MIN_SIZE = 512
+
+
+def _pack_blob(data: bytes) -> Tuple[str, bytes, int]:
+    """Return (hash, stored_bytes, compressed_flag) for a clipboard format payload."""
+    digest = hashlib.sha256(data).hexdigest()
+    if len(data) >= BLOB_COMPRESS_MIN_SIZE:
+        packed = zlib.compress(data, 6)
+        if len(packed) < len(data):
+            return digest, packed, 1
+    return digest, data, 0
+
+
+def _unpack_blob(data: bytes, compressed: int) -> bytes:
+    return zlib.decompress(data) if compressed else bytes(data)
+
+
+# FTS sync triggers per content table: (fts table, [(trigger name, body)]).
+# Bulk imports drop these and rebuild the FTS index once at the end.
+_FTS_TRIGGERS = {
+    'snippets': ('snippets_fts', [
+        ('snippets_fts_insert', """AFTER INSERT ON snippets BEGIN
+                INSERT INTO snippets_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END"""),
+        ('snippets_fts_delete', """AFTER DELETE ON snippets BEGIN
+                INSERT INTO snippets_fts(snippets_fts, rowid, title, content) VALUES('delete', old.id, old.title, old.content);
+            END"""),
+        # Category and trigger changes leave the indexed text alone
+        ('snippets_fts_update', """AFTER UPDATE OF title, content ON snippets BEGIN
+                INSERT INTO snippets_fts(snippets_fts, rowid, title, content) VALUES('delete', old.id, old.title, old.content);
+                INSERT INTO snippets_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END"""),
+    ]),
+    'clipboard_history': ('clipboard_fts', [
+        ('clipboard_fts_insert', """AFTER INSERT ON clipboard_history BEGIN
+                INSERT INTO clipboard_fts(rowid, content_text, preview) VALUES (new.id, new.content_text, new.preview);
+            END"""),
+        ('clipboard_fts_delete', """AFTER DELETE ON clipboard_history BEGIN
+                INSERT INTO clipboard_fts(clipboard_fts, rowid, content_text, preview) VALUES('delete', old.id, old.content_text, old.preview);
+            END"""),
+        # Image rows get their OCR text after capture
+        ('clipboard_fts_update', """AFTER UPDATE OF content_text, preview ON clipboard_history BEGIN
+                INSERT INTO clipboard_fts(clipboard_fts, rowid, content_text, preview) VALUES('delete', old.id, old.content_text, old.preview);
+                INSERT INTO clipboard_fts(rowid, content_text, preview) VALUES (new.id, new.content_text, new.preview);
+            END"""),
+    ]),
+}
+
+# FTS sync triggers exactly as schema version 1 created them. Applied
+# migrations stay frozen: changes to _FTS_TRIGGERS reach existing databases
+# through a new migration that drops and recreates the affected triggers.
+_V1_FTS_TRIGGERS_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS snippets_fts_insert AFTER INSERT ON snippets BEGIN
+                INSERT INTO snippets_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS snippets_fts_delete AFTER DELETE ON snippets BEGIN
+                INSERT INTO snippets_fts(snippets_fts, rowid, title, content) VALUES('delete', old.id, old.title, old.content);
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS snippets_fts_update AFTER UPDATE OF title, content ON snippets BEGIN
+                INSERT INTO snippets_fts(snippets_fts, rowid, title, content) VALUES('delete', old.id, old.title, old.content);
+                INSERT INTO snippets_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS clipboard_fts_insert AFTER INSERT ON clipboard_history BEGIN
+                INSERT INTO clipboard_fts(rowid, content_text, preview) VALUES (new.id, new.content_text, new.preview);
+            END""",
+    """CREATE TRIGGER IF NOT EXISTS clipboard_fts_delete AFTER DELETE ON clipboard_history BEGIN
+                INSERT INTO clipboard_fts(clipboard_fts, rowid, content_text, preview) VALUES('delete', old.id, old.content_text, old.preview);
+            END""",
+]
+
+# Schema version 4: the clipboard UPDATE trigger, frozen as applied
+_V4_CLIPBOARD_FTS_UPDATE_SQL = """CREATE TRIGGER IF NOT EXISTS clipboard_fts_update AFTER UPDATE OF content_text, preview ON clipboard_history BEGIN
+                INSERT INTO clipboard_fts(clipboard_fts, rowid, content_text, preview) VALUES('delete', old.id, old.content_text, old.preview);
+                INSERT INTO clipboard_fts(rowid, content_text, preview) VALUES (new.id, new.content_text, new.preview);
+            END"""
+
+# content_text of an image row until the OCR indexer has filled it in
+IMAGE_PLACEHOLDER_TEXT = '[Image]'
+
+# Rows per executemany() call during bulk imports
+BULK_BATCH_SIZE = 1000
+
+_SNIPPETS_TABLE_SQL = '''
+            CREATE TABLE {if_not_exists}{name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                category_id INTEGER REFERENCES categories(id) ON DELETE SET NULL,
+                expansion_trigger TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )'''
+
+_SNIPPETS_FTS_SQL = '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts USING fts5(title, content, content='snippets', content_rowid='id')'''
+
+# B-tree indexes over unbounded text (useless for LIKE '%x%') or superseded
+# by the composite indexes; dropped by optimize_indexes() when unused
+REDUNDANT_INDEXES = (
+    'idx_snippets_content',
+    'idx_snippets_category_id',
+    'idx_clipboard_content_text',
+    'idx_clipboard_preview',
+    'idx_clipboard_content_type',
+)
+
+
+def _local_day_start_utc(day) -> str:
+    """UTC timestamp of local midnight starting `day` ('YYYY-MM-DD' or date), in created_at format"""
+    if isinstance(day, str):
+        day = datetime.strptime(day[:10], '%Y-%m-%d')
+    else:
+        day = datetime(day.year, day.month, day.day)
+    return day.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _next_day(day) -> datetime:
+    if isinstance(day, str):
+        day = datetime.strptime(day[:10], '%Y-%m-%d')
+    return datetime(day.year, day.month, day.day) + timedelta(days=1)
+
+
+# Snippet rows as returned to callers: the category name is joined in
+_SNIPPET_SELECT = '''
+    SELECT s.id, s.title, s.content, COALESCE(c.name, '') AS category, s.category_id,
+           s.expansion_trigger, s.created_at, s.updated_at
+    FROM snippets s LEFT JOIN categories c ON c.id = s.category_id
+'''
+
+
 class Database:
     def __init__(self, db_path: str = 'clip_snippet_manager.db'):
         self.db_path = db_path
+        # Settings table mirrored in memory; loaded on first access
+        self._settings: Optional[Dict[str, str]] = None
+        self._settings_listeners: List[Callable[[str, Optional[str]], None]] = []
         self._init_db()
         
     def _get_connection(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        # Off by default in SQLite; snippets.category_id relies on ON DELETE SET NULL
+        conn.execute('PRAGMA foreign_keys = ON')
         return conn
         
     def _init_db(self):
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Create snippets table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS snippets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                category TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
-            
-            # Create clipboard_history table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS clipboard_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                content_type TEXT NOT NULL,
-                content_data BLOB,
-                content_text TEXT,
-                preview TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
-            
-            # Create world_clocks table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS world_clocks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                city TEXT NOT NULL,
-                timezone TEXT NOT NULL
-            )''')
+            run_migrations(conn, self._migrations())
+    
+    def _migrations(self) -> List[Migration]:
+        """Schema steps in version order. Append new steps; never edit applied ones."""
+        return [
+            Migration(1, 'base schema', self._create_base_schema),
+            Migration(2, 'drop redundant text indexes', self._drop_redundant_indexes),
+            Migration(3, 'ocr result cache', self._create_ocr_cache),
+            Migration(4, 'clipboard fts update trigger', lambda cursor: cursor.execute(_V4_CLIPBOARD_FTS_UPDATE_SQL)),
+            Migration(5, 'ocr index cursor table', self._create_ocr_index_state),
+            Migration(6, 'recreate fts update triggers', self._recreate_fts_update_triggers),
+        ]
+        
+    def _create_base_schema(self, cursor: sqlite3.Cursor) -> None:
+        """Tables, indexes and triggers of the first versioned schema.
 
-            # Schema migration: add use_dst column if not exists
-            cursor.execute("PRAGMA table_info(world_clocks)")
-            cols = [row[1] for row in cursor.fetchall()]
-            if 'use_dst' not in cols:
-                cursor.execute('ALTER TABLE world_clocks ADD COLUMN use_dst INTEGER NOT NULL DEFAULT 1')
+        Databases from before user_version was tracked are upgraded by the
+        same step, so every statement here is idempotent.
+        """
+        # Category names with cached snippet counts, maintained by the
+        # snippet write methods so the UI never scans snippets for them
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            snippet_count INTEGER NOT NULL DEFAULT 0
+        )''')
+        
+        # Create snippets table
+        cursor.execute(_SNIPPETS_TABLE_SQL.format(if_not_exists='IF NOT EXISTS ', name='snippets'))
+        
+        # Schema migration: add expansion_trigger column (text expansion abbreviations)
+        cursor.execute("PRAGMA table_info(snippets)")
+        snippet_cols = [row[1] for row in cursor.fetchall()]
+        if 'expansion_trigger' not in snippet_cols:
+            cursor.execute('ALTER TABLE snippets ADD COLUMN expansion_trigger TEXT')
+        # Schema migration: free-text category column -> categories.id
+        if 'category' in snippet_cols:
+            self._migrate_snippet_categories(cursor)
+        
+        # Create clipboard_history table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS clipboard_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_type TEXT NOT NULL,
+            content_data BLOB,
+            content_text TEXT,
+            preview TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+        
+        # Extra clipboard formats (HTML, RTF, URI lists) are stored as
+        # content-addressed blobs so identical payloads are kept only once
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS clipboard_blobs (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            compressed INTEGER NOT NULL DEFAULT 0,
+            size INTEGER NOT NULL
+        )''')
+        
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS clipboard_formats (
+            item_id INTEGER NOT NULL,
+            mime_type TEXT NOT NULL,
+            blob_hash TEXT NOT NULL,
+            PRIMARY KEY (item_id, mime_type)
+        )''')
+        
+        # Create world_clocks table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS world_clocks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            city TEXT NOT NULL,
+            timezone TEXT NOT NULL
+        )''')
 
-            # Create settings table for app-wide preferences
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )''')
-            
-            # Create custom_urls table for World Clock Integrations
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS custom_urls (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                url TEXT NOT NULL,
-                integration_type TEXT NOT NULL DEFAULT 'email',
-                app_path TEXT,
-                parameters TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
-            
-            # Create wc_parameters table for World Clock parameters
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS wc_parameters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                param_name TEXT NOT NULL UNIQUE,
-                param_display TEXT NOT NULL,
-                param_description TEXT,
-                param_sample TEXT,
-                param_category TEXT DEFAULT 'meeting'
-            )''')
-            
-            # Insert default World Clock parameters
-            cursor.execute('''
-            INSERT OR IGNORE INTO wc_parameters (param_name, param_display, param_description, param_sample, param_category) VALUES
-            ('%wc_city_name%', 'City Name', 'Name of the selected city', 'Houston', 'basic'),
-            ('%wc_local_time%', 'Local Time', 'Your local time for the meeting', '2026-01-30 14:00', 'time'),
-            ('%wc_target_time%', 'Target Time', 'Target city time for the meeting', '2026-01-30 02:30', 'time'),
-            ('%wc_duration%', 'Duration', 'Meeting duration in minutes', '60', 'meeting'),
-            ('%wc_meeting_url%', 'Meeting URL', 'Generated meeting URL', 'https://teams.microsoft.com/...', 'meeting'),
-            ('%wc_timezone%', 'Timezone', 'Target city timezone', 'America/Chicago', 'basic'),
-            ('%wc_local_timezone%', 'Local Timezone', 'Your local timezone', 'Asia/Kolkata', 'basic'),
-            ('%wc_date%', 'Date', 'Meeting date', '2026-01-30', 'basic'),
-            ('%wc_end_time%', 'End Time', 'Meeting end time (local)', '2026-01-30 15:00', 'time'),
-            ('%wc_target_end_time%', 'Target End Time', 'Meeting end time (target)', '2026-01-30 03:30', 'time')
-            ''')
-            
-            # Create indexes
-            cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_snippets_category 
-            ON snippets(category)''')
-            
-            cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_snippets_title 
-            ON snippets(title)''')
-            
-            cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_snippets_content 
-            ON snippets(content)''')
-            
-            cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_clipboard_created 
-            ON clipboard_history(created_at)''')
-            
-            cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_clipboard_content_type 
-            ON clipboard_history(content_type)''')
-            
-            cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_clipboard_content_text 
-            ON clipboard_history(content_text)''')
-            
-            cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_clipboard_preview 
-            ON clipboard_history(preview)''')
-            
-            # Create full-text search virtual tables for faster search
-            cursor.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts USING fts5(title, content, category, content='snippets', content_rowid='id')''')
-            
-            cursor.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS clipboard_fts USING fts5(content_text, preview, content='clipboard_history', content_rowid='id')''')
-            
-            # Create triggers to keep FTS tables in sync
-            cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS snippets_fts_insert AFTER INSERT ON snippets BEGIN
-                INSERT INTO snippets_fts(rowid, title, content, category) VALUES (new.id, new.title, new.content, new.category);
-            END''')
-            
-            cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS snippets_fts_delete AFTER DELETE ON snippets BEGIN
-                INSERT INTO snippets_fts(snippets_fts, rowid, title, content, category) VALUES('delete', old.id, old.title, old.content, old.category);
-            END''')
-            
-            cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS snippets_fts_update AFTER UPDATE ON snippets BEGIN
-                INSERT INTO snippets_fts(snippets_fts, rowid, title, content, category) VALUES('delete', old.id, old.title, old.content, old.category);
-                INSERT INTO snippets_fts(rowid, title, content, category) VALUES (new.id, new.title, new.content, new.category);
-            END''')
-            
-            cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS clipboard_fts_insert AFTER INSERT ON clipboard_history BEGIN
-                INSERT INTO clipboard_fts(rowid, content_text, preview) VALUES (new.id, new.content_text, new.preview);
-            END''')
+        # Schema migration: add use_dst column if not exists
+        cursor.execute("PRAGMA table_info(world_clocks)")
+        cols = [row[1] for row in cursor.fetchall()]
+        if 'use_dst' not in cols:
+            cursor.execute('ALTER TABLE world_clocks ADD COLUMN use_dst INTEGER NOT NULL DEFAULT 1')
+
+        # Create settings table for app-wide preferences
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )''')
+        
+        # Create custom_urls table for World Clock Integrations
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS custom_urls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            url TEXT NOT NULL,
+            integration_type TEXT NOT NULL DEFAULT 'email',
+            app_path TEXT,
+            parameters TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+        
+        # Create wc_parameters table for World Clock parameters
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wc_parameters (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            param_name TEXT NOT NULL UNIQUE,
+            param_display TEXT NOT NULL,
+            param_description TEXT,
+            param_sample TEXT,
+            param_category TEXT DEFAULT 'meeting'
+        )''')
+        
+        # Insert default World Clock parameters
+        cursor.execute('''
+        INSERT OR IGNORE INTO wc_parameters (param_name, param_display, param_description, param_sample, param_category) VALUES
+        ('%wc_city_name%', 'City Name', 'Name of the selected city', 'Houston', 'basic'),
+        ('%wc_local_time%', 'Local Time', 'Your local time for the meeting', '2026-01-30 14:00', 'time'),
+        ('%wc_target_time%', 'Target Time', 'Target city time for the meeting', '2026-01-30 02:30', 'time'),
+        ('%wc_duration%', 'Duration', 'Meeting duration in minutes', '60', 'meeting'),
+        ('%wc_meeting_url%', 'Meeting URL', 'Generated meeting URL', 'https://teams.microsoft.com/...', 'meeting'),
+        ('%wc_timezone%', 'Timezone', 'Target city timezone', 'America/Chicago', 'basic'),
+        ('%wc_local_timezone%', 'Local Timezone', 'Your local timezone', 'Asia/Kolkata', 'basic'),
+        ('%wc_date%', 'Date', 'Meeting date', '2026-01-30', 'basic'),
+        ('%wc_end_time%', 'End Time', 'Meeting end time (local)', '2026-01-30 15:00', 'time'),
+        ('%wc_target_end_time%', 'Target End Time', 'Meeting end time (target)', '2026-01-30 03:30', 'time')
+        ''')
+        
+        # Create indexes
+        # Category filter + title order; the prefix also serves category_id lookups
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_snippets_category_title 
+        ON snippets(category_id, title)''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_snippets_title 
+        ON snippets(title)''')
+        
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_snippets_trigger 
+        ON snippets(expansion_trigger) WHERE expansion_trigger IS NOT NULL AND expansion_trigger != ""''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_clipboard_created 
+        ON clipboard_history(created_at)''')
+        
+        # Type filter + newest-first order within the created_at range
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_clipboard_type_created 
+        ON clipboard_history(content_type, created_at)''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_clipboard_formats_blob 
+        ON clipboard_formats(blob_hash)''')
+        
+        # Create full-text search virtual tables for faster search
+        cursor.execute(_SNIPPETS_FTS_SQL)
+        
+        cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS clipboard_fts USING fts5(content_text, preview, content='clipboard_history', content_rowid='id')''')
+        
+        # Create triggers to keep FTS tables in sync
+        for sql in _V1_FTS_TRIGGERS_SQL:
+            cursor.execute(sql)
+        
+        # Drop format references together with their history item; the
+        # blobs themselves are purged in cleanup_old_items
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS clipboard_formats_delete AFTER DELETE ON clipboard_history BEGIN
+            DELETE FROM clipboard_formats WHERE item_id = old.id;
+        END''')
             
-            cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS clipboard_fts_delete AFTER DELETE ON clipboard_history BEGIN
-                INSERT INTO clipboard_fts(clipboard_fts, rowid, content_text, preview) VALUES('delete', old.id, old.content_text, old.preview);
-            END''')
+    def _create_fts_triggers(self, cursor: sqlite3.Cursor, table: str) -> None:
+        for name, body in _FTS_TRIGGERS[table][1]:
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+    
+    def _drop_fts_triggers(self, cursor: sqlite3.Cursor, table: str) -> None:
+        for name, _ in _FTS_TRIGGERS[table][1]:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    
+    def _recreate_fts_update_triggers(self, cursor: sqlite3.Cursor) -> None:
+        """Replace the UPDATE sync triggers with their current definitions.
+
+        Databases from before versioning kept an `AFTER UPDATE ON snippets`
+        trigger that version 1's CREATE IF NOT EXISTS never replaced.
+        """
+        for _, triggers in _FTS_TRIGGERS.values():
+            for name, body in triggers:
+                if name.endswith('_update'):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+                    cursor.execute(f'CREATE TRIGGER {name} {body}')
+
+    def _rebuild_fts(self, cursor: sqlite3.Cursor, table: str) -> None:
+        """Recreate the sync triggers of `table` and rebuild its FTS index from scratch"""
+        self._create_fts_triggers(cursor, table)
+        fts_table = _FTS_TRIGGERS[table][0]
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES('rebuild')")
             
-            conn.commit()
+    def _migrate_snippet_categories(self, cursor: sqlite3.Cursor) -> None:
+        """Rebuild snippets with a category_id column in place of the free-text category.
+
+        Categories are created from the distinct names, rows are copied with
+        their ids, and the FTS index is recreated over title and content only.
+        """
+        cursor.execute('''
+            INSERT OR IGNORE INTO categories (name)
+            SELECT DISTINCT category FROM snippets WHERE category IS NOT NULL AND category != ""
+        ''')
+        cursor.execute('DROP TABLE IF EXISTS snippets_new')
+        cursor.execute(_SNIPPETS_TABLE_SQL.format(if_not_exists='', name='snippets_new'))
+        cursor.execute('''
+            INSERT INTO snippets_new (id, title, content, category_id, expansion_trigger, created_at, updated_at)
+            SELECT s.id, s.title, s.content, c.id, s.expansion_trigger, s.created_at, s.updated_at
+            FROM snippets s LEFT JOIN categories c ON c.name = s.category
+        ''')
+        self._drop_fts_triggers(cursor, 'snippets')
+        cursor.execute('DROP TABLE IF EXISTS snippets_fts')
+        cursor.execute('DROP TABLE snippets')
+        cursor.execute('ALTER TABLE snippets_new RENAME TO snippets')
+        cursor.execute(_SNIPPETS_FTS_SQL)
+        self._rebuild_fts(cursor, 'snippets')
+        self._recount_categories(cursor)
+        logger.info('Migrated snippet categories to the categories table')
+    
+    # Category counts
+    def _category_id(self, cursor: sqlite3.Cursor, name: Optional[str], create: bool = True) -> Optional[int]:
+        """Id of the category called `name`, creating it if needed (None for no category)"""
+        if not name:
+            return None
+        cursor.execute('SELECT id FROM categories WHERE name = ?', (name,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+        if not create:
+            return None
+        cursor.execute('INSERT INTO categories (name) VALUES (?)', (name,))
+        return cursor.lastrowid
+    
+    def _adjust_category_count(self, cursor: sqlite3.Cursor, category_id: Optional[int], delta: int) -> None:
+        """Add `delta` to a category's snippet count, dropping the category once unused"""
+        if category_id is None or not delta:
+            return
+        cursor.execute('UPDATE categories SET snippet_count = snippet_count + ? WHERE id = ?', (delta, category_id))
+        if delta < 0:
+            cursor.execute('DELETE FROM categories WHERE id = ? AND snippet_count <= 0', (category_id,))
+    
+    def _recount_categories(self, cursor: sqlite3.Cursor) -> None:
+        """Rebuild all category counts from the snippets table"""
+        cursor.execute('''
+            UPDATE categories
+            SET snippet_count = (SELECT COUNT(*) FROM snippets WHERE category_id = categories.id)
+        ''')
+        cursor.execute('DELETE FROM categories WHERE snippet_count <= 0')
+    
+    def get_category_counts(self) -> Dict[str, int]:
+        """Get category name -> snippet count, ordered by name"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT name, snippet_count FROM categories WHERE snippet_count > 0 ORDER BY name')
+            return {row[0]: row[1] for row in cursor.fetchall()}
             
     # Snippet operations
-    def add_snippet(self, title: str, content: str, category: str = '') -> int:
+    def add_snippet(self, title: str, content: str, category: str = '', trigger: Optional[str] = None) -> int:
         """Add a new snippet to the database"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            category_id = self._category_id(cursor, category)
             cursor.execute('''
-                INSERT INTO snippets (title, content, category, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (title, content, category))
+                INSERT INTO snippets (title, content, category_id, expansion_trigger, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (title, content, category_id, trigger or None))
+            snippet_id = cursor.lastrowid
+            self._adjust_category_count(cursor, category_id, 1)
             conn.commit()
-            return cursor.lastrowid
+            return snippet_id
             
-    def update_snippet(self, snippet_id: int, title: str, content: str, category: str = '') -> bool:
-        """Update an existing snippet"""
+    def update_snippet(self, snippet_id: int, title: str, content: str, category: str = '',
+                       trigger: Optional[str] = None) -> bool:
+        """Update an existing snippet. `trigger` None keeps the current one, '' clears it."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute('SELECT category_id FROM snippets WHERE id = ?', (snippet_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return False
+            category_id = self._category_id(cursor, category)
             cursor.execute('''
                 UPDATE snippets 
-                SET title = ?, content = ?, category = ?, updated_at = CURRENT_TIMESTAMP
+                SET title = ?, content = ?, category_id = ?, updated_at = CURRENT_TIMESTAMP,
+                    expansion_trigger = CASE WHEN ? IS NULL THEN expansion_trigger ELSE NULLIF(?, '') END
                 WHERE id = ?
-            ''', (title, content, category, snippet_id))
+            ''', (title, content, category_id, trigger, trigger, snippet_id))
+            updated = cursor.rowcount > 0
+            if row[0] != category_id:
+                self._adjust_category_count(cursor, category_id, 1)
+                self._adjust_category_count(cursor, row[0], -1)
             conn.commit()
-            return cursor.rowcount > 0
+            return updated
+    
+    def get_snippet_triggers(self) -> Dict[str, int]:
+        """Get all text expansion triggers as trigger -> snippet id"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT expansion_trigger, id FROM snippets
+                WHERE expansion_trigger IS NOT NULL AND expansion_trigger != ""
+            ''')
+            return {row[0]: row[1] for row in cursor.fetchall()}
             
     def delete_snippet(self, snippet_id: int) -> bool:
         """Delete a snippet by ID"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute('SELECT category_id FROM snippets WHERE id = ?', (snippet_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return False
             cursor.execute('DELETE FROM snippets WHERE id = ?', (snippet_id,))
+            deleted = cursor.rowcount > 0
+            self._adjust_category_count(cursor, row[0], -1)
             conn.commit()
-            return cursor.rowcount > 0
+            return deleted
             
     def get_snippet(self, snippet_id: int) -> Optional[Dict[str, Any]]:
         """Get a single snippet by ID"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM snippets WHERE id = ?', (snippet_id,))
+            cursor.execute(_SNIPPET_SELECT + ' WHERE s.id = ?', (snippet_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
             
@@ -221,33 +505,48 @@ class Database:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             if category is not None and category != "":
-                cursor.execute('SELECT * FROM snippets WHERE category = ? ORDER BY title', (category,))
+                cursor.execute(_SNIPPET_SELECT + ' WHERE c.name = ? ORDER BY s.title', (category,))
             elif category == "":
-                # Filter for snippets with empty/NULL category
-                cursor.execute('SELECT * FROM snippets WHERE (category IS NULL OR category = "") ORDER BY title')
+                # Filter for snippets without a category
+                cursor.execute(_SNIPPET_SELECT + ' WHERE s.category_id IS NULL ORDER BY s.title')
             else:
-                cursor.execute('SELECT * FROM snippets ORDER BY title')
+                cursor.execute(_SNIPPET_SELECT + ' ORDER BY s.title')
             return [dict(row) for row in cursor.fetchall()]
             
     def get_snippet_categories(self) -> List[str]:
         """Get all unique snippet categories"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT DISTINCT category FROM snippets WHERE category IS NOT NULL AND category != ""')
+            cursor.execute('SELECT name FROM categories WHERE snippet_count > 0 ORDER BY name')
             return [row[0] for row in cursor.fetchall()]
 
     def rename_snippet_category(self, old_category: str, new_category: str) -> int:
-        """Rename a category across all snippets. Returns number of affected rows."""
+        """Rename a category. Returns the number of snippets in it.
+
+        A plain rename updates the single categories row; renaming onto an
+        existing category merges the two.
+        """
         if not old_category or new_category is None:
             return 0
+        if not new_category:
+            return self.delete_snippet_category(old_category)
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                'UPDATE snippets SET category = ?, updated_at = CURRENT_TIMESTAMP WHERE category = ?',
-                (new_category, old_category)
-            )
+            cursor.execute('SELECT id, snippet_count FROM categories WHERE name = ?', (old_category,))
+            row = cursor.fetchone()
+            if row is None:
+                return 0
+            old_id, count = row
+            target_id = self._category_id(cursor, new_category, create=False)
+            if target_id is None:
+                cursor.execute('UPDATE categories SET name = ? WHERE id = ?', (new_category, old_id))
+            elif target_id != old_id:
+                cursor.execute('UPDATE snippets SET category_id = ? WHERE category_id = ?', (target_id, old_id))
+                count = cursor.rowcount
+                self._adjust_category_count(cursor, target_id, count)
+                cursor.execute('DELETE FROM categories WHERE id = ?', (old_id,))
             conn.commit()
-            return cursor.rowcount
+            return count
 
     def delete_snippet_category(self, category: str) -> int:
         """Clear the category on all snippets that currently use it. Returns affected count."""
@@ -255,36 +554,71 @@ class Database:
             return 0
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                'UPDATE snippets SET category = "", updated_at = CURRENT_TIMESTAMP WHERE category = ?',
-                (category,)
-            )
+            category_id = self._category_id(cursor, category, create=False)
+            if category_id is None:
+                return 0
+            cursor.execute('UPDATE snippets SET category_id = NULL WHERE category_id = ?', (category_id,))
+            changed = cursor.rowcount
+            cursor.execute('DELETE FROM categories WHERE id = ?', (category_id,))
             conn.commit()
-            return cursor.rowcount
+            return changed
             
     # Clipboard history operations
     def add_clipboard_item(self, content_type: str, content_data: bytes = None, 
-                          content_text: str = None, preview: str = None) -> int:
-        """Add a new item to clipboard history"""
+                          content_text: str = None, preview: str = None,
+                          formats: Optional[Dict[str, bytes]] = None) -> int:
+        """Add a new item to clipboard history.
+
+        `formats` maps MIME type -> raw payload for rich copies (HTML, RTF,
+        URI lists). Only `content_text` is full-text indexed.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO clipboard_history (content_type, content_data, content_text, preview)
                 VALUES (?, ?, ?, ?)
             ''', (content_type, content_data, content_text, preview))
+            item_id = cursor.lastrowid
+            if formats:
+                self._store_clipboard_formats(cursor, item_id, formats)
             conn.commit()
-            return cursor.lastrowid
+            return item_id
+    
+    def _store_clipboard_formats(self, cursor: sqlite3.Cursor, item_id: int, formats: Dict[str, bytes]) -> None:
+        """Store format payloads for an item, reusing blobs that already exist"""
+        for mime_type, data in formats.items():
+            if not data:
+                continue
+            data = bytes(data)
+            digest, stored, compressed = _pack_blob(data)
+            cursor.execute('''
+                INSERT OR IGNORE INTO clipboard_blobs (hash, data, compressed, size)
+                VALUES (?, ?, ?, ?)
+            ''', (digest, stored, compressed, len(data)))
+            cursor.execute('''
+                INSERT OR REPLACE INTO clipboard_formats (item_id, mime_type, blob_hash)
+                VALUES (?, ?, ?)
+            ''', (item_id, mime_type, digest))
+    
+    def get_clipboard_formats(self, item_id: int) -> Dict[str, bytes]:
+        """Get all stored MIME formats of a clipboard item as mime_type -> bytes"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT f.mime_type, b.data, b.compressed
+                FROM clipboard_formats f
+                JOIN clipboard_blobs b ON b.hash = f.blob_hash
+                WHERE f.item_id = ?
+            ''', (item_id,))
+            return {row['mime_type']: _unpack_blob(row['data'], row['compressed']) for row in cursor.fetchall()}
             
-    def get_clipboard_items(self, start_date=None, end_date=None, content_type=None, search_term=None, limit=None, search_all_dates=False) -> List[Dict]:
-        """Retrieve clipboard items with optional filtering"""
-        import time
-        start_time = time.time()
-        
-        # Add default limit to prevent loading too many items at once
-        if limit is None and not search_term and not search_all_dates:
-            # For non-search queries, limit to 500 most recent items for better performance
-            limit = 500
-        
+    def _clipboard_items_query(self, start_date=None, end_date=None, content_type=None, search_term=None,
+                               limit=None, search_all_dates=False) -> Tuple[str, list]:
+        """Build the get_clipboard_items SQL and parameters.
+
+        Local calendar dates are converted to UTC bounds on the raw created_at
+        column, so the range (and ORDER BY) can be served from an index.
+        """
         query = '''
         SELECT 
             id, 
@@ -300,53 +634,88 @@ class Database:
         
         # Default to last 30 days unless searching all dates or specific date range
         if not start_date and not end_date and not search_all_dates:
-            from datetime import datetime, timedelta
-            default_start = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-            query += " AND date(datetime(created_at, 'localtime')) >= date(?)"
-            params.append(default_start)
+            default_start = (datetime.now() - timedelta(days=30)).date()
+            query += ' AND created_at >= ?'
+            params.append(_local_day_start_utc(default_start))
         
-        # Date filtering in local time
+        # Date filtering on local calendar days
         if start_date and end_date:
             # Inclusive range on local dates
-            query += " AND date(datetime(created_at, 'localtime')) BETWEEN date(?) AND date(?)"
-            params.extend([start_date, end_date])
+            query += ' AND created_at >= ? AND created_at < ?'
+            params.extend([_local_day_start_utc(start_date), _local_day_start_utc(_next_day(end_date))])
         elif start_date:
             # Exact match on selected local date
-            query += " AND date(datetime(created_at, 'localtime')) = date(?)"
-            params.append(start_date)
+            query += ' AND created_at >= ? AND created_at < ?'
+            params.extend([_local_day_start_utc(start_date), _local_day_start_utc(_next_day(start_date))])
         
         # Content type filtering
         if content_type and content_type != 'all':
             query += ' AND content_type = ?'
             params.append(content_type.lower())
         elif search_term:
-            # Only exclude images when searching (not when filtering by type)
-            query += ' AND content_type != ?'
-            params.append('image')
+            # Images are searchable once the OCR indexer has replaced their placeholder text
+            query += ' AND (content_type != ? OR content_text != ?)'
+            params.extend(['image', IMAGE_PLACEHOLDER_TEXT])
         
         if search_term:
-            # Use LIKE for wildcard text search (excluding images already handled above)
+            # Use LIKE for wildcard text search
             search_term = f'%{search_term}%'
-            query += ' AND (content_text LIKE ? OR preview LIKE ?)'
+            # An image's preview is only the '[Image]' label; match its OCR text alone
+            query += " AND (content_text LIKE ? OR (preview LIKE ? AND content_type != 'image'))"
             params.extend([search_term, search_term])
         
-        query += ' ORDER BY created_at DESC'
+        # Order on the stored column: the aliased local-time value is not indexed
+        query += ' ORDER BY clipboard_history.created_at DESC'
         
         if limit:
             query += ' LIMIT ?'
             params.append(limit)
+        return query, params
+    
+    def get_clipboard_items(self, start_date=None, end_date=None, content_type=None, search_term=None, limit=None, search_all_dates=False) -> List[Dict]:
+        """Retrieve clipboard items with optional filtering"""
+        # Add default limit to prevent loading too many items at once
+        if limit is None and not search_term and not search_all_dates:
+            # For non-search queries, limit to 500 most recent items for better performance
+            limit = 500
         
-        with self._get_connection() as conn:
+        query, params = self._clipboard_items_query(start_date, end_date, content_type, search_term,
+                                                    limit, search_all_dates)
+        detail = (f"range={start_date}..{end_date} type={content_type} search={bool(search_term)} "
+                  f"all_dates={search_all_dates} limit={limit}")
+        with metrics.timer('db.get_clipboard_items', detail), self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             results = [dict(row) for row in cursor.fetchall()]
-            
-        end_time = time.time()
-        query_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        print(f"PERF: get_clipboard_items(date_range={start_date}-{end_date}, type={content_type}, search={bool(search_term)}, limit={limit}, search_all_dates={search_all_dates}) - {len(results)} results in {query_time:.2f}ms")
-        
+        metrics.counter('db.get_clipboard_items.rows').inc(len(results))
         return results
             
+    def get_clipboard_item(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single clipboard item by ID"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, content_type, content_data, content_text, preview,
+                       strftime('%Y-%m-%d %H:%M:%S', datetime(created_at, 'localtime')) as created_at
+                FROM clipboard_history WHERE id = ?
+            ''', (item_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    def delete_clipboard_item(self, item_id: int) -> bool:
+        """Delete a clipboard item; its formats go with it and orphaned blobs are purged."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM clipboard_history WHERE id = ?', (item_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                cursor.execute('''
+                    DELETE FROM clipboard_blobs
+                    WHERE NOT EXISTS (SELECT 1 FROM clipboard_formats f WHERE f.blob_hash = clipboard_blobs.hash)
+                ''')
+            conn.commit()
+            return deleted
+
     def get_clipboard_dates(self) -> List[str]:
         """Get all unique dates with clipboard history"""
         with self._get_connection() as conn:
@@ -360,10 +729,7 @@ class Database:
             
     def optimize_database(self):
         """Optimize database performance"""
-        import time
-        start_time = time.time()
-        
-        with self._get_connection() as conn:
+        with metrics.timer('db.optimize_database'), self._get_connection() as conn:
             cursor = conn.cursor()
             
             # Analyze tables to update query planner statistics
@@ -377,18 +743,270 @@ class Database:
             
             conn.commit()
             
-        end_time = time.time()
-        optimization_time = (end_time - start_time) * 1000
-        print(f"PERF: Database optimization completed in {optimization_time:.2f}ms")
+    def get_diagnostics(self) -> Dict[str, Any]:
+        """Storage statistics for the diagnostics view.
+
+        Returns page size/count, freelist pages, WAL file size, per-table row
+        counts and the size of each full-text index's data blocks (bytes).
+        """
+        wal_path = self.db_path + '-wal'
+        stats: Dict[str, Any] = {
+            'file_bytes': os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
+            'wal_bytes': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        }
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for pragma in ('page_size', 'page_count', 'freelist_count', 'journal_mode', 'user_version'):
+                cursor.execute(f'PRAGMA {pragma}')
+                stats[pragma] = cursor.fetchone()[0]
+            cursor.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL TABLE%'
+                ORDER BY name
+            """)
+            tables = [row[0] for row in cursor.fetchall()]
+            fts_tables = [fts for fts, _ in _FTS_TRIGGERS.values()]
+            stats['row_counts'] = {}
+            for table in tables:
+                if any(table.startswith(fts + '_') for fts in fts_tables):
+                    continue  # FTS shadow tables
+                cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+                stats['row_counts'][table] = cursor.fetchone()[0]
+            stats['fts_bytes'] = {}
+            for fts in fts_tables:
+                cursor.execute(f'SELECT COALESCE(SUM(length(block)), 0) FROM "{fts}_data"')
+                stats['fts_bytes'][fts] = cursor.fetchone()[0]
+        return stats
+
+    def _create_ocr_cache(self, cursor: sqlite3.Cursor) -> None:
+        # One row per image/language; storing a result under new options or a
+        # new Tesseract version replaces the old one (see store_ocr_result)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                image_hash TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                options_key TEXT NOT NULL,
+                engine_version TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (image_hash, lang)
+            )
+        ''')
+
+    def _create_ocr_index_state(self, cursor: sqlite3.Cursor) -> None:
+        # Where background OCR indexing resumes. It used to be the
+        # 'ocr_index_cursor' setting; kept apart so the indexer thread never
+        # touches the settings cache or its listeners
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ocr_index_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                cursor INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO ocr_index_state (id, cursor)
+            SELECT 1, CAST(value AS INTEGER) FROM settings WHERE key = 'ocr_index_cursor'
+        ''')
+        cursor.execute("DELETE FROM settings WHERE key = 'ocr_index_cursor'")
+
+    def _existing_indexes(self, cursor: sqlite3.Cursor) -> set:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+        return {row[0] for row in cursor.fetchall()}
+    
+    def _query_shapes(self) -> List[Tuple[str, str, list]]:
+        """(label, sql, params) for the statements the app actually runs"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        shapes = [
+            ('clipboard: recent 30 days', *self._clipboard_items_query(limit=500)),
+            ('clipboard: one day', *self._clipboard_items_query(start_date=today, limit=500)),
+            ('clipboard: one day by type', *self._clipboard_items_query(start_date=today, content_type='text', limit=500)),
+            ('clipboard: date range', *self._clipboard_items_query(start_date=today, end_date=today)),
+            ('clipboard: search all dates', *self._clipboard_items_query(search_term='x', search_all_dates=True)),
+            ('clipboard: latest N', *self._clipboard_items_query(search_all_dates=True, limit=200)),
+            ('clipboard: dates', '''SELECT DISTINCT date(datetime(created_at, 'localtime')) as clip_date
+                FROM clipboard_history ORDER BY clip_date DESC''', []),
+            ('clipboard: cleanup', 'DELETE FROM clipboard_history WHERE created_at < ?', [today]),
+            ('clipboard: formats of item', 'SELECT mime_type, blob_hash FROM clipboard_formats WHERE item_id = ?', [1]),
+            ('clipboard: orphan blobs', '''DELETE FROM clipboard_blobs
+                WHERE NOT EXISTS (SELECT 1 FROM clipboard_formats f WHERE f.blob_hash = clipboard_blobs.hash)''', []),
+            ('snippets: all', _SNIPPET_SELECT + ' ORDER BY s.title', []),
+            ('snippets: by category', _SNIPPET_SELECT + ' WHERE c.name = ? ORDER BY s.title', ['x']),
+            ('snippets: uncategorized', _SNIPPET_SELECT + ' WHERE s.category_id IS NULL ORDER BY s.title', []),
+            ('snippets: search in category', _SNIPPET_SELECT +
+             ' WHERE (s.title LIKE ? OR s.content LIKE ?) AND c.name = ? ORDER BY s.title', ['%x%', '%x%', 'x']),
+            ('snippets: category count', 'UPDATE snippets SET category_id = NULL WHERE category_id = ?', [1]),
+            ('snippets: triggers', '''SELECT expansion_trigger, id FROM snippets
+                WHERE expansion_trigger IS NOT NULL AND expansion_trigger != ""''', []),
+        ]
+        return shapes
+    
+    def audit_indexes(self) -> Dict[str, Any]:
+        """Run EXPLAIN QUERY PLAN over the app's queries and report index usage.
+
+        Returns {'plans': {label: [plan lines]}, 'used': {index: [labels]},
+        'unused': [index names]}. Unique indexes count as used since they
+        enforce constraints.
+        """
+        with self._get_connection() as conn:
+            return self._audit_indexes(conn.cursor())
+    
+    def _audit_indexes(self, cursor: sqlite3.Cursor) -> Dict[str, Any]:
+        plans: Dict[str, List[str]] = {}
+        used: Dict[str, List[str]] = {}
+        cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'
+        ''')
+        candidates = {row[0] for row in cursor.fetchall()}
+        for label, sql, params in self._query_shapes():
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            lines = [row[3] for row in cursor.fetchall()]
+            plans[label] = lines
+            for line in lines:
+                for name in candidates:
+                    if f'INDEX {name} ' in line + ' ':
+                        used.setdefault(name, []).append(label)
+        return {'plans': plans, 'used': used, 'unused': sorted(candidates - set(used))}
+    
+    def _used_bytes(self, cursor: sqlite3.Cursor) -> int:
+        cursor.execute('PRAGMA page_size')
+        page_size = cursor.fetchone()[0]
+        cursor.execute('PRAGMA page_count')
+        page_count = cursor.fetchone()[0]
+        cursor.execute('PRAGMA freelist_count')
+        return (page_count - cursor.fetchone()[0]) * page_size
+    
+    @staticmethod
+    def _full_scans(plan: List[str]) -> int:
+        return sum(1 for line in plan if line.startswith('SCAN ') and ' INDEX ' not in line + ' ')
+    
+    def optimize_indexes(self) -> Dict[str, Any]:
+        """Drop the redundant indexes no audited query depends on.
+
+        Returns {'dropped': [...], 'kept': [...], 'bytes_freed': n}. Freed
+        pages go to the freelist and are reused by later writes; the file
+        itself shrinks on the next VACUUM.
+        """
+        with self._get_connection() as conn:
+            conn.isolation_level = None
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
+            report = self._drop_redundant_indexes(cursor)
+            cursor.execute('COMMIT')
+            return report
+    
+    def _drop_redundant_indexes(self, cursor: sqlite3.Cursor) -> Dict[str, Any]:
+        """Drop each REDUNDANT_INDEXES entry unless a query would lose its index.
+
+        Every candidate is dropped inside a savepoint; if a query that used it
+        falls back to a full table scan, the drop is rolled back.
+        """
+        audit = self._audit_indexes(cursor)
+        existing = self._existing_indexes(cursor)
+        shapes = {label: (sql, params) for label, sql, params in self._query_shapes()}
+        dropped, kept = [], []
+        before = self._used_bytes(cursor)
+        for name in REDUNDANT_INDEXES:
+            if name not in existing:
+                continue
+            cursor.execute('SAVEPOINT drop_index')
+            cursor.execute(f'DROP INDEX IF EXISTS {name}')
+            regressed = []
+            for label in audit['used'].get(name, []):
+                sql, params = shapes[label]
+                # Distinct text: the connection's statement cache would hand back the plan from before the drop
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql} -- without {name}', params)
+                plan = [row[3] for row in cursor.fetchall()]
+                if self._full_scans(plan) > self._full_scans(audit['plans'][label]):
+                    regressed.append(label)
+            if regressed:
+                cursor.execute('ROLLBACK TO drop_index')
+                kept.append(name)
+                logger.warning(f"Index {name} kept; needed by: {', '.join(regressed)}")
+            else:
+                dropped.append(name)
+            cursor.execute('RELEASE drop_index')
+        freed = before - self._used_bytes(cursor)
+        if dropped:
+            logger.info(f"Dropped indexes {', '.join(dropped)}; freed {freed / 1024:.1f} KB")
+        return {'dropped': dropped, 'kept': kept, 'bytes_freed': freed}
             
+    def images_for_ocr(self, after_id: int, limit: int = 1) -> List[Dict[str, Any]]:
+        """Up to `limit` image items with id > after_id, oldest first, as {'id', 'content_data'}."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, content_data FROM clipboard_history
+                WHERE id > ? AND content_type = 'image'
+                ORDER BY id LIMIT ?
+            ''', (after_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def next_image_for_ocr(self, after_id: int) -> Optional[Dict[str, Any]]:
+        """The oldest image item with id > after_id, as {'id', 'content_data'}."""
+        items = self.images_for_ocr(after_id, 1)
+        return items[0] if items else None
+
+    def get_ocr_index_cursor(self) -> int:
+        """Id of the last image item the OCR indexer has handled (0 before the first)."""
+        with self._get_connection() as conn:
+            row = conn.execute('SELECT cursor FROM ocr_index_state WHERE id = 1').fetchone()
+        return row[0] if row else 0
+
+    def set_ocr_index_cursor(self, item_id: int) -> None:
+        with self._get_connection() as conn:
+            conn.execute('REPLACE INTO ocr_index_state (id, cursor) VALUES (1, ?)', (item_id,))
+            conn.commit()
+
+    def set_clipboard_ocr_text(self, item_id: int, text: str) -> None:
+        """Store recognized text as an image item's content_text (and so in the FTS index)."""
+        with self._get_connection() as conn:
+            conn.execute('UPDATE clipboard_history SET content_text = ? WHERE id = ?', (text, item_id))
+            conn.commit()
+
+    def get_ocr_result(self, image_hash: str, lang: str, options_key: str, engine_version: str) -> Optional[str]:
+        """Cached OCR text for an image, or None unless options and engine version match."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT text FROM ocr_cache
+                WHERE image_hash = ? AND lang = ? AND options_key = ? AND engine_version = ?
+            ''', (image_hash, lang, options_key, engine_version))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            cursor.execute('''
+                UPDATE ocr_cache SET last_used_at = CURRENT_TIMESTAMP WHERE image_hash = ? AND lang = ?
+            ''', (image_hash, lang))
+            conn.commit()
+            return row[0]
+
+    def store_ocr_result(self, image_hash: str, lang: str, options_key: str, engine_version: str, text: str) -> None:
+        """Cache OCR text, replacing any result for the image made with other options/engine."""
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO ocr_cache (image_hash, lang, options_key, engine_version, text)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (image_hash, lang, options_key, engine_version, text))
+            conn.commit()
+
     def cleanup_old_items(self, days_to_keep: int = 30) -> int:
         """Remove clipboard items older than specified days"""
         cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).strftime('%Y-%m-%d')
         # First, delete in a transaction and commit
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('DELETE FROM clipboard_history WHERE date(created_at) < ?', (cutoff_date,))
+            # created_at < 'YYYY-MM-DD' sorts every timestamp of earlier days first; indexable
+            cursor.execute('DELETE FROM clipboard_history WHERE created_at < ?', (cutoff_date,))
             deleted_count = cursor.rowcount
+            # Purge format blobs no longer referenced by any item
+            cursor.execute('''
+                DELETE FROM clipboard_blobs
+                WHERE NOT EXISTS (SELECT 1 FROM clipboard_formats f WHERE f.blob_hash = clipboard_blobs.hash)
+            ''')
+            # OCR results not reused within the retention window
+            cursor.execute('DELETE FROM ocr_cache WHERE last_used_at < ?', (cutoff_date,))
             conn.commit()
 
         # Then, VACUUM in a separate autocommit connection (VACUUM cannot run inside a transaction)
@@ -406,60 +1024,248 @@ class Database:
             
     def search_snippets(self, search_term: str, category: str = None) -> List[Dict[str, Any]]:
         """Search snippets by title or content, optionally filtered by category"""
-        import time
-        start_time = time.time()
-        
         search_term = f'%{search_term}%'
-        with self._get_connection() as conn:
+        with metrics.timer('db.search_snippets', f'category={category!r}'), self._get_connection() as conn:
             cursor = conn.cursor()
             if category is not None and category != "":
-                cursor.execute('''
-                    SELECT * FROM snippets 
-                    WHERE (title LIKE ? OR content LIKE ?) AND category = ?
-                    ORDER BY title
+                cursor.execute(_SNIPPET_SELECT + '''
+                    WHERE (s.title LIKE ? OR s.content LIKE ?) AND c.name = ?
+                    ORDER BY s.title
                 ''', (search_term, search_term, category))
             elif category == "":
-                # Search in snippets with empty/NULL category
-                cursor.execute('''
-                    SELECT * FROM snippets 
-                    WHERE (title LIKE ? OR content LIKE ?) AND (category IS NULL OR category = "")
-                    ORDER BY title
+                # Search in snippets without a category
+                cursor.execute(_SNIPPET_SELECT + '''
+                    WHERE (s.title LIKE ? OR s.content LIKE ?) AND s.category_id IS NULL
+                    ORDER BY s.title
                 ''', (search_term, search_term))
             else:
                 # Search all snippets
-                cursor.execute('''
-                    SELECT * FROM snippets 
-                    WHERE title LIKE ? OR content LIKE ?
-                    ORDER BY title
+                cursor.execute(_SNIPPET_SELECT + '''
+                    WHERE s.title LIKE ? OR s.content LIKE ?
+                    ORDER BY s.title
                 ''', (search_term, search_term))
             
             results = [dict(row) for row in cursor.fetchall()]
-            
-        end_time = time.time()
-        query_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        print(f"PERF: search_snippets(category='{category}') - {len(results)} results in {query_time:.2f}ms")
-        
+        metrics.counter('db.search_snippets.rows').inc(len(results))
         return results
             
+    # Bulk import/export
+    def import_snippets(self, records: Iterable[Dict[str, Any]],
+                        progress: Optional[Callable[[int], None]] = None,
+                        batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Insert snippet records in a single transaction. Returns the number imported.
+
+        Records are dicts with title, content and optional category,
+        expansion_trigger, created_at and updated_at (UTC). Records without a
+        title are skipped; a trigger already in use is dropped rather than
+        failing the whole import. FTS triggers are suspended during the load
+        and the index is rebuilt once at the end. `progress(count)` is called
+        after every batch; an exception raised from it rolls everything back.
+        """
+        sql = '''
+            INSERT INTO snippets (title, content, category_id, expansion_trigger, created_at, updated_at)
+            VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))
+        '''
+        count = 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
+            cursor.execute('SELECT expansion_trigger FROM snippets WHERE expansion_trigger IS NOT NULL')
+            triggers = {row[0] for row in cursor.fetchall()}
+            self._drop_fts_triggers(cursor, 'snippets')
+            category_ids = {}
+            batch = []
+            for record in records:
+                title = record.get('title')
+                if not title:
+                    continue
+                trigger = record.get('expansion_trigger') or None
+                if trigger in triggers:
+                    logger.warning(f"Import: trigger {trigger!r} already in use, dropped from '{title}'")
+                    trigger = None
+                elif trigger:
+                    triggers.add(trigger)
+                category = record.get('category') or ''
+                if category not in category_ids:
+                    category_ids[category] = self._category_id(cursor, category)
+                batch.append((title, record.get('content') or '', category_ids[category], trigger,
+                              record.get('created_at') or None, record.get('updated_at') or None))
+                if len(batch) >= batch_size:
+                    cursor.executemany(sql, batch)
+                    count += len(batch)
+                    batch = []
+                    if progress:
+                        progress(count)
+            if batch:
+                cursor.executemany(sql, batch)
+                count += len(batch)
+            self._rebuild_fts(cursor, 'snippets')
+            self._recount_categories(cursor)
+            conn.commit()
+        if progress:
+            progress(count)
+        logger.info(f'Imported {count} snippets')
+        return count
+    
+    def iter_snippets(self, batch_size: int = BULK_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream all snippets in id order without loading the table into memory"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT s.title, s.content, COALESCE(c.name, '') AS category, s.expansion_trigger,
+                       s.created_at, s.updated_at
+                FROM snippets s LEFT JOIN categories c ON c.id = s.category_id
+                ORDER BY s.id
+            ''')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+    
+    def import_clipboard_items(self, records: Iterable[Dict[str, Any]],
+                               progress: Optional[Callable[[int], None]] = None,
+                               batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Insert clipboard history records in a single transaction. Returns the number imported.
+
+        Records are dicts with content_type, content_text, preview, created_at
+        (UTC), optional content_data bytes and optional formats
+        (MIME type -> bytes). Same transaction, FTS and progress semantics as
+        `import_snippets`.
+        """
+        sql = '''
+            INSERT INTO clipboard_history (content_type, content_data, content_text, preview, created_at)
+            VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        '''
+        count = 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
+            self._drop_fts_triggers(cursor, 'clipboard_history')
+            batch = []
+            for record in records:
+                row = (record.get('content_type') or 'text', record.get('content_data'),
+                       record.get('content_text'), record.get('preview'), record.get('created_at') or None)
+                formats = record.get('formats')
+                if formats:
+                    # Needs its own row id; flush first so ids keep the input order
+                    if batch:
+                        cursor.executemany(sql, batch)
+                        batch = []
+                    cursor.execute(sql, row)
+                    self._store_clipboard_formats(cursor, cursor.lastrowid, formats)
+                else:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        cursor.executemany(sql, batch)
+                        batch = []
+                count += 1
+                if progress and count % batch_size == 0:
+                    progress(count)
+            if batch:
+                cursor.executemany(sql, batch)
+            self._rebuild_fts(cursor, 'clipboard_history')
+            conn.commit()
+        if progress:
+            progress(count)
+        logger.info(f'Imported {count} clipboard items')
+        return count
+    
+    def iter_clipboard_keys(self) -> Iterator[Tuple[str, Optional[str], str]]:
+        """Stream (content_type, content_text, created_at) of all clipboard history, without payloads"""
+        with self._get_connection() as conn:
+            for row in conn.execute('SELECT content_type, content_text, created_at FROM clipboard_history'):
+                yield tuple(row)
+
+    def iter_clipboard_items(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all clipboard history in id order, each item with its `formats` dict"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, content_type, content_data, content_text, preview, created_at
+                FROM clipboard_history ORDER BY id
+            ''')
+            formats_cursor = conn.cursor()
+            while True:
+                rows = [dict(row) for row in cursor.fetchmany(batch_size)]
+                if not rows:
+                    break
+                ids = [row['id'] for row in rows]
+                formats: Dict[int, Dict[str, bytes]] = {}
+                formats_cursor.execute(f'''
+                    SELECT f.item_id, f.mime_type, b.data, b.compressed
+                    FROM clipboard_formats f
+                    JOIN clipboard_blobs b ON b.hash = f.blob_hash
+                    WHERE f.item_id IN ({','.join('?' * len(ids))})
+                ''', ids)
+                for fmt in formats_cursor.fetchall():
+                    formats.setdefault(fmt['item_id'], {})[fmt['mime_type']] = _unpack_blob(fmt['data'], fmt['compressed'])
+                for row in rows:
+                    row['formats'] = formats.get(row.pop('id'), {})
+                    yield row
+            
     # Settings operations
+    # Reads are served from an in-memory copy of the settings table, loaded
+    # once; writes go to the database first and then update the copy.
+    # Changes made by other processes are only seen after reload_settings().
+    def _settings_cache(self) -> Dict[str, str]:
+        if self._settings is None:
+            self.reload_settings()
+        return self._settings
+    
+    def reload_settings(self) -> None:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT key, value FROM settings')
+            self._settings = {row[0]: row[1] for row in cursor.fetchall()}
+    
+    def add_settings_listener(self, callback: Callable[[str, Optional[str]], None]) -> None:
+        """Call `callback(key, value)` after a setting changes (value None when deleted)"""
+        if callback not in self._settings_listeners:
+            self._settings_listeners.append(callback)
+    
+    def remove_settings_listener(self, callback: Callable[[str, Optional[str]], None]) -> None:
+        if callback in self._settings_listeners:
+            self._settings_listeners.remove(callback)
+    
+    def _notify_setting_changed(self, key: str, value: Optional[str]) -> None:
+        for callback in list(self._settings_listeners):
+            try:
+                callback(key, value)
+            except Exception as e:
+                logger.error(f"Settings listener failed for {key}: {e}")
+    
     def set_setting(self, key: str, value: str) -> None:
+        cache = self._settings_cache()
+        # The TEXT column stores numbers as text; cache what a read would return
+        if value is not None and not isinstance(value, (str, bytes)):
+            value = str(value)
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('REPLACE INTO settings (key, value) VALUES (?, ?)', (key, value))
             conn.commit()
+        changed = key not in cache or cache[key] != value
+        cache[key] = value
+        if changed:
+            self._notify_setting_changed(key, value)
             
     def get_setting(self, key: str, default: str = None) -> str:
+        cache = self._settings_cache()
+        return cache[key] if key in cache else default
+            
+    def delete_setting(self, key: str) -> None:
+        cache = self._settings_cache()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
-            row = cursor.fetchone()
-            return row[0] if row else default
+            cursor.execute('DELETE FROM settings WHERE key = ?', (key,))
+            conn.commit()
+        if key in cache:
+            del cache[key]
+            self._notify_setting_changed(key, None)
             
     def get_settings(self) -> Dict[str, str]:
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT key, value FROM settings')
-            return {row[0]: row[1] for row in cursor.fetchall()}
+        return dict(self._settings_cache())
             
     # World clock operations
     def get_world_clocks(self) -> List[Dict[str, Any]]:
@@ -473,12 +1279,7 @@ class Database:
         """Add a new world clock entry"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("PRAGMA table_info(world_clocks)")
-            cols = [row[1] for row in cursor.fetchall()]
-            if 'use_dst' in cols:
-                cursor.execute('INSERT INTO world_clocks (city, timezone, use_dst) VALUES (?, ?, ?)', (city, timezone, use_dst))
-            else:
-                cursor.execute('INSERT INTO world_clocks (city, timezone) VALUES (?, ?)', (city, timezone))
+            cursor.execute('INSERT INTO world_clocks (city, timezone, use_dst) VALUES (?, ?, ?)', (city, timezone, use_dst))
             conn.commit()
             return cursor.lastrowid
             
@@ -509,19 +1310,11 @@ class Database:
             
     def save_email_app_path(self, app_name: str, path: str) -> None:
         """Save email application path"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', 
-                          (f'email_app_{app_name}', path))
-            conn.commit()
+        self.set_setting(f'email_app_{app_name}', path)
             
     def get_email_app_path(self, app_name: str) -> str:
         """Get email application path"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT value FROM settings WHERE key = ?', (f'email_app_{app_name}',))
-            result = cursor.fetchone()
-            return result['value'] if result else ""
+        return self.get_setting(f'email_app_{app_name}') or ""
     
     # ========== New World Clock Integration Methods ==========
     
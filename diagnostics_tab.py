@@ -0,0 +1,181 @@
+import json
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QApplication, QSplitter
+)
+
+from metrics import REGISTRY as metrics
+
+# Operations shown first, in this order; any other recorded timers follow
+KEY_TIMERS = (
+    ('clipboard.capture', 'Capture'),
+    ('db.search_snippets', 'Snippet search'),
+    ('db.get_clipboard_items', 'Clipboard query'),
+    ('quick_paste.open', 'Quick paste open'),
+    ('ui.load_snippets', 'Snippet list load'),
+    ('ui.load_clipboard_items', 'Clipboard list load'),
+    ('ui.preview_decode', 'Preview decode'),
+    ('ocr.image', 'OCR'),
+)
+
+METRICS_REFRESH_MS = 2000
+
+
+def _fmt_ms(value) -> str:
+    return '-' if value is None else f'{value:.1f}'
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f'{n:.0f} {unit}' if unit == 'B' else f'{n:.1f} {unit}'
+        n /= 1024.0
+
+
+class DiagnosticsTab(QWidget):
+    """Latency percentiles, slow operations and database storage statistics.
+
+    Percentiles come from the in-memory metrics registry and refresh every
+    couple of seconds while the tab is visible; database statistics run a
+    few COUNT(*) queries, so they refresh when the tab is shown or on demand.
+    """
+
+    def __init__(self, db):
+        super().__init__()
+        self.db = db
+        self._db_stats = {}
+        self.timer = QTimer(self)
+        self.timer.setInterval(METRICS_REFRESH_MS)
+        self.timer.timeout.connect(self.refresh_metrics)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: gray;")
+        layout.addWidget(self.status_label)
+
+        splitter = QSplitter(Qt.Vertical)
+
+        latency_box = QGroupBox("Latency (ms)")
+        latency_layout = QVBoxLayout()
+        self.latency_table = self._make_table(['Operation', 'Count', 'p50', 'p95', 'p99', 'Max'])
+        latency_layout.addWidget(self.latency_table)
+        latency_box.setLayout(latency_layout)
+        splitter.addWidget(latency_box)
+
+        slow_box = QGroupBox("Slowest operations")
+        slow_layout = QVBoxLayout()
+        self.slow_table = self._make_table(['Operation', 'ms', 'When', 'Detail'])
+        slow_layout.addWidget(self.slow_table)
+        slow_box.setLayout(slow_layout)
+        splitter.addWidget(slow_box)
+
+        db_box = QGroupBox("Database")
+        db_layout = QVBoxLayout()
+        self.db_table = self._make_table(['Statistic', 'Value'])
+        db_layout.addWidget(self.db_table)
+        db_box.setLayout(db_layout)
+        splitter.addWidget(db_box)
+
+        layout.addWidget(splitter)
+
+        actions = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        copy_btn = QPushButton("Copy Report")
+        copy_btn.setToolTip("Copy all figures as JSON, e.g. to attach to a performance ticket")
+        copy_btn.clicked.connect(self.copy_report)
+        reset_btn = QPushButton("Reset Metrics")
+        reset_btn.clicked.connect(self.reset_metrics)
+        actions.addWidget(refresh_btn)
+        actions.addWidget(copy_btn)
+        actions.addWidget(reset_btn)
+        actions.addStretch()
+        layout.addLayout(actions)
+
+        self.setLayout(layout)
+
+    @staticmethod
+    def _make_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setRowCount(len(rows))
+        for r, values in enumerate(rows):
+            for c, value in enumerate(values):
+                table.setItem(r, c, QTableWidgetItem(str(value)))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        self.refresh_db_stats()
+        self.refresh_metrics()
+
+    def refresh_metrics(self):
+        snapshot = metrics.snapshot()
+        histograms = snapshot['histograms']
+        labels = dict(KEY_TIMERS)
+        names = [name for name, _ in KEY_TIMERS] + sorted(n for n in histograms if n not in labels)
+        rows = []
+        for name in names:
+            h = histograms.get(name)
+            label = labels.get(name, name)
+            if h is None:
+                rows.append((label, 0, '-', '-', '-', '-'))
+            else:
+                rows.append((label, h['count'], _fmt_ms(h['p50']), _fmt_ms(h['p95']),
+                             _fmt_ms(h['p99']), _fmt_ms(h['max'])))
+        self._fill(self.latency_table, rows)
+        self._fill(self.slow_table, [(s['name'], _fmt_ms(s['ms']), s['at'], s['detail'] or '')
+                                     for s in snapshot['slow']])
+        state = 'enabled' if metrics.enabled else 'disabled (Menu → Diagnostics → Collect Metrics)'
+        self.status_label.setText(f"Metrics {state}; uptime {snapshot['uptime_s']:.0f}s, "
+                                  f"slow threshold {metrics.slow_threshold_ms:.0f}ms")
+
+    def refresh_db_stats(self):
+        try:
+            stats = self.db.get_diagnostics()
+        except Exception as e:
+            self._fill(self.db_table, [('Error', str(e))])
+            return
+        self._db_stats = stats
+        page_size = stats['page_size']
+        rows = [
+            ('File size', _fmt_bytes(stats['file_bytes'])),
+            ('Pages', f"{stats['page_count']} × {page_size} B"),
+            ('Freelist', f"{stats['freelist_count']} pages ({_fmt_bytes(stats['freelist_count'] * page_size)})"),
+            ('Journal mode', stats['journal_mode']),
+            ('WAL size', _fmt_bytes(stats['wal_bytes'])),
+            ('Schema version', stats['user_version']),
+        ]
+        rows += [(f'FTS index: {name}', _fmt_bytes(size)) for name, size in stats['fts_bytes'].items()]
+        rows += [(f'Rows: {table}', count) for table, count in stats['row_counts'].items()]
+        self._fill(self.db_table, rows)
+
+    def report(self) -> dict:
+        return {'metrics': metrics.snapshot(), 'database': self._db_stats}
+
+    def copy_report(self):
+        QApplication.clipboard().setText(json.dumps(self.report(), indent=2))
+
+    def reset_metrics(self):
+        metrics.reset()
+        self.refresh_metrics()
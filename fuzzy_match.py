@@ -0,0 +1,261 @@
+import heapq
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Scoring weights (fzf / Sublime style): every matched char earns a base
+# score, boundary and consecutive matches earn bonuses, gaps cost a little.
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 10
+BONUS_CAMEL = 8
+BONUS_CONSECUTIVE = 6
+BONUS_FIRST_CHAR = 8
+PENALTY_GAP = 1
+PENALTY_GAP_MAX = 6
+PENALTY_LEADING = 1
+PENALTY_LEADING_MAX = 8
+
+_SEPARATORS = frozenset(' \t_-/\\.:,;()[]{}"\'')
+
+
+def fold_case(text: str) -> str:
+    """Lowercase `text` character by character, keeping its length.
+
+    `str.lower()` expands a few characters (e.g. 'İ' to 'i' + combining
+    dot), which would shift match positions away from the original text;
+    those characters are kept as they are.
+    """
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def char_mask(text: str) -> int:
+    """Bitmask of the characters present in lowercase `text`.
+
+    Bits 0-25 are a-z, 26-35 are 0-9 and bit 36 is any other non-space
+    character. A candidate can only match a query if it contains every bit
+    of the query's mask, which rejects most candidates with one AND.
+    """
+    mask = 0
+    for ch in text:
+        if 'a' <= ch <= 'z':
+            mask |= 1 << (ord(ch) - 97)
+        elif '0' <= ch <= '9':
+            mask |= 1 << (ord(ch) - 22)
+        elif not ch.isspace():
+            mask |= 1 << 36
+    return mask
+
+
+class FuzzyMatch(NamedTuple):
+    key: Hashable
+    score: int
+    positions: Tuple[int, ...]
+    text: str
+
+
+def fuzzy_match(query: str, text: str, lower: Optional[str] = None) -> Optional[Tuple[int, Tuple[int, ...]]]:
+    """Match `query` as a subsequence of `text`.
+
+    Returns (score, matched positions) or None. `query` must already be
+    case-folded with `fold_case` and without spaces; `lower` may pass a
+    precomputed `fold_case(text)`.
+    """
+    if lower is None:
+        lower = fold_case(text)
+    if not query:
+        return 0, ()
+    find = lower.find
+
+    # Forward pass: earliest end position of a subsequence match
+    idx = -1
+    for ch in query:
+        idx = find(ch, idx + 1)
+        if idx < 0:
+            return None
+    end = idx + 1
+
+    # Backward pass: tightest start for that end, so matches cluster together
+    rfind = lower.rfind
+    idx = end
+    for ch in reversed(query):
+        idx = rfind(ch, 0, idx)
+
+    # Final forward pass inside the window, scoring as we go. A mid-word hit
+    # is moved to a word-boundary occurrence anywhere later in the text when
+    # the rest of the query still fits after it; the window then extends to
+    # the end of the text.
+    positions = []
+    score = 0
+    prev = -2
+    idx -= 1
+    last = len(query) - 1
+    size = len(lower)
+    for n, ch in enumerate(query):
+        idx = find(ch, idx + 1, end)
+        if idx > 0 and text[idx - 1] not in _SEPARATORS and n < last:
+            alt = find(ch, idx + 1)
+            while alt >= 0:
+                if text[alt - 1] in _SEPARATORS and _fits(query, n + 1, find, alt + 1, size):
+                    idx = alt
+                    end = size
+                    break
+                alt = find(ch, alt + 1)
+        score += SCORE_MATCH
+        if idx == 0 or text[idx - 1] in _SEPARATORS:
+            score += BONUS_BOUNDARY + (BONUS_FIRST_CHAR if n == 0 else 0)
+        elif text[idx].isupper() and text[idx - 1].islower():
+            score += BONUS_CAMEL
+        if idx == prev + 1:
+            score += BONUS_CONSECUTIVE
+        elif n:
+            gap = (idx - prev - 1) * PENALTY_GAP
+            score -= gap if gap < PENALTY_GAP_MAX else PENALTY_GAP_MAX
+        positions.append(idx)
+        prev = idx
+    lead = positions[0] * PENALTY_LEADING
+    score -= lead if lead < PENALTY_LEADING_MAX else PENALTY_LEADING_MAX
+    return score, tuple(positions)
+
+
+def _fits(query: str, qi: int, find, start: int, end: int) -> bool:
+    idx = start - 1
+    for ch in query[qi:]:
+        idx = find(ch, idx + 1, end)
+        if idx < 0:
+            return False
+    return True
+
+
+# Candidates fully scored per search; further matches rank after them,
+# unscored, in order of how early in their text the query ends
+SCORE_LIMIT = 200
+
+
+def _earliest_positions(query: str, lower: str) -> Tuple[int, ...]:
+    positions = []
+    idx = -1
+    for ch in query:
+        idx = lower.find(ch, idx + 1)
+        positions.append(idx)
+    return tuple(positions)
+
+
+class FuzzyIndex:
+    """In-memory fuzzy index with precomputed lowercase text and character masks.
+
+    Candidates are narrowed before any scoring. Each one is kept with the
+    end of its earliest subsequence match. Extending the query by a
+    character only needs one `str.find` from that end. So typing that
+    extends the previous query costs one find per previous survivor. A new
+    query starts from the candidates of its first character, found with one
+    mask AND per entry and cached per character. Only the `SCORE_LIMIT`
+    candidates whose match ends earliest go through the full `fuzzy_match`
+    scoring.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Hashable, str]] = ()):
+        self._entries: List[Tuple[Hashable, str, str, int]] = []
+        self._lowers: List[str] = []
+        self._last_query = None
+        # (end of the earliest match, entry index) of the last query's candidates, in index order
+        self._last_found: Optional[List[Tuple[int, int]]] = None
+        self._first_char: Dict[str, List[Tuple[int, int]]] = {}
+        self.set(items)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set(self, items: Iterable[Tuple[Hashable, str]]) -> None:
+        """Replace all entries with (key, text) pairs."""
+        entries = []
+        for key, text in items:
+            text = text or ''
+            lower = fold_case(text)
+            entries.append((key, text, lower, char_mask(lower)))
+        self._entries = entries
+        self._invalidate()
+
+    def add(self, key: Hashable, text: str, front: bool = False) -> None:
+        text = text or ''
+        lower = fold_case(text)
+        entry = (key, text, lower, char_mask(lower))
+        if front:
+            self._entries.insert(0, entry)
+        else:
+            self._entries.append(entry)
+        self._invalidate()
+
+    def remove(self, key: Hashable) -> None:
+        self._entries = [e for e in self._entries if e[0] != key]
+        self._invalidate()
+
+    def items(self, limit: Optional[int] = None) -> List[Tuple[Hashable, str]]:
+        """(key, text) pairs in index order."""
+        entries = self._entries[:limit] if limit else self._entries
+        return [(e[0], e[1]) for e in entries]
+
+    def truncate(self, size: int) -> None:
+        if len(self._entries) > size:
+            del self._entries[size:]
+            self._invalidate()
+
+    def search(self, query: str, limit: Optional[int] = None,
+               keys: Optional[Sequence[Any]] = None) -> List[FuzzyMatch]:
+        """Return matches sorted by score (ties keep index order).
+
+        `keys`, if given, restricts results to those keys.
+        """
+        q = ''.join(fold_case(query or '').split())
+        if not q:
+            return []
+        if self._last_query and q.startswith(self._last_query):
+            found, suffix = self._last_found, q[len(self._last_query):]
+        else:
+            found, suffix = self._first_char_candidates(q[0]), q[1:]
+        lowers = self._lowers
+        for ch in suffix:
+            # The earliest match of the longer query continues the earliest match of the shorter one
+            found = [(end, i) for prev, i in found if (end := lowers[i].find(ch, prev + 1)) >= 0]
+        self._last_query = q
+        self._last_found = found
+
+        entries = self._entries
+        if keys is not None:
+            allowed = set(keys)
+            found = [f for f in found if entries[f[1]][0] in allowed]
+        rest = []
+        if len(found) > SCORE_LIMIT:
+            if limit and limit <= SCORE_LIMIT:
+                found = heapq.nsmallest(SCORE_LIMIT, found)
+            else:
+                found = sorted(found)
+                found, rest = found[:SCORE_LIMIT], found[SCORE_LIMIT:]
+        matches = []
+        for _, i in found:
+            score, positions = fuzzy_match(q, entries[i][1], entries[i][2])
+            matches.append((-score, i, positions))
+        ranked = heapq.nsmallest(limit, matches) if limit else sorted(matches)
+        results = [FuzzyMatch(entries[i][0], -neg, positions, entries[i][1]) for neg, i, positions in ranked]
+        if rest and (not limit or limit > len(results)):
+            # Unscored matches rank below every scored one, highlighting their earliest positions
+            floor = results[-1].score
+            for _, i in rest[:limit - len(results) if limit else None]:
+                key, text, lower, _ = entries[i]
+                results.append(FuzzyMatch(key, floor, _earliest_positions(q, lower), text))
+        return results
+
+    def _first_char_candidates(self, ch: str) -> List[Tuple[int, int]]:
+        found = self._first_char.get(ch)
+        if found is None:
+            bit = char_mask(ch)
+            found = [(end, i) for i, (_, _, lower, mask) in enumerate(self._entries)
+                     if mask & bit and (end := lower.find(ch)) >= 0]
+            self._first_char[ch] = found
+        return found
+
+    def _invalidate(self) -> None:
+        self._lowers = [e[2] for e in self._entries]
+        self._last_query = None
+        self._last_found = None
+        self._first_char = {}
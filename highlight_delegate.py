@@ -0,0 +1,53 @@
+import html
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPalette, QTextDocument
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+# Item data role holding the matched character positions of the display text
+HIGHLIGHT_ROLE = Qt.UserRole + 1
+
+
+def highlight_html(text: str, positions) -> str:
+    """Return escaped HTML for `text` with the characters at `positions` in bold."""
+    marked = set(positions or ())
+    parts = []
+    bold = False
+    for i, ch in enumerate(text):
+        if (i in marked) != bold:
+            parts.append('<b>' if not bold else '</b>')
+            bold = not bold
+        parts.append(html.escape(ch))
+    if bold:
+        parts.append('</b>')
+    return ''.join(parts)
+
+
+class HighlightDelegate(QStyledItemDelegate):
+    """Paints list items with fuzzy-matched characters in bold."""
+
+    def paint(self, painter, option, index):
+        positions = index.data(HIGHLIGHT_ROLE)
+        if not positions:
+            super().paint(painter, option, index)
+            return
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ''
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        selected = bool(opt.state & QStyle.State_Selected)
+        color = opt.palette.color(QPalette.HighlightedText if selected else QPalette.Text)
+        doc = QTextDocument()
+        doc.setDocumentMargin(0)
+        doc.setDefaultFont(opt.font)
+        doc.setHtml(f'<span style="color:{color.name()}; white-space:pre">{highlight_html(text, positions)}</span>')
+
+        text_rect = style.subElementRect(QStyle.SE_ItemViewItemText, opt, opt.widget)
+        painter.save()
+        painter.translate(text_rect.left(), text_rect.top() + max(0, (text_rect.height() - doc.size().height()) / 2))
+        painter.setClipRect(0, 0, text_rect.width(), text_rect.height())
+        doc.drawContents(painter)
+        painter.restore()
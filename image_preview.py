@@ -0,0 +1,88 @@
+import math
+from typing import Optional, Tuple
+
+from PyQt5.QtCore import Qt, QRect, QSize, pyqtSignal
+from PyQt5.QtWidgets import QLabel, QRubberBand
+
+# Drags smaller than this (preview pixels) count as a click, which clears the selection
+MIN_SELECTION_PX = 4
+
+# (left, top, right, bottom) in full-resolution image pixels, right/bottom exclusive
+Region = Tuple[int, int, int, int]
+
+
+class ImagePreviewLabel(QLabel):
+    """Scaled image preview on which a region can be selected with a rubber band.
+
+    The label shows a downscaled pixmap, centred; `set_image` records the
+    size of the original so selections map back to full-resolution pixels.
+    """
+
+    region_selected = pyqtSignal(object)  # Region, or None when cleared
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAlignment(Qt.AlignCenter)
+        self._source_size: Optional[QSize] = None
+        self._origin = None
+        self._rubber_band = QRubberBand(QRubberBand.Rectangle, self)
+
+    def set_image(self, pixmap, source_size: QSize):
+        self.clear_selection()
+        self._source_size = source_size
+        self.setPixmap(pixmap)
+        self.setCursor(Qt.CrossCursor)
+        self.setToolTip("Drag to select a region for OCR; click to clear")
+
+    def clear_selection(self):
+        self._origin = None
+        self._rubber_band.hide()
+
+    def _pixmap_rect(self) -> QRect:
+        pixmap = self.pixmap()
+        if self._source_size is None or pixmap is None or pixmap.isNull():
+            return QRect()
+        return QRect((self.width() - pixmap.width()) // 2, (self.height() - pixmap.height()) // 2,
+                     pixmap.width(), pixmap.height())
+
+    def _to_source(self, rect: QRect) -> Region:
+        shown = self._pixmap_rect()
+        sx = self._source_size.width() / shown.width()
+        sy = self._source_size.height() / shown.height()
+        # Outward rounding, so the region never cuts through what was enclosed
+        left = max(0, math.floor((rect.left() - shown.left()) * sx))
+        top = max(0, math.floor((rect.top() - shown.top()) * sy))
+        right = min(self._source_size.width(), math.ceil((rect.right() + 1 - shown.left()) * sx))
+        bottom = min(self._source_size.height(), math.ceil((rect.bottom() + 1 - shown.top()) * sy))
+        return left, top, right, bottom
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self._pixmap_rect().contains(event.pos()):
+            self._origin = event.pos()
+            self._rubber_band.setGeometry(QRect(self._origin, QSize()))
+            self._rubber_band.show()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._origin is not None:
+            rect = QRect(self._origin, event.pos()).normalized().intersected(self._pixmap_rect())
+            self._rubber_band.setGeometry(rect)
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._origin is not None and event.button() == Qt.LeftButton:
+            self._origin = None
+            rect = self._rubber_band.geometry()
+            if rect.width() < MIN_SELECTION_PX or rect.height() < MIN_SELECTION_PX:
+                self._rubber_band.hide()
+                self.region_selected.emit(None)
+            else:
+                self.region_selected.emit(self._to_source(rect))
+        super().mouseReleaseEvent(event)
+
+    def resizeEvent(self, event):
+        # The pixmap moves with the label; a drawn band would no longer match it
+        if self._rubber_band.isVisible():
+            self.clear_selection()
+            self.region_selected.emit(None)
+        super().resizeEvent(event)
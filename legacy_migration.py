@@ -0,0 +1,207 @@
+"""One-shot migration of the pre-SQLite clipboard_history.json / snippets.json files.
+
+The legacy files are parsed incrementally with `json.JSONDecoder.raw_decode`
+over a sliding read buffer, so only one entry is held in memory at a time.
+Entries are fed straight into the database's bulk import, keep their original
+timestamps, and are deduplicated by content hash against both the database and
+earlier entries, so running the migration twice imports nothing new.
+
+Usage: python legacy_migration.py [--db PATH] FILE [FILE ...]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+class _JsonStream:
+    """Reads consecutive JSON tokens from a file through a growing/sliding buffer."""
+
+    def __init__(self, f, chunk_size: int = READ_CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop consumed text before growing the buffer
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Expected one of {chars!r}, found {ch or 'end of file'!r}")
+        self._pos += 1
+        return ch
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A value ending at the buffer edge (or a number stopped by a
+            # partial exponent/fraction) may continue in the next chunk
+            if (end == len(self._buf) or self._buf[end] in _NUMBER_CHARS) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json_array(path: str) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        stream.expect('[')
+        if stream.peek() == ']':
+            return
+        while True:
+            yield stream.value()
+            if stream.expect(',]') == ']':
+                return
+
+
+def iter_json_object(path: str) -> Iterator[Tuple[str, Any]]:
+    """Yield the (key, value) pairs of a top-level JSON object one at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            yield key, stream.value()
+            if stream.expect(',}') == '}':
+                return
+
+
+def _digest(*parts: Optional[str]) -> bytes:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update((part or '').encode('utf-8', 'surrogatepass'))
+        h.update(b'\0')
+    return h.digest()
+
+
+def _to_utc(timestamp: Optional[str], date: Optional[str]) -> Optional[str]:
+    """Legacy local-time ISO timestamp -> the database's UTC 'YYYY-MM-DD HH:MM:SS'."""
+    for value in (timestamp, date):
+        if not value:
+            continue
+        try:
+            local = datetime.fromisoformat(value)
+        except ValueError:
+            continue
+        if local.tzinfo is None:
+            local = local.astimezone()  # naive legacy timestamps are local time
+        return local.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    return None
+
+
+def _clipboard_records(path: str, seen: set, stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    for entry in iter_json_array(path):
+        text = entry.get('text') if isinstance(entry, dict) else None
+        content_type = (entry.get('type') or 'text') if isinstance(entry, dict) else None
+        # Only text entries carried their content in the legacy format
+        if not text or content_type != 'text':
+            stats['skipped'] += 1
+            continue
+        created_at = _to_utc(entry.get('timestamp'), entry.get('date'))
+        key = _digest(content_type, text, created_at)
+        if key in seen:
+            stats['duplicates'] += 1
+            continue
+        seen.add(key)
+        yield {'content_type': content_type, 'content_text': text, 'preview': text[:100],
+               'created_at': created_at}
+
+
+def _snippet_records(path: str, seen: set, stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    for name, content in iter_json_object(path):
+        if not name or not isinstance(content, str):
+            stats['skipped'] += 1
+            continue
+        key = _digest(name, content)
+        if key in seen:
+            stats['duplicates'] += 1
+            continue
+        seen.add(key)
+        yield {'title': name, 'content': content}
+
+
+def detect_kind(path: str) -> Optional[str]:
+    """'clipboard' for a top-level array, 'snippets' for an object, else None."""
+    with open(path, 'r', encoding='utf-8') as f:
+        first = _JsonStream(f, chunk_size=256).peek()
+    return {'[': 'clipboard', '{': 'snippets'}.get(first)
+
+
+def migrate_file(db, path: str, progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+    """Import one legacy file into `db`; returns {'kind', 'imported', 'duplicates', 'skipped'}."""
+    kind = detect_kind(path)
+    stats = {'duplicates': 0, 'skipped': 0}
+    # Hashes of what is already stored, collected before the import transaction starts
+    if kind == 'clipboard':
+        seen = {_digest(*key) for key in db.iter_clipboard_keys()}
+        imported = db.import_clipboard_items(_clipboard_records(path, seen, stats), progress=progress)
+    elif kind == 'snippets':
+        seen = {_digest(s['title'], s['content']) for s in db.iter_snippets()}
+        imported = db.import_snippets(_snippet_records(path, seen, stats), progress=progress)
+    else:
+        raise ValueError(f'{os.path.basename(path)} is not a legacy clipboard or snippets file')
+    result = dict(stats, kind=kind, imported=imported)
+    logger.info(f"Legacy migration of {path}: {result}")
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Import legacy clipboard_history.json / snippets.json files.')
+    parser.add_argument('files', nargs='+', help='legacy JSON files')
+    parser.add_argument('--db', default='clip_snippet_manager.db', help='database path')
+    args = parser.parse_args(argv)
+
+    from database import Database
+    db = Database(args.db)
+    for path in args.files:
+        result = migrate_file(db, path)
+        print(f"{path}: {result['imported']} {result['kind']} imported, "
+              f"{result['duplicates']} duplicates, {result['skipped']} skipped")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
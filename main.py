@@ -14,10 +14,11 @@ from PyQt5.QtWidgets import (
     QHBoxLayout, QListWidget, QListWidgetItem, QTextEdit, QLabel, 
     QPushButton, QInputDialog, QMessageBox, QSystemTrayIcon, QMenu,
     QSplitter, QLineEdit, QComboBox, QDateEdit, QAction, QFileDialog,
-    QStackedWidget, QScrollArea, QToolTip, QFontDialog, QColorDialog, QStyle, QCheckBox, QDialog, QDialogButtonBox
+    QStackedWidget, QScrollArea, QToolTip, QFontDialog, QColorDialog, QStyle, QCheckBox, QDialog, QDialogButtonBox,
+    QProgressDialog, QListView, QProgressBar
 )
-from PyQt5.QtCore import Qt, QTimer, QSize, QMimeData, QDate, QBuffer, QRect
-from PyQt5.QtGui import QIcon, QPixmap, QImage, QClipboard, QCursor, QFont, QColor, QPalette, QGuiApplication
+from PyQt5.QtCore import Qt, QTimer, QSize, QMimeData, QDate, QBuffer, QRect, QByteArray
+from PyQt5.QtGui import QIcon, QPixmap, QImage, QClipboard, QCursor, QFont, QColor, QPalette, QGuiApplication, QTextDocumentFragment
 import ctypes
 from ctypes import wintypes
 
@@ -32,8 +33,21 @@ pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tessera
 
 # Local imports
 from database import Database
+from metrics import REGISTRY as metrics
+from clipboard_cache import RecentClipboardItems
+from quick_paste import QuickPasteIndex, QuickPastePopup, parse_hotkey, snippet_search_text, DEFAULT_HOTKEY, MOD_NOREPEAT
+from fuzzy_match import FuzzyIndex
+from highlight_delegate import HighlightDelegate, HIGHLIGHT_ROLE
+from snippet_model import SnippetListModel, SnippetFilterProxy
+from diagnostics_tab import DiagnosticsTab
+from image_preview import ImagePreviewLabel
+from text_expansion import TriggerAutomaton, ExpansionEngine, KeyboardExpansionHook
+from templating import TemplateCache, builtin_variables
+import bulk_io
+import legacy_migration
 from world_clock_tab_pyqt import WorldClockTab as WCNewTab
-from ocr_utils import ocr_image, OCRPreprocessOptions
+from ocr_jobs import EXTRACT_OPTIONS, OCRIndexer, OCRJobRunner
+from ocr_utils import ocr_engine
 
 # Set up logging
 logging.basicConfig(
@@ -46,11 +60,96 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Settings keys holding custom snippet template variables (%name%)
+SNIPPET_VAR_PREFIX = 'snippet_var_'
+
+# Best fuzzy title matches listed per search; content matches follow them
+SNIPPET_SEARCH_LIMIT = 500
+
+# Clipboard history types whose content_text holds a plain-text projection
+TEXT_LIKE_TYPES = ('text', 'html', 'rtf', 'urls')
+
+# Background OCR indexing only runs after this long without keyboard/mouse input
+OCR_INDEX_IDLE_S = 60
+
+# Delay after a synthesized Ctrl+V before the user's clipboard is put back
+CLIPBOARD_RESTORE_MS = 300
+
+
+class _LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [('cbSize', wintypes.UINT), ('dwTime', wintypes.DWORD)]
+
+
+def user_idle_seconds():
+    """Seconds since the last keyboard/mouse input (Windows), else None."""
+    if sys.platform != 'win32':
+        return None
+    info = _LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return None
+    return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+
+def _user_is_idle() -> bool:
+    idle = user_idle_seconds()
+    return idle is None or idle >= OCR_INDEX_IDLE_S
+
+
+def _is_rtf_format(mime_type: str) -> bool:
+    """True for RTF MIME names, including the Windows native 'Rich Text Format'."""
+    lowered = mime_type.lower()
+    return lowered in ('text/rtf', 'application/rtf') or 'rich text format' in lowered
+
+
+def _copy_mime_data(mime_data: QMimeData) -> QMimeData:
+    """Detached copy of clipboard data, which Qt may replace once the clipboard changes"""
+    copy = QMimeData()
+    if mime_data is None:
+        return copy
+    if mime_data.hasImage():
+        copy.setImageData(mime_data.imageData())
+    for fmt in mime_data.formats():
+        data = mime_data.data(fmt)
+        if not data.isEmpty():
+            copy.setData(fmt, QByteArray(data))
+    return copy
+
+
+def _snippet_content_text(snippet: dict) -> str:
+    """Lowercased title and content, matched by substring search"""
+    return f"{snippet['title']}\n{snippet.get('content') or ''}".lower()
+
+
+def collect_rich_formats(mime_data: QMimeData) -> dict:
+    """Return the HTML, RTF and URI-list payloads present on the clipboard."""
+    formats = {}
+    for fmt in mime_data.formats():
+        if fmt in ('text/html', 'text/uri-list') or _is_rtf_format(fmt):
+            data = bytes(mime_data.data(fmt))
+            if data:
+                formats[fmt] = data
+    return formats
+
+
 class SnippetsTab(QWidget):
     def __init__(self, db: Database):
         super().__init__()
         self.db = db
         self.current_snippet_id = None
+        self._changed_callback = None
+        # In-memory fuzzy index over titles and categories for as-you-type search
+        self.fuzzy_index = FuzzyIndex()
+        # Lowercased title and content per snippet id for substring search
+        self.content_index = {}
+        # Title length per snippet id; highlights past it fall in the indexed category
+        self.title_lengths = {}
+        # Snippet list model; the proxy applies the category filter and search ranking
+        self.snippet_model = SnippetListModel(self)
+        self.snippet_proxy = SnippetFilterProxy(self)
+        self.snippet_proxy.setSourceModel(self.snippet_model)
+        # Snippet contents compiled once per (id, updated_at)
+        self.template_cache = TemplateCache()
         self.init_ui()
         self.load_categories()
         self.load_snippets()
@@ -70,18 +169,25 @@ class SnippetsTab(QWidget):
         # Categories + Manage button
         cat_row = QHBoxLayout()
         self.category_combo = QComboBox()
-        self.category_combo.currentIndexChanged.connect(lambda: self.load_snippets())
+        self.category_combo.currentIndexChanged.connect(self.on_category_changed)
         cat_row.addWidget(self.category_combo)
         self.manage_cats_btn = QPushButton("Manage…")
         self.manage_cats_btn.setToolTip("Rename or delete categories")
         self.manage_cats_btn.clicked.connect(self.manage_categories)
         cat_row.addWidget(self.manage_cats_btn)
+        self.vars_btn = QPushButton("Variables…")
+        self.vars_btn.setToolTip("Edit custom %variables% used in snippet templates")
+        self.vars_btn.clicked.connect(self.edit_variables)
+        cat_row.addWidget(self.vars_btn)
         left_panel.addLayout(cat_row)
         
         # Snippets list
-        self.snippets_list = QListWidget()
-        self.snippets_list.itemClicked.connect(self.on_snippet_selected)
-        self.snippets_list.itemDoubleClicked.connect(self.on_snippet_double_clicked)
+        self.snippets_list = QListView()
+        self.snippets_list.setModel(self.snippet_proxy)
+        self.snippets_list.setUniformItemSizes(True)
+        self.snippets_list.setItemDelegate(HighlightDelegate(self.snippets_list))
+        self.snippets_list.clicked.connect(self.on_snippet_selected)
+        self.snippets_list.doubleClicked.connect(self.on_snippet_double_clicked)
         left_panel.addWidget(self.snippets_list)
         
         # Buttons
@@ -125,66 +231,163 @@ class SnippetsTab(QWidget):
         self.setLayout(main_layout)
         
     def load_categories(self):
-        self.category_combo.clear()
-        self.category_combo.addItem("All Categories", "")
-        for category in self.db.get_snippet_categories():
-            self.category_combo.addItem(category, category)
-        # Keep selection stable if possible
-        try:
-            # If current selection exists, keep it
-            idx = self.category_combo.findData(self.category_combo.currentData())
-            if idx >= 0:
-                self.category_combo.setCurrentIndex(idx)
-        except Exception:
-            pass
+        """Sync the category combo with the cached counts, editing only changed entries"""
+        counts = self.db.get_category_counts()
+        combo = self.category_combo
+        current = combo.currentData()
+        combo.blockSignals(True)
+        if combo.count() == 0:
+            combo.addItem("All Categories", "")
+        for i in range(combo.count() - 1, 0, -1):
+            if combo.itemData(i) not in counts:
+                combo.removeItem(i)
+        # Remaining entries are a sorted subsequence of counts; fill the gaps
+        for pos, (name, count) in enumerate(counts.items(), 1):
+            text = f"{name} ({count})"
+            if pos < combo.count() and combo.itemData(pos) == name:
+                if combo.itemText(pos) != text:
+                    combo.setItemText(pos, text)
+            else:
+                combo.insertItem(pos, text, name)
+        combo.setCurrentIndex(max(0, combo.findData(current)))
+        combo.blockSignals(False)
+        if combo.currentData() != current:
+            self.on_category_changed()
             
+    def on_category_changed(self, *_):
+        category = self.category_combo.currentData()
+        # Empty string is "All Categories"
+        self.snippet_proxy.set_category(category or None)
+        self.apply_search(self.search_box.text())
+            
+    @metrics.timed('ui.load_snippets')
     def load_snippets(self, search_term=None):
-        import time
-        start_time = time.time()
+        """Reload every snippet from the database (e.g. after a bulk import)"""
+        snippets = self.db.get_all_snippets()
+        self.snippet_model.set_snippets(snippets)
+        self.content_index = {s['id']: _snippet_content_text(s) for s in snippets}
+        self.title_lengths = {s['id']: len(s['title']) for s in snippets}
+        self.rebuild_search_index()
+        self.apply_search(search_term if search_term is not None else self.search_box.text())
+        
+    def apply_search(self, search_term):
+        """Rank the list by fuzzy title/category matches, then content matches"""
+        search_term = (search_term or '').strip()
+        if not search_term:
+            self.snippet_proxy.set_ranking(None)
+            return
+        ranking = {}
+        for match in self.fuzzy_index.search(search_term, limit=SNIPPET_SEARCH_LIMIT):
+            title_len = self.title_lengths.get(match.key, 0)
+            ranking[match.key] = (len(ranking), tuple(p for p in match.positions if p < title_len))
+        # Then plain substring matches in the content; the proxy applies the category filter
+        needle = search_term.lower()
+        for snippet_id, text in self.content_index.items():
+            if snippet_id not in ranking and needle in text:
+                ranking[snippet_id] = (len(ranking), ())
+        self.snippet_proxy.set_ranking(ranking)
+                
+    def rebuild_search_index(self):
+        """Reload titles and categories into the in-memory fuzzy index"""
+        self.fuzzy_index.set((s['id'], snippet_search_text(s)) for s in self.snippet_model.snippets())
         
-        self.snippets_list.clear()
-        category = self.category_combo.currentData()
+    def _snippet_saved(self, snippet_id):
+        """Apply one added/edited snippet to the list, combo and search index"""
+        snippet = self.db.get_snippet(snippet_id)
+        if snippet:
+            self.snippet_model.upsert(snippet)
+            self.fuzzy_index.remove(snippet_id)
+            self.fuzzy_index.add(snippet_id, snippet_search_text(snippet))
+            self.content_index[snippet_id] = _snippet_content_text(snippet)
+            self.title_lengths[snippet_id] = len(snippet['title'])
+        self.load_categories()
+        self.apply_search(self.search_box.text())
+        self._notify_snippets_changed()
+        
+    def _snippet_removed(self, snippet_id):
+        self.snippet_model.remove(snippet_id)
+        self.fuzzy_index.remove(snippet_id)
+        self.content_index.pop(snippet_id, None)
+        self.title_lengths.pop(snippet_id, None)
+        self.load_categories()
+        self._notify_snippets_changed()
         
-        # Convert empty string to None for "All Categories"
-        if category == "":
-            category = None
+    def _category_renamed(self, old, new):
+        self.snippet_model.rename_category(old, new)
+        self.rebuild_search_index()
+        self.load_categories()
+        self.apply_search(self.search_box.text())
+        self._notify_snippets_changed()
         
-        if search_term:
-            # Search within the current category filter
-            snippets = self.db.search_snippets(search_term, category)
-        else:
-            # Apply category filter only
-            snippets = self.db.get_all_snippets(category)
-            
-        for snippet in snippets:
-            item = QListWidgetItem(snippet['title'])
-            item.setData(Qt.UserRole, snippet['id'])
-            self.snippets_list.addItem(item)
-            
-        end_time = time.time()
-        ui_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        print(f"PERF: load_snippets UI - {len(snippets)} items displayed in {ui_time:.2f}ms")
-                
     def on_search(self, text):
-        if text.strip():
-            # Search with text, ignore category filter for now
-            self.load_snippets(text)
-        else:
-            # No search text, apply category filter
-            self.load_snippets()
+        self.apply_search(text)
         
-    def on_snippet_selected(self, item):
-        snippet_id = item.data(Qt.UserRole)
+    def set_snippets_changed_callback(self, cb):
+        """Set a callback callable() invoked after snippets are added, edited or deleted."""
+        self._changed_callback = cb
+    
+    def _notify_snippets_changed(self):
+        if self._changed_callback:
+            try:
+                self._changed_callback()
+            except Exception as e:
+                logger.error(f"Snippets changed callback failed: {e}")
+        
+    def on_snippet_selected(self, index):
+        snippet_id = index.data(Qt.UserRole)
         snippet = self.db.get_snippet(snippet_id)
         if snippet:
             self.current_snippet_id = snippet_id
             self.preview_text.setPlainText(snippet['content'])
             
-    def on_snippet_double_clicked(self, item):
-        snippet_id = item.data(Qt.UserRole)
+    def on_snippet_double_clicked(self, index):
+        snippet_id = index.data(Qt.UserRole)
         snippet = self.db.get_snippet(snippet_id)
         if snippet:
-            pyperclip.copy(snippet['content'])
+            pyperclip.copy(self.render_snippet(snippet))
+    
+    def render_snippet(self, snippet) -> str:
+        """Render snippet content, filling %date%, %clipboard% and custom %variables%"""
+        compiled = self.template_cache.get((snippet['id'], snippet.get('updated_at')), snippet['content'])
+        if not compiled.names:
+            return compiled.source
+        variables = {
+            key[len(SNIPPET_VAR_PREFIX):]: value
+            for key, value in self.db.get_settings().items()
+            if key.startswith(SNIPPET_VAR_PREFIX)
+        }
+        variables.update(builtin_variables(clipboard=lambda: QApplication.clipboard().text()))
+        return compiled.render(variables)
+    
+    def edit_variables(self):
+        """Edit custom template variables as name=value lines"""
+        current = {
+            key[len(SNIPPET_VAR_PREFIX):]: value
+            for key, value in self.db.get_settings().items()
+            if key.startswith(SNIPPET_VAR_PREFIX)
+        }
+        text, ok = QInputDialog.getMultiLineText(
+            self, 'Snippet Variables',
+            'One name=value per line. Use as %name% in snippets.\n'
+            'Built-in: %date% %time% %datetime% %year% %month% %day% %weekday% %clipboard%',
+            '\n'.join(f"{k}={v}" for k, v in sorted(current.items()))
+        )
+        if not ok:
+            return
+        updated = {}
+        for line in text.splitlines():
+            if '=' not in line:
+                continue
+            name, value = line.split('=', 1)
+            name = name.strip()
+            if name:
+                updated[name] = value.strip()
+        for name in current:
+            if name not in updated:
+                self.db.delete_setting(SNIPPET_VAR_PREFIX + name)
+        for name, value in updated.items():
+            if current.get(name) != value:
+                self.db.set_setting(SNIPPET_VAR_PREFIX + name, value)
             
     def _choose_category_dialog(self, current_category=""):
         """Dialog to choose existing category or create new one"""
@@ -245,6 +448,22 @@ class SnippetsTab(QWidget):
                 return combo.currentData()
         return None
             
+    def _ask_trigger(self, snippet_id=None, current=""):
+        """Ask for an optional text expansion trigger. Returns None to keep the current one."""
+        trigger, ok = QInputDialog.getText(
+            self, 'Expansion Trigger',
+            'Optional abbreviation that expands to this snippet while typing (e.g. ;sig).\nLeave empty for none:',
+            text=current or ""
+        )
+        if not ok:
+            return None
+        trigger = trigger.strip()
+        owner = self.db.get_snippet_triggers().get(trigger) if trigger else None
+        if owner is not None and owner != snippet_id:
+            QMessageBox.warning(self, 'Trigger In Use', f'"{trigger}" is already used by another snippet; trigger not changed.')
+            return None
+        return trigger
+            
     def add_snippet(self):
         title, ok = QInputDialog.getText(self, 'Add Snippet', 'Enter snippet title:')
         if ok and title:
@@ -252,9 +471,9 @@ class SnippetsTab(QWidget):
             if ok and content:
                 category = self._choose_category_dialog()
                 if category is not None:
-                    self.db.add_snippet(title, content, category)
-                    self.load_snippets()
-                    self.load_categories()
+                    trigger = self._ask_trigger()
+                    snippet_id = self.db.add_snippet(title, content, category, trigger)
+                    self._snippet_saved(snippet_id)
                     
     def edit_snippet(self):
         if not self.current_snippet_id:
@@ -272,9 +491,9 @@ class SnippetsTab(QWidget):
             if ok and content:
                 category = self._choose_category_dialog(snippet.get('category', ''))
                 if category is not None:
-                    self.db.update_snippet(self.current_snippet_id, title, content, category)
-                    self.load_snippets()
-                    self.load_categories()
+                    trigger = self._ask_trigger(self.current_snippet_id, snippet.get('expansion_trigger'))
+                    self.db.update_snippet(self.current_snippet_id, title, content, category, trigger)
+                    self._snippet_saved(self.current_snippet_id)
                     
     def delete_snippet(self):
         if not self.current_snippet_id:
@@ -288,10 +507,9 @@ class SnippetsTab(QWidget):
         
         if reply == QMessageBox.Yes:
             self.db.delete_snippet(self.current_snippet_id)
+            self._snippet_removed(self.current_snippet_id)
             self.current_snippet_id = None
             self.preview_text.clear()
-            self.load_snippets()
-            self.load_categories()
 
     def manage_categories(self):
         dlg = QDialog(self)
@@ -331,8 +549,7 @@ class SnippetsTab(QWidget):
             changed = self.db.rename_snippet_category(old, new)
             if changed >= 0:
                 # Refresh UI
-                self.load_categories()
-                self.load_snippets()
+                self._category_renamed(old, new)
                 # Update dialog list
                 self.cat_list.clear()
                 for c in self.db.get_snippet_categories():
@@ -354,8 +571,7 @@ class SnippetsTab(QWidget):
                 return
             affected = self.db.delete_snippet_category(cat)
             # Refresh UI
-            self.load_categories()
-            self.load_snippets()
+            self._category_renamed(cat, '')
             # Update dialog list
             self.cat_list.clear()
             for c in self.db.get_snippet_categories():
@@ -368,12 +584,15 @@ class SnippetsTab(QWidget):
 
 
 class ClipboardTab(QWidget):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, recent_items: RecentClipboardItems = None):
         super().__init__()
         self.db = db
+        self.recent_items = recent_items
         self.current_item_id = None
         self.last_refresh = None
-        self._ocr_callback = None
+        self._ocr_runner = None
+        self._ocr_region = None
+        self._item_deleted_callback = None
         self.init_ui()
         self.load_clipboard_items()
         
@@ -404,11 +623,9 @@ class ClipboardTab(QWidget):
         """Deprecated: no-op after switching to calendar date selector."""
         return
                 
+    @metrics.timed('ui.load_clipboard_items')
     def load_clipboard_items(self, search_term=None):
         """Load clipboard items with current filters"""
-        import time
-        start_time = time.time()
-        
         self.items_list.clear()
         
         # Determine date filter and search scope
@@ -423,12 +640,17 @@ class ClipboardTab(QWidget):
         
         content_type = self.type_combo.currentData()
         
-        items = self.db.get_clipboard_items(
-            start_date=date_filter if date_filter else None,
-            content_type=content_type,
-            search_term=search_term if search_term else None,
-            search_all_dates=search_all_dates
-        )
+        if (not search_term and date_filter and self.recent_items is not None
+                and self.recent_items.covers_date(date_filter)):
+            # Default per-day view served from the in-memory ring, no I/O
+            items = self.recent_items.items(content_type=content_type, date=date_filter)
+        else:
+            items = self.db.get_clipboard_items(
+                start_date=date_filter if date_filter else None,
+                content_type=content_type,
+                search_term=search_term if search_term else None,
+                search_all_dates=search_all_dates
+            )
         
         for item in items:
             preview = item.get('preview', 'No preview')
@@ -455,18 +677,20 @@ class ClipboardTab(QWidget):
         if self.items_list.count() > 0:
             self.items_list.setCurrentRow(0)
             
-        end_time = time.time()
-        ui_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        print(f"PERF: load_clipboard_items UI - {len(items)} items displayed in {ui_time:.2f}ms")
-            
+    def _get_item(self, item_id):
+        """Fetch a full item, preferring the in-memory ring over the database"""
+        if self.recent_items is not None:
+            cached = self.recent_items.get(item_id, need_payload=True)
+            if cached is not None:
+                return cached
+        return self.db.get_clipboard_item(item_id)
+    
     def on_item_selected(self, item):
         """Handle item selection"""
         item_id = item.data(Qt.UserRole)
         self.current_item_id = item_id
         
-        # Get item details from database
-        items = self.db.get_clipboard_items()
-        item_data = next((i for i in items if i['id'] == item_id), None)
+        item_data = self._get_item(item_id)
         
         if not item_data:
             return
@@ -475,27 +699,30 @@ class ClipboardTab(QWidget):
         # Enable OCR button only for images
         if hasattr(self, 'ocr_btn'):
             self.ocr_btn.setEnabled(content_type == 'image')
+        self._set_ocr_region(None)
         
-        if content_type == 'text':
+        if content_type in TEXT_LIKE_TYPES:
             self.text_preview.setPlainText(item_data.get('content_text', ''))
             self.preview_stack.setCurrentIndex(0)  # Show text preview
         elif content_type == 'image':
             try:
                 image_data = item_data.get('content_data')
                 if image_data:
-                    image = QImage.fromData(image_data)
-                    if not image.isNull():
-                        pixmap = QPixmap.fromImage(image)
-                        
-                        # Scale image to fit preview while maintaining aspect ratio
-                        preview_size = self.image_preview.size()
-                        scaled_pixmap = pixmap.scaled(
-                            preview_size, 
-                            Qt.KeepAspectRatio, 
-                            Qt.SmoothTransformation
-                        )
-                        
-                        self.image_preview.setPixmap(scaled_pixmap)
+                    with metrics.timer('ui.preview_decode'):
+                        image = QImage.fromData(image_data)
+                        scaled_pixmap = None
+                        if not image.isNull():
+                            pixmap = QPixmap.fromImage(image)
+
+                            # Scale image to fit preview while maintaining aspect ratio
+                            preview_size = self.image_preview.size()
+                            scaled_pixmap = pixmap.scaled(
+                                preview_size,
+                                Qt.KeepAspectRatio,
+                                Qt.SmoothTransformation
+                            )
+                    if scaled_pixmap is not None:
+                        self.image_preview.set_image(scaled_pixmap, image.size())
                         self.preview_stack.setCurrentIndex(1)  # Show image preview
                         return
             except Exception as e:
@@ -510,17 +737,30 @@ class ClipboardTab(QWidget):
         """Handle double click to copy to clipboard"""
         self.copy_to_clipboard()
     
-    def set_ocr_callback(self, cb):
-        """Set a callback callable(text: str) to receive OCR results."""
-        self._ocr_callback = cb
+    def set_ocr_runner(self, runner: OCRJobRunner):
+        """Set the background runner that OCR extractions are queued on."""
+        self._ocr_runner = runner
+
+    def set_item_deleted_callback(self, cb):
+        """Set a callback callable(item_id) invoked after a history item is deleted."""
+        self._item_deleted_callback = cb
+
+    def _set_ocr_region(self, region):
+        """Limit OCR to a region of the previewed image (None = whole image)."""
+        self._ocr_region = region
+        if region is None:
+            self.image_preview.clear_selection()
+            self.ocr_btn.setText("Extract Text (OCR)")
+        else:
+            left, top, right, bottom = region
+            self.ocr_btn.setText(f"Extract Text from Selection ({right - left}×{bottom - top})")
     
     def extract_text(self):
-        """Run OCR on selected image item and send text to OCR tab via callback."""
+        """Queue OCR of the selected image item; results arrive via the runner's signals."""
         if not self.current_item_id:
             return
         # Fetch the item again to ensure we have content_data
-        items = self.db.get_clipboard_items()
-        item_data = next((i for i in items if i['id'] == self.current_item_id), None)
+        item_data = self._get_item(self.current_item_id)
         if not item_data or item_data.get('content_type') != 'image':
             QMessageBox.information(self, 'OCR', 'Please select an image item.')
             return
@@ -528,13 +768,11 @@ class ClipboardTab(QWidget):
             img_bytes = item_data.get('content_data')
             if not img_bytes:
                 raise ValueError('No image data found for this item')
-            from io import BytesIO
-            pil_img = Image.open(BytesIO(img_bytes))
-            # Reasonable default options; can be made configurable later
-            opt = OCRPreprocessOptions(upscale=1.5, grayscale=True, auto_contrast=True, sharpen=True)
-            text = ocr_image(pil_img, lang='eng', opt=opt)
-            if self._ocr_callback:
-                self._ocr_callback(text)
+            label = f'Clipboard item #{self.current_item_id}'
+            if self._ocr_region is not None:
+                label += ' (selection)'
+            self._ocr_runner.submit(img_bytes, label=label, lang='eng', opt=EXTRACT_OPTIONS,
+                                    region=self._ocr_region)
         except Exception as e:
             QMessageBox.critical(self, 'OCR Error', f'Failed to extract text: {e}')
         
@@ -542,9 +780,11 @@ class ClipboardTab(QWidget):
         """Copy selected item to clipboard"""
         if not self.current_item_id:
             return
-            
-        items = self.db.get_clipboard_items()
-        item_data = next((i for i in items if i['id'] == self.current_item_id), None)
+        self.copy_item(self.current_item_id)
+    
+    def copy_item(self, item_id, notify: bool = True):
+        """Put a history item (all of its formats) back on the clipboard"""
+        item_data = self._get_item(item_id)
         
         if not item_data:
             return
@@ -555,6 +795,13 @@ class ClipboardTab(QWidget):
         try:
             if content_type == 'text':
                 clipboard.setText(item_data.get('content_text', ''))
+            elif content_type in TEXT_LIKE_TYPES:
+                # Put every captured format back so rich targets keep formatting
+                mime = QMimeData()
+                mime.setText(item_data.get('content_text', '') or '')
+                for mime_type, data in self.db.get_clipboard_formats(item_data['id']).items():
+                    mime.setData(mime_type, QByteArray(data))
+                clipboard.setMimeData(mime)
             elif content_type == 'image':
                 image_data = item_data.get('content_data')
                 if image_data:
@@ -563,13 +810,14 @@ class ClipboardTab(QWidget):
                         clipboard.setImage(image)
                         
             # Show brief notification
-            QToolTip.showText(
-                QCursor.pos(),
-                f"{content_type.capitalize()} copied to clipboard",
-                self,
-                self.rect(),
-                1000
-            )
+            if notify:
+                QToolTip.showText(
+                    QCursor.pos(),
+                    f"{content_type.capitalize()} copied to clipboard",
+                    self,
+                    self.rect(),
+                    1000
+                )
             
         except Exception as e:
             logger.error(f"Error copying to clipboard: {e}")
@@ -587,11 +835,15 @@ class ClipboardTab(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            # Delete from database
-            with self.db._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM clipboard_history WHERE id = ?', (self.current_item_id,))
-                conn.commit()
+            item_id = self.current_item_id
+            self.db.delete_clipboard_item(item_id)
+            if self.recent_items is not None:
+                self.recent_items.remove(item_id)
+            if self._item_deleted_callback:
+                try:
+                    self._item_deleted_callback(item_id)
+                except Exception as e:
+                    logger.error(f"Clipboard item deleted callback failed: {e}")
             
             # Refresh the list
             self.current_item_id = None
@@ -626,6 +878,9 @@ class ClipboardTab(QWidget):
         self.type_combo.addItem("All Types", "all")
         self.type_combo.addItem("Text", "text")
         self.type_combo.addItem("Images", "image")
+        self.type_combo.addItem("HTML", "html")
+        self.type_combo.addItem("RTF", "rtf")
+        self.type_combo.addItem("Files/Links", "urls")
         self.type_combo.currentIndexChanged.connect(self.on_filter_changed)
         filter_layout.addWidget(self.type_combo)
         
@@ -680,9 +935,9 @@ class ClipboardTab(QWidget):
         self.text_preview.setReadOnly(True)
         self.preview_stack.addWidget(self.text_preview)
         
-        # Image preview
-        self.image_preview = QLabel()
-        self.image_preview.setAlignment(Qt.AlignCenter)
+        # Image preview; dragging on it selects the region to OCR
+        self.image_preview = ImagePreviewLabel()
+        self.image_preview.region_selected.connect(self._set_ocr_region)
         scroll_area = QScrollArea()
         scroll_area.setWidget(self.image_preview)
         scroll_area.setWidgetResizable(True)
@@ -724,9 +979,25 @@ class ClipboardTab(QWidget):
 
 
 class OCRTab(QWidget):
-    def __init__(self):
+    def __init__(self, runner: OCRJobRunner = None):
         super().__init__()
+        self.runner = runner
         layout = QVBoxLayout()
+        # Busy indicator for background OCR jobs
+        status_row = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # indeterminate
+        self.progress_bar.setMaximumWidth(160)
+        self.status_label = QLabel()
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setToolTip("Cancel the running extraction")
+        self.cancel_all_btn = QPushButton("Cancel All")
+        self.cancel_all_btn.setToolTip("Cancel the running extraction and everything queued")
+        status_row.addWidget(self.progress_bar)
+        status_row.addWidget(self.status_label, 1)
+        status_row.addWidget(self.cancel_btn)
+        status_row.addWidget(self.cancel_all_btn)
+        layout.addLayout(status_row)
         self.text = QTextEdit()
         self.text.setReadOnly(False)
         layout.addWidget(QLabel("Extracted Text:"))
@@ -742,10 +1013,45 @@ class OCRTab(QWidget):
         actions.addStretch()
         layout.addLayout(actions)
         self.setLayout(layout)
+        self._stage = ''
+        if runner is not None:
+            self.cancel_btn.clicked.connect(runner.cancel_current)
+            self.cancel_all_btn.clicked.connect(runner.cancel_all)
+            runner.job_started.connect(self._on_job_started)
+            runner.job_progress.connect(self._on_job_progress)
+            runner.job_cancelled.connect(self._on_job_cancelled)
+            runner.queue_changed.connect(self._update_status)
+        self._update_status(0)
 
     def set_text(self, value: str):
         self.text.setPlainText(value or "")
 
+    def _on_job_started(self, job_id: int, label: str):
+        self._stage = f'Extracting text from {label}' if label else 'Extracting text'
+        self._update_status(self.runner.pending_count())
+
+    def _on_job_progress(self, job_id: int, stage: str):
+        self.status_label.setText(f'{self._stage}: {stage}...{self._queued_suffix()}')
+
+    def _on_job_cancelled(self, job_id: int):
+        self.status_label.setText('OCR cancelled')
+
+    def _queued_suffix(self) -> str:
+        queued = self.runner.pending_count() - 1 if self.runner else 0
+        return f' ({queued} queued)' if queued > 0 else ''
+
+    def _update_status(self, pending: int):
+        busy = pending > 0
+        self.progress_bar.setVisible(busy)
+        self.cancel_btn.setVisible(busy)
+        self.cancel_all_btn.setVisible(busy)
+        if busy:
+            self.status_label.setText(f'{self._stage or "Extracting text"}...{self._queued_suffix()}')
+        else:
+            self._stage = ''
+            if self.status_label.text() != 'OCR cancelled':
+                self.status_label.clear()
+
 
 class WorldClockTab(QWidget):
     def __init__(self, db: Database):
@@ -1014,6 +1320,9 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.db = Database()
+        # Recent clipboard items kept in memory for the default view, tray and quick paste
+        self.recent_items = RecentClipboardItems(capacity=200)
+        self.recent_items.prime(self.db.get_clipboard_items(search_all_dates=True, limit=self.recent_items.capacity))
         # Apply saved Tesseract path early if present
         try:
             saved_tess = self.db.get_setting('tesseract_path', '')
@@ -1031,8 +1340,11 @@ class MainWindow(QMainWindow):
         if font_str:
             self.custom_font.fromString(font_str)
         self.init_ui()
+        self.db.add_settings_listener(self.on_setting_changed)
+        self.setup_metrics()
         self.setup_system_tray()
         self.setup_clipboard_monitoring()
+        self.setup_clipboard_restore()
         # Cleanup old items and VACUUM on startup (one-time per launch)
         self.cleanup_old_items()
         # Try to register native clipboard listener (Windows)
@@ -1041,6 +1353,12 @@ class MainWindow(QMainWindow):
             self.register_clipboard_listener()
         except Exception as e:
             logger.warning(f"Could not register native clipboard listener: {e}")
+        # Quick paste popup and its global hotkey (Windows)
+        self.setup_quick_paste()
+        # Snippet trigger expansion while typing (Windows keyboard hook)
+        self.setup_text_expansion()
+        # Idle-time OCR of image clips for search
+        self.setup_ocr_indexing()
         # Populate launch details in status bar once
         try:
             self.update_launch_details()
@@ -1072,12 +1390,15 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.snippets_tab, "Snippets")
          
         # Clipboard tab
-        self.clipboard_tab = ClipboardTab(self.db)
+        self.clipboard_tab = ClipboardTab(self.db, self.recent_items)
         self.tabs.addTab(self.clipboard_tab, "Clipboard History")
         # Hook OCR callback from Clipboard tab later after OCR tab is created
  
         # OCR tab
-        self.ocr_tab = OCRTab()
+        self.ocr_runner = OCRJobRunner(self, db=self.db)
+        self.ocr_runner.job_finished.connect(lambda job_id, text: self.show_ocr_text(text))
+        self.ocr_runner.job_failed.connect(self.on_ocr_failed)
+        self.ocr_tab = OCRTab(self.ocr_runner)
         self.tabs.addTab(self.ocr_tab, "OCR")
 
         # World Clock tab (new implementation)
@@ -1085,7 +1406,9 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.world_clock_tab, "World Clock")
 
         # Connect OCR callback now that tab exists
-        self.clipboard_tab.set_ocr_callback(self.show_ocr_text)
+        self.clipboard_tab.set_ocr_runner(self.ocr_runner)
+        self.snippets_tab.set_snippets_changed_callback(self.on_snippets_changed)
+        self.clipboard_tab.set_item_deleted_callback(self.on_clipboard_item_deleted)
         # Detect Tesseract availability and set up tab behavior
         self.tesseract_available = self._detect_tesseract()
         self._last_tab_index = self.tabs.currentIndex()
@@ -1111,6 +1434,24 @@ class MainWindow(QMainWindow):
         retention_action = QAction("Retention...", self)
         retention_action.triggered.connect(self.configure_retention)
         view_menu.addAction(retention_action)
+        # Text expansion toggle under Menu
+        self.text_expansion_action = QAction("Text Expansion", self, checkable=True)
+        self.text_expansion_action.setToolTip("Expand snippet triggers while typing in any application")
+        self.text_expansion_action.setChecked(self.db.get_setting('text_expansion_enabled', '0') == '1')
+        self.text_expansion_action.toggled.connect(self.toggle_text_expansion)
+        view_menu.addAction(self.text_expansion_action)
+        # Quick paste hotkey under Menu
+        quick_paste_action = QAction("Quick Paste Hotkey...", self)
+        quick_paste_action.setToolTip("Set the global hotkey that opens the quick paste popup")
+        quick_paste_action.triggered.connect(self.configure_quick_paste_hotkey)
+        view_menu.addAction(quick_paste_action)
+        # Background OCR of image clips under Menu
+        self.ocr_indexing_action = QAction("Index Image Text (OCR)", self, checkable=True)
+        self.ocr_indexing_action.setToolTip("OCR image clips while the computer is idle so searches find their text")
+        self.ocr_indexing_action.setChecked(self.db.get_setting('ocr_indexing_enabled', '0') == '1')
+        self.ocr_indexing_action.toggled.connect(
+            lambda on: self.db.set_setting('ocr_indexing_enabled', '1' if on else '0'))
+        view_menu.addAction(self.ocr_indexing_action)
         # Tesseract path chooser under Menu
         tess_action = QAction("Tesseract Path...", self)
         tess_action.setToolTip("Set the path to tesseract.exe to enable OCR")
@@ -1121,6 +1462,29 @@ class MainWindow(QMainWindow):
         url_manager_action.setToolTip("Manage custom meeting URLs for third-party integrations")
         url_manager_action.triggered.connect(self.open_custom_url_manager)
         view_menu.addAction(url_manager_action)
+        # Bulk import/export under Menu
+        transfer_menu = view_menu.addMenu("Import / Export")
+        for label, handler in (("Import Snippets...", self.import_snippets_file),
+                               ("Export Snippets...", self.export_snippets_file),
+                               ("Import Clipboard History...", self.import_clipboard_file),
+                               ("Export Clipboard History...", self.export_clipboard_file),
+                               ("Import Legacy JSON Files...", self.import_legacy_files)):
+            action = QAction(label, self)
+            action.triggered.connect(handler)
+            transfer_menu.addAction(action)
+        # Diagnostics (hidden by default)
+        diagnostics_menu = view_menu.addMenu("Diagnostics")
+        self.diagnostics_tab = None
+        self.diagnostics_action = QAction("Show Diagnostics Tab", self, checkable=True)
+        self.diagnostics_action.setToolTip("Show latency percentiles, slow operations and database statistics")
+        self.diagnostics_action.toggled.connect(self.toggle_diagnostics_tab)
+        diagnostics_menu.addAction(self.diagnostics_action)
+        self.metrics_action = QAction("Collect Metrics", self, checkable=True)
+        self.metrics_action.setChecked(self.db.get_setting('metrics_enabled', '1') != '0')
+        self.metrics_action.toggled.connect(
+            lambda on: self.db.set_setting('metrics_enabled', '1' if on else '0'))
+        diagnostics_menu.addAction(self.metrics_action)
+        self.diagnostics_action.setChecked(self.db.get_setting('diagnostics_tab_visible', '0') == '1')
         
         # Add separator
         view_menu.addSeparator()
@@ -1168,10 +1532,17 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error showing OCR text: {e}")
 
+    def on_ocr_failed(self, job_id: int, message: str):
+        self.statusBar().showMessage('OCR extraction failed', 2000)
+        QMessageBox.critical(self, 'OCR Error', f'Failed to extract text: {message}')
+
     def _detect_tesseract(self) -> bool:
         """Return True if Tesseract OCR is available on this machine."""
         try:
             import shutil
+            # The tesserocr binding needs no binary
+            if ocr_engine() == 'tesserocr':
+                return True
             # If an explicit cmd path is set and exists
             cmd = getattr(pytesseract.pytesseract, 'tesseract_cmd', '')
             if cmd and os.path.exists(cmd):
@@ -1217,12 +1588,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, 'Invalid File', 'Please select tesseract.exe')
             return
         try:
-            pytesseract.pytesseract.tesseract_cmd = path
-            # Persist in DB
+            # Persist in DB; on_setting_changed applies it and updates the UI
             self.db.set_setting('tesseract_path', path)
-            # Re-evaluate availability and update UI
-            self.tesseract_available = self._detect_tesseract()
-            self.update_ocr_availability_ui()
             if self.tesseract_available:
                 QMessageBox.information(self, 'OCR Ready', 'Tesseract detected. OCR features are now enabled.')
             else:
@@ -1230,6 +1597,61 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, 'Error', f'Failed to set Tesseract path: {e}')
 
+    def on_setting_changed(self, key: str, value):
+        """React to settings written anywhere in the app"""
+        if key == 'tesseract_path':
+            if value and os.path.exists(value):
+                pytesseract.pytesseract.tesseract_cmd = value
+            self.tesseract_available = self._detect_tesseract()
+            self.update_ocr_availability_ui()
+            if hasattr(self, 'ocr_indexer'):
+                self.apply_ocr_indexing(self.db.get_setting('ocr_indexing_enabled', '0') == '1')
+        elif key == 'text_expansion_enabled' and hasattr(self, 'text_expansion_action'):
+            enabled = value == '1'
+            if self.text_expansion_action.isChecked() != enabled:
+                self.text_expansion_action.setChecked(enabled)
+        elif key == 'quick_paste_hotkey':
+            try:
+                self.register_quick_paste_hotkey()
+            except Exception as e:
+                logger.warning(f"Could not register quick paste hotkey: {e}")
+        elif key == 'ocr_indexing_enabled' and hasattr(self, 'ocr_indexer'):
+            enabled = value == '1'
+            if self.ocr_indexing_action.isChecked() != enabled:
+                self.ocr_indexing_action.setChecked(enabled)
+            self.apply_ocr_indexing(enabled)
+        elif key == 'metrics_enabled':
+            metrics.enabled = value != '0'
+            if hasattr(self, 'metrics_action') and self.metrics_action.isChecked() != metrics.enabled:
+                self.metrics_action.setChecked(metrics.enabled)
+
+    # ===== Metrics =====
+    def setup_metrics(self):
+        """Enable timing metrics per settings and export them periodically"""
+        metrics.enabled = self.db.get_setting('metrics_enabled', '1') != '0'
+        db_dir = os.path.dirname(os.path.abspath(self.db.db_path))
+        self.metrics_path = os.path.join(db_dir, 'clip_snippet_metrics.jsonl')
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.export_metrics)
+        self.metrics_timer.start(5 * 60 * 1000)
+
+    def export_metrics(self):
+        if metrics.enabled:
+            metrics.export_json(self.metrics_path)
+
+    def toggle_diagnostics_tab(self, visible: bool):
+        """Add or remove the Diagnostics tab and remember the choice"""
+        if visible:
+            if self.diagnostics_tab is None:
+                self.diagnostics_tab = DiagnosticsTab(self.db)
+            if self.tabs.indexOf(self.diagnostics_tab) < 0:
+                self.tabs.addTab(self.diagnostics_tab, "Diagnostics")
+        elif self.diagnostics_tab is not None:
+            index = self.tabs.indexOf(self.diagnostics_tab)
+            if index >= 0:
+                self.tabs.removeTab(index)
+        self.db.set_setting('diagnostics_tab_visible', '1' if visible else '0')
+
     def open_custom_url_manager(self):
         """Open the Custom URL Manager dialog"""
         from world_clock_tab_pyqt import CustomUrlManagerDialog
@@ -1262,6 +1684,14 @@ class MainWindow(QMainWindow):
         show_action = QAction("Show", self)
         show_action.triggered.connect(self.show)
         tray_menu.addAction(show_action)
+        
+        quick_paste_tray_action = QAction("Quick Paste", self)
+        quick_paste_tray_action.triggered.connect(lambda: self.show_quick_paste(remember_target=False))
+        tray_menu.addAction(quick_paste_tray_action)
+        
+        # Recent clips, rebuilt from the in-memory ring each time the menu opens
+        self.tray_recent_menu = tray_menu.addMenu("Recent Clips")
+        self.tray_recent_menu.aboutToShow.connect(self.populate_tray_recent_menu)
          
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.close_application)
@@ -1270,6 +1700,261 @@ class MainWindow(QMainWindow):
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
          
+    def populate_tray_recent_menu(self):
+        self.tray_recent_menu.clear()
+        items = self.recent_items.items(limit=10)
+        if not items:
+            empty = self.tray_recent_menu.addAction("(empty)")
+            empty.setEnabled(False)
+            return
+        for item in items:
+            label = (item.get('preview') or '').replace('\n', ' ')
+            if len(label) > 40:
+                label = label[:37] + '...'
+            action = self.tray_recent_menu.addAction(f"[{item['content_type'].capitalize()}] {label}")
+            action.triggered.connect(lambda checked=False, item_id=item['id']: self.clipboard_tab.copy_item(item_id, notify=False))
+    
+    def _remember_clip(self, item_id: int, content_type: str, content_data: bytes = None,
+                       content_text: str = None, preview: str = None):
+        """Feed a freshly stored item into the recent-items ring and quick paste index"""
+        item = {
+            'id': item_id,
+            'content_type': content_type,
+            'content_data': content_data,
+            'content_text': content_text,
+            'preview': preview,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self.recent_items.add(item)
+        if hasattr(self, 'quick_paste_index'):
+            self.quick_paste_index.add_clip(item)
+    
+    # ===== Quick paste popup =====
+    QUICK_PASTE_HOTKEY_ID = 0xB001
+    
+    def setup_quick_paste(self):
+        """Build the quick paste index up front so the popup opens instantly"""
+        self.quick_paste_index = QuickPasteIndex(capacity=self.recent_items.capacity)
+        self.quick_paste_index.set_clips(self.recent_items.items())
+        self.refresh_quick_paste_snippets()
+        self.quick_paste_popup = QuickPastePopup(self.quick_paste_index, self.on_quick_paste_chosen)
+        self._quick_paste_target_hwnd = None
+        self._quick_paste_hotkey_registered = False
+        try:
+            self.register_quick_paste_hotkey()
+        except Exception as e:
+            logger.warning(f"Could not register quick paste hotkey: {e}")
+    
+    def on_clipboard_item_deleted(self, item_id: int):
+        if hasattr(self, 'quick_paste_index'):
+            self.quick_paste_index.remove_clip(item_id)
+
+    def on_snippets_changed(self):
+        self.refresh_quick_paste_snippets()
+        self.refresh_expansion_triggers()
+    
+    def refresh_quick_paste_snippets(self):
+        if hasattr(self, 'quick_paste_index'):
+            self.quick_paste_index.set_snippets(self.db.get_all_snippets())
+    
+    def register_quick_paste_hotkey(self):
+        self.unregister_quick_paste_hotkey()
+        hotkey = self.db.get_setting('quick_paste_hotkey', DEFAULT_HOTKEY) or DEFAULT_HOTKEY
+        parsed = parse_hotkey(hotkey)
+        if not parsed:
+            raise ValueError(f'Invalid hotkey: {hotkey}')
+        modifiers, vk = parsed
+        hwnd = int(self.winId())
+        user32 = ctypes.windll.user32
+        if not user32.RegisterHotKey(wintypes.HWND(hwnd), self.QUICK_PASTE_HOTKEY_ID, modifiers | MOD_NOREPEAT, vk):
+            raise RuntimeError(f'RegisterHotKey failed for {hotkey} (already in use?)')
+        self._quick_paste_hotkey_registered = True
+    
+    def unregister_quick_paste_hotkey(self):
+        if not getattr(self, '_quick_paste_hotkey_registered', False):
+            return
+        try:
+            hwnd = int(self.winId())
+            ctypes.windll.user32.UnregisterHotKey(wintypes.HWND(hwnd), self.QUICK_PASTE_HOTKEY_ID)
+        except Exception:
+            pass
+        self._quick_paste_hotkey_registered = False
+    
+    def configure_quick_paste_hotkey(self):
+        current = self.db.get_setting('quick_paste_hotkey', DEFAULT_HOTKEY) or DEFAULT_HOTKEY
+        hotkey, ok = QInputDialog.getText(
+            self,
+            'Quick Paste Hotkey',
+            'Global hotkey (e.g. Ctrl+Shift+Space, Ctrl+Alt+V, Win+F9):',
+            text=current
+        )
+        if not ok:
+            return
+        hotkey = hotkey.strip()
+        if not parse_hotkey(hotkey):
+            QMessageBox.warning(self, 'Invalid Hotkey', 'Use modifiers (Ctrl, Alt, Shift, Win) plus a letter, digit, F-key or Space.')
+            return
+        # on_setting_changed re-registers the hotkey
+        self.db.set_setting('quick_paste_hotkey', hotkey)
+        if getattr(self, '_quick_paste_hotkey_registered', False):
+            QMessageBox.information(self, 'Quick Paste', f'Quick paste hotkey set to {hotkey}.')
+        else:
+            QMessageBox.warning(self, 'Quick Paste', f'Could not register {hotkey} (already in use?)')
+    
+    def show_quick_paste(self, remember_target: bool = True):
+        # Remember the window that had focus so the chosen entry is pasted there
+        self._quick_paste_target_hwnd = None
+        if remember_target:
+            try:
+                self._quick_paste_target_hwnd = ctypes.windll.user32.GetForegroundWindow()
+            except Exception:
+                pass
+        self.quick_paste_popup.open_at_cursor()
+    
+    def on_quick_paste_chosen(self, kind: str, item_id: int):
+        try:
+            if kind != 'clip':
+                snippet = self.db.get_snippet(item_id)
+                if not snippet:
+                    return
+            if self._quick_paste_target_hwnd:
+                self.begin_clipboard_paste()
+            if kind == 'clip':
+                self.clipboard_tab.copy_item(item_id, notify=False)
+            else:
+                QApplication.clipboard().setText(self.snippets_tab.render_snippet(snippet))
+            if self._quick_paste_target_hwnd:
+                # Give the popup time to hide before restoring focus and pasting
+                QTimer.singleShot(50, self._paste_into_target_window)
+        except Exception as e:
+            logger.error(f"Quick paste failed: {e}")
+            self.end_clipboard_paste()
+    
+    # ===== Background OCR indexing =====
+    def setup_ocr_indexing(self):
+        self.ocr_indexer = OCRIndexer(self.db, is_idle=_user_is_idle, opt=EXTRACT_OPTIONS)
+        self.apply_ocr_indexing(self.db.get_setting('ocr_indexing_enabled', '0') == '1')
+
+    def apply_ocr_indexing(self, enabled: bool):
+        """Start or stop the indexer; it only runs when Tesseract is available."""
+        if enabled and self.tesseract_available:
+            self.ocr_indexer.start()
+        else:
+            self.ocr_indexer.stop()
+
+    # ===== Text expansion =====
+    def setup_text_expansion(self):
+        self.trigger_automaton = TriggerAutomaton(self.db.get_snippet_triggers())
+        self.expansion_engine = ExpansionEngine(self.trigger_automaton)
+        self.expansion_hook = KeyboardExpansionHook(
+            self.expansion_engine,
+            # Runs inside the hook; defer the actual expansion to the event loop
+            lambda trigger, snippet_id: QTimer.singleShot(0, lambda: self.expand_trigger(trigger, snippet_id))
+        )
+        if self.text_expansion_action.isChecked():
+            self.toggle_text_expansion(True)
+    
+    def refresh_expansion_triggers(self):
+        """Apply only the changed triggers to the automaton"""
+        if hasattr(self, 'trigger_automaton'):
+            changed, removed = self.trigger_automaton.update(self.db.get_snippet_triggers())
+            if changed or removed:
+                logger.info(f"Expansion triggers updated: {changed} changed, {removed} removed")
+    
+    def toggle_text_expansion(self, checked: bool):
+        self.db.set_setting('text_expansion_enabled', '1' if checked else '0')
+        try:
+            if checked:
+                self.expansion_hook.install()
+            else:
+                self.expansion_hook.uninstall()
+        except Exception as e:
+            logger.warning(f"Could not toggle text expansion: {e}")
+            if checked:
+                self.text_expansion_action.blockSignals(True)
+                self.text_expansion_action.setChecked(False)
+                self.text_expansion_action.blockSignals(False)
+    
+    def expand_trigger(self, trigger: str, snippet_id: int):
+        """Replace the typed trigger in the focused window with the snippet content"""
+        snippet = self.db.get_snippet(snippet_id)
+        if not snippet:
+            return
+        try:
+            self.begin_clipboard_paste()
+            QApplication.clipboard().setText(self.snippets_tab.render_snippet(snippet))
+            user32 = ctypes.windll.user32
+            VK_BACK, VK_CONTROL, VK_V, KEYEVENTF_KEYUP = 0x08, 0x11, 0x56, 0x0002
+            for _ in range(len(trigger)):
+                user32.keybd_event(VK_BACK, 0, 0, 0)
+                user32.keybd_event(VK_BACK, 0, KEYEVENTF_KEYUP, 0)
+            user32.keybd_event(VK_CONTROL, 0, 0, 0)
+            user32.keybd_event(VK_V, 0, 0, 0)
+            user32.keybd_event(VK_V, 0, KEYEVENTF_KEYUP, 0)
+            user32.keybd_event(VK_CONTROL, 0, KEYEVENTF_KEYUP, 0)
+        except Exception as e:
+            logger.warning(f"Text expansion failed: {e}")
+        finally:
+            self.end_clipboard_paste()
+    
+    def _paste_into_target_window(self):
+        """Refocus the previously active window and send Ctrl+V"""
+        try:
+            user32 = ctypes.windll.user32
+            user32.SetForegroundWindow(self._quick_paste_target_hwnd)
+            VK_CONTROL, VK_V, KEYEVENTF_KEYUP = 0x11, 0x56, 0x0002
+            user32.keybd_event(VK_CONTROL, 0, 0, 0)
+            user32.keybd_event(VK_V, 0, 0, 0)
+            user32.keybd_event(VK_V, 0, KEYEVENTF_KEYUP, 0)
+            user32.keybd_event(VK_CONTROL, 0, KEYEVENTF_KEYUP, 0)
+        except Exception as e:
+            logger.warning(f"Could not paste into target window: {e}")
+        finally:
+            self._quick_paste_target_hwnd = None
+            self.end_clipboard_paste()
+    
+    # ===== Pasting through the clipboard =====
+    def setup_clipboard_restore(self):
+        # Copy of the user's clipboard while a snippet or quick paste item is on it
+        self._saved_clipboard = None
+        self._clipboard_restoring = False
+        self._clipboard_restore_timer = QTimer(self)
+        self._clipboard_restore_timer.setSingleShot(True)
+        self._clipboard_restore_timer.timeout.connect(self._restore_clipboard)
+    
+    def begin_clipboard_paste(self):
+        """Save the clipboard before putting paste content on it; capture pauses until it is restored"""
+        self._clipboard_restore_timer.stop()
+        if self._saved_clipboard is None:
+            self._saved_clipboard = _copy_mime_data(QApplication.clipboard().mimeData())
+    
+    def end_clipboard_paste(self):
+        """Put the saved clipboard back once the target has had time to handle Ctrl+V"""
+        if self._saved_clipboard is not None:
+            self._clipboard_restore_timer.start(CLIPBOARD_RESTORE_MS)
+    
+    def _restore_clipboard(self):
+        saved, self._saved_clipboard = self._saved_clipboard, None
+        if saved is None:
+            return
+        # Keep capture paused until the change notification for the restore has been handled
+        self._clipboard_restoring = True
+        try:
+            if saved.formats():
+                QApplication.clipboard().setMimeData(saved)
+            else:
+                QApplication.clipboard().clear()
+        except Exception as e:
+            logger.warning(f"Could not restore clipboard: {e}")
+        QTimer.singleShot(CLIPBOARD_RESTORE_MS, self._end_clipboard_restore)
+    
+    def _end_clipboard_restore(self):
+        self._clipboard_restoring = False
+    
+    def _clipboard_is_ours(self) -> bool:
+        """True while the clipboard holds paste content or the restore of the user's data"""
+        return self._saved_clipboard is not None or self._clipboard_restoring
+        
     def setup_clipboard_monitoring(self):
         self.clipboard = QApplication.clipboard()
         try:
@@ -1285,7 +1970,10 @@ class MainWindow(QMainWindow):
             pass
         QGuiApplication.instance().applicationStateChanged.connect(self.on_app_state_changed)
         
+    @metrics.timed('clipboard.capture')
     def on_clipboard_changed(self):
+        if self._clipboard_is_ours():
+            return
         try:
             # Get clipboard data
             mime_data = self.clipboard.mimeData()
@@ -1300,10 +1988,14 @@ class MainWindow(QMainWindow):
                     image.save(buffer, 'PNG')
                     current_image_data = buffer.data()
                     
-                    # Get the most recent image from database
-                    recent_items = self.db.get_clipboard_items(content_type='image', limit=1)
-                    if recent_items:
-                        recent_data = recent_items[0].get('content_data')
+                    current_image_data = bytes(current_image_data)
+                    
+                    # Compare against the most recent image, from memory when possible
+                    recent = self.recent_items.latest('image')
+                    if recent is not None and recent.get('content_data') is None:
+                        recent = self.db.get_clipboard_item(recent['id'])
+                    if recent:
+                        recent_data = recent.get('content_data')
                         if recent_data and recent_data == current_image_data:
                             return  # Skip if same as last image
                     
@@ -1314,15 +2006,52 @@ class MainWindow(QMainWindow):
                     )
                     
                     # Save to database
-                    self.db.add_clipboard_item(
+                    item_id = self.db.add_clipboard_item(
                         content_type='image',
                         content_data=current_image_data,
                         content_text='[Image]',
                         preview='[Image]'
                     )
+                    self._remember_clip(item_id, 'image', current_image_data, '[Image]', '[Image]')
+                    if self.ocr_indexer.running:
+                        self.ocr_indexer.wake()
                     
                     logger.info('Image captured to clipboard history')
                     
+            elif mime_data.hasUrls() or mime_data.hasHtml() or any(_is_rtf_format(f) for f in mime_data.formats()):
+                # Handle rich copies (browser/Outlook HTML, RTF, Explorer file lists)
+                formats = collect_rich_formats(mime_data)
+                if mime_data.hasUrls():
+                    content_type = 'urls'
+                    text = '\n'.join(url.toLocalFile() or url.toString() for url in mime_data.urls())
+                elif 'text/html' in formats:
+                    content_type = 'html'
+                    text = mime_data.text() or QTextDocumentFragment.fromHtml(mime_data.html()).toPlainText()
+                else:
+                    content_type = 'rtf'
+                    text = mime_data.text()
+                text = (text or '').strip()
+                
+                if len(text) < 3 or text == self.last_clip:
+                    return
+                    
+                self.last_clip = text
+                
+                preview = text[:100]
+                if len(text) > 100:
+                    preview += '...'
+                
+                # Only the plain-text projection goes into content_text (and FTS)
+                item_id = self.db.add_clipboard_item(
+                    content_type=content_type,
+                    content_text=text,
+                    preview=preview,
+                    formats=formats
+                )
+                self._remember_clip(item_id, content_type, None, text, preview)
+                
+                logger.info(f'{content_type.upper()} captured to clipboard history')
+                
             elif mime_data.hasText():
                 # Handle text
                 text = mime_data.text().strip()
@@ -1339,11 +2068,12 @@ class MainWindow(QMainWindow):
                     preview += '...'
                 
                 # Save to database
-                self.db.add_clipboard_item(
+                item_id = self.db.add_clipboard_item(
                     content_type='text',
                     content_text=text,
                     preview=preview
                 )
+                self._remember_clip(item_id, 'text', None, text, preview)
                 
                 logger.info('Text captured to clipboard history')
                 
@@ -1390,10 +2120,14 @@ class MainWindow(QMainWindow):
                 MSG = wintypes.MSG
                 msg = MSG.from_address(int(message))
                 WM_CLIPBOARDUPDATE = 0x031D
+                WM_HOTKEY = 0x0312
                 if msg.message == WM_CLIPBOARDUPDATE:
                     # Defer handling to Qt event loop to avoid reentrancy
                     QTimer.singleShot(0, self.on_clipboard_changed)
                     return True, 0
+                if msg.message == WM_HOTKEY and msg.wParam == self.QUICK_PASTE_HOTKEY_ID:
+                    QTimer.singleShot(0, self.show_quick_paste)
+                    return True, 0
         except Exception:
             pass
         return False, 0
@@ -1404,6 +2138,10 @@ class MainWindow(QMainWindow):
         deleted_count = self.db.cleanup_old_items(days)
         if deleted_count > 0:
             logger.info(f'Cleaned up {deleted_count} old clipboard items')
+            # Deleted rows may still be cached; reload the ring
+            self.recent_items.prime(self.db.get_clipboard_items(search_all_dates=True, limit=self.recent_items.capacity))
+            if hasattr(self, 'quick_paste_index'):
+                self.quick_paste_index.set_clips(self.recent_items.items())
             
     def closeEvent(self, event):
         """Override close event to minimize to system tray"""
@@ -1470,6 +2208,14 @@ class MainWindow(QMainWindow):
             self.unregister_clipboard_listener()
         except Exception:
             pass
+        self.unregister_quick_paste_hotkey()
+        try:
+            self.expansion_hook.uninstall()
+        except Exception:
+            pass
+        self.ocr_runner.shutdown()
+        self.ocr_indexer.stop()
+        self.export_metrics()
         self.tray_icon.hide()
         QApplication.quit()
     
@@ -1530,6 +2276,105 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, 'Cleanup Complete', 'Old items deleted as per retention. Database has been vacuumed.')
         else:
             QMessageBox.information(self, 'Retention Saved', 'Changes will take effect on next launch.')
+
+    # ===== Bulk import/export =====
+    def _run_bulk_transfer(self, title: str, func, path: str):
+        """Run a bulk_io import/export with a cancellable progress dialog.
+
+        Returns the record count, or None if cancelled or failed.
+        """
+        dialog = QProgressDialog(f'{title}...', 'Cancel', 0, 0, self)
+        dialog.setWindowTitle(title)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+
+        class _Cancelled(Exception):
+            pass
+
+        def progress(count):
+            dialog.setLabelText(f'{title}: {count:,} records')
+            QApplication.processEvents()
+            if dialog.wasCanceled():
+                raise _Cancelled()
+
+        try:
+            return func(self.db, path, progress=progress)
+        except _Cancelled:
+            # Imports run in one transaction and exports go through a temp file, so nothing was written
+            self.statusBar().showMessage(f'{title} cancelled', 3000)
+        except Exception as e:
+            logger.error(f"{title} failed: {e}")
+            QMessageBox.warning(self, title, f'{title} failed:\n{e}')
+        finally:
+            dialog.close()
+        return None
+
+    def import_snippets_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Import Snippets', '', bulk_io.FILE_FILTER)
+        if not path:
+            return
+        count = self._run_bulk_transfer('Import Snippets', bulk_io.import_snippets, path)
+        if count is None:
+            return
+        self._reload_snippets()
+        QMessageBox.information(self, 'Import Snippets', f'Imported {count:,} snippets.')
+
+    def export_snippets_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export Snippets', 'snippets.jsonl', bulk_io.FILE_FILTER)
+        if not path:
+            return
+        count = self._run_bulk_transfer('Export Snippets', bulk_io.export_snippets, path)
+        if count is not None:
+            QMessageBox.information(self, 'Export Snippets', f'Exported {count:,} snippets.')
+
+    def import_clipboard_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Import Clipboard History', '', bulk_io.FILE_FILTER)
+        if not path:
+            return
+        count = self._run_bulk_transfer('Import Clipboard History', bulk_io.import_clipboard_history, path)
+        if count is None:
+            return
+        self._reload_clipboard_history()
+        QMessageBox.information(self, 'Import Clipboard History', f'Imported {count:,} clipboard items.')
+
+    def _reload_clipboard_history(self):
+        self.recent_items.prime(self.db.get_clipboard_items(search_all_dates=True, limit=self.recent_items.capacity))
+        if hasattr(self, 'quick_paste_index'):
+            self.quick_paste_index.set_clips(self.recent_items.items())
+        self.clipboard_tab.refresh_data()
+
+    def _reload_snippets(self):
+        self.snippets_tab.load_categories()
+        self.snippets_tab.load_snippets()
+        self.snippets_tab._notify_snippets_changed()
+
+    def import_legacy_files(self):
+        """Migrate pre-SQLite clipboard_history.json / snippets.json files."""
+        paths, _ = QFileDialog.getOpenFileNames(self, 'Import Legacy JSON Files', '', 'JSON (*.json);;All files (*)')
+        if not paths:
+            return
+        lines = []
+        for path in paths:
+            result = self._run_bulk_transfer('Import Legacy JSON', legacy_migration.migrate_file, path)
+            if result is None:
+                continue
+            if result['kind'] == 'clipboard':
+                self._reload_clipboard_history()
+            else:
+                self._reload_snippets()
+            lines.append(f"{os.path.basename(path)}: {result['imported']:,} {result['kind']} imported, "
+                         f"{result['duplicates']:,} duplicates, {result['skipped']:,} skipped")
+        if lines:
+            QMessageBox.information(self, 'Import Legacy JSON', '\n'.join(lines))
+
+    def export_clipboard_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export Clipboard History', 'clipboard_history.jsonl',
+                                              bulk_io.FILE_FILTER)
+        if not path:
+            return
+        count = self._run_bulk_transfer('Export Clipboard History', bulk_io.export_clipboard_history, path)
+        if count is not None:
+            QMessageBox.information(self, 'Export Clipboard History', f'Exported {count:,} clipboard items.')
  
     # ===== Appearance controls =====
     def toggle_dark_mode(self, checked: bool):
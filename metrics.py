@@ -0,0 +1,263 @@
+"""In-process metrics: counters, fixed-bucket histograms and timers.
+
+    from metrics import REGISTRY as metrics
+
+    metrics.counter('clipboard.captured').inc()
+    with metrics.timer('db.search_snippets'):
+        ...
+
+    @metrics.timed('ui.load_snippets')
+    def load_snippets(...): ...
+
+When the registry is disabled, `counter()`, `histogram()` and `timer()`
+return shared no-op objects and `timed` wrappers call straight through, so
+instrumentation can stay in hot paths. Snapshots export as JSON lines to a size-rotated file.
+"""
+import bisect
+import functools
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in milliseconds; one overflow bucket follows the last bound
+DEFAULT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Counter:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n: int = 1) -> None:
+        # += is a read-modify-write; the indexer and OCR threads count too
+        with self._lock:
+            self.value += n
+
+
+class Histogram:
+    """Fixed-bucket histogram; memory and observe() cost do not grow with samples."""
+
+    __slots__ = ('bounds', 'buckets', 'count', 'total', 'min', 'max', '_lock')
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.buckets = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Estimate the p-th percentile (0-100) by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else min(self.min, self.bounds[0])
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.total, 3),
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': dict(zip([str(b) for b in self.bounds] + ['+Inf'], self.buckets)),
+        }
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _NullCounter(Counter):
+    __slots__ = ()
+
+    def inc(self, n: int = 1) -> None:
+        pass
+
+
+class _NullHistogram(Histogram):
+    __slots__ = ()
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+_NULL_COUNTER = _NullCounter()
+_NULL_HISTOGRAM = _NullHistogram()
+
+
+class _Timer:
+    __slots__ = ('_registry', '_name', '_detail', '_histogram', '_start', 'elapsed_ms')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, detail: Optional[str] = None):
+        self._registry = registry
+        self._name = name
+        self._detail = detail
+        self._histogram = registry.histogram(name)
+        self.elapsed_ms = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self._start) * 1000.0
+        self._histogram.observe(self.elapsed_ms)
+        if self.elapsed_ms >= self._registry.slow_threshold_ms:
+            self._registry.record_slow(self._name, self.elapsed_ms, self._detail)
+        return False
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True, slow_threshold_ms: float = 100.0, slow_capacity: int = 20):
+        self.enabled = enabled
+        self.slow_threshold_ms = slow_threshold_ms
+        self._slow_capacity = slow_capacity
+        self._counters: Dict[str, Counter] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        # Min-heap of (elapsed_ms, seq, name, detail, wall time); holds the slowest operations
+        self._slow: List[Tuple[float, int, str, Optional[str], float]] = []
+        self._slow_seq = 0
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def counter(self, name: str) -> Counter:
+        if not self.enabled:
+            return _NULL_COUNTER
+        c = self._counters.get(name)
+        if c is None:
+            with self._lock:
+                c = self._counters.setdefault(name, Counter())
+        return c
+
+    def histogram(self, name: str, bounds: Sequence[float] = DEFAULT_BUCKETS_MS) -> Histogram:
+        if not self.enabled:
+            return _NULL_HISTOGRAM
+        h = self._histograms.get(name)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(name, Histogram(bounds))
+        return h
+
+    def timer(self, name: str, detail: Optional[str] = None):
+        """Context manager recording elapsed milliseconds into histogram `name`.
+
+        Runs slower than `slow_threshold_ms` are also kept, with `detail`,
+        in the slow operation list.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, detail)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator form of `timer`."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record_slow(self, name: str, elapsed_ms: float, detail: Optional[str] = None) -> None:
+        with self._lock:
+            self._slow_seq += 1
+            entry = (elapsed_ms, self._slow_seq, name, detail, time.time())
+            if len(self._slow) < self._slow_capacity:
+                heapq.heappush(self._slow, entry)
+            elif elapsed_ms > self._slow[0][0]:
+                heapq.heapreplace(self._slow, entry)
+
+    def slow_operations(self) -> List[Dict[str, Any]]:
+        """The slowest timed operations seen, slowest first."""
+        with self._lock:
+            entries = sorted(self._slow, reverse=True)
+        return [{'name': name, 'ms': round(ms, 2), 'detail': detail,
+                 'at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(at))}
+                for ms, _seq, name, detail, at in entries]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'uptime_s': round(time.time() - self._started, 1),
+            'counters': {name: c.value for name, c in sorted(counters.items())},
+            'histograms': {name: h.snapshot() for name, h in sorted(histograms.items())},
+            'slow': self.slow_operations(),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._slow.clear()
+
+    def export_json(self, path: str, max_bytes: int = 1024 * 1024, backups: int = 3) -> None:
+        """Append a snapshot as one JSON line, rotating path -> path.1 ... path.N by size."""
+        line = json.dumps(self.snapshot()) + '\n'
+        try:
+            if os.path.exists(path) and os.path.getsize(path) + len(line) > max_bytes:
+                for i in range(backups - 1, 0, -1):
+                    src = f'{path}.{i}'
+                    if os.path.exists(src):
+                        os.replace(src, f'{path}.{i + 1}')
+                os.replace(path, f'{path}.1')
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            logger.warning(f"Metrics export to {path} failed: {e}")
+
+
+REGISTRY = MetricsRegistry()
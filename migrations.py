@@ -0,0 +1,55 @@
+import logging
+import sqlite3
+import time
+from typing import Callable, NamedTuple, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def run_migrations(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> int:
+    """Bring the database schema up to the last migration's version.
+
+    The applied version is kept in PRAGMA user_version, so an up-to-date
+    database costs a single pragma read. Pending migrations run in order,
+    each in its own transaction together with the version bump; a failing
+    step is rolled back and re-raised, leaving the database at the last
+    good version. Returns the resulting version.
+    """
+    current = schema_version(conn)
+    target = migrations[-1].version if migrations else 0
+    if current >= target:
+        return current
+
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # explicit BEGIN/COMMIT; DDL must not autocommit mid-step
+    try:
+        for migration in migrations:
+            if migration.version <= current:
+                continue
+            started = time.perf_counter()
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
+            try:
+                migration.apply(cursor)
+                cursor.execute(f'PRAGMA user_version = {int(migration.version)}')
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                logger.exception(f"Schema migration {migration.version} ({migration.description}) failed")
+                raise
+            current = migration.version
+            logger.info(f"Schema migration {migration.version} ({migration.description}) "
+                        f"applied in {(time.perf_counter() - started) * 1000:.1f}ms")
+    finally:
+        conn.isolation_level = isolation_level
+    return current
@@ -0,0 +1,108 @@
+"""Bulk OCR of stored image clips across every core.
+
+Does the same work as the idle-time `OCRIndexer` - fills in the text of
+image items from the OCR index cursor onward, through the OCR
+cache - but flat out, with `ocr_utils.ocr_images` spreading preprocessing
+and recognition over a process pool. Run it while the app is closed, e.g.
+after importing a large history.
+
+Usage: python ocr_backfill.py [--db PATH] [--workers N] [--timeout SECONDS]
+"""
+import argparse
+import logging
+import os
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import pytesseract
+
+from ocr_jobs import DEFAULT_TIMEOUT_S, EXTRACT_OPTIONS
+from ocr_utils import OCRPreprocessOptions, image_hash, ocr_images, options_key, tesseract_version
+
+logger = logging.getLogger(__name__)
+
+# Image rows fetched per query; keeps no read transaction open while results are written
+PAGE_SIZE = 50
+
+
+def _iter_images(db, after_id: int) -> Iterator[Dict[str, Any]]:
+    while True:
+        page = db.images_for_ocr(after_id, PAGE_SIZE)
+        if not page:
+            return
+        yield from page
+        after_id = page[-1]['id']
+
+
+def _store_text(db, item_id: int, text: str) -> None:
+    text = text.strip()
+    if text:
+        db.set_clipboard_ocr_text(item_id, text)
+
+
+def backfill(db, lang: str = 'eng', opt: Optional[OCRPreprocessOptions] = EXTRACT_OPTIONS,
+             workers: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT_S,
+             progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+    """OCR every image item past the indexer cursor; returns {'indexed', 'cached', 'failed'}."""
+    start = db.get_ocr_index_cursor()
+    version = tesseract_version()
+    opts = options_key(opt)
+    stats = {'indexed': 0, 'cached': 0, 'failed': 0}
+    submitted = deque()  # (item id, image hash) in pool submission order
+    last_seen = start
+
+    def uncached() -> Iterator[bytes]:
+        nonlocal last_seen
+        for item in _iter_images(db, start):
+            last_seen = item['id']
+            data = item['content_data']
+            if not data:
+                continue
+            digest = image_hash(data)
+            text = db.get_ocr_result(digest, lang, opts, version)
+            if text is not None:
+                _store_text(db, item['id'], text)
+                stats['cached'] += 1
+                continue
+            submitted.append((item['id'], digest))
+            yield data
+
+    for result in ocr_images(uncached(), lang=lang, opt=opt, workers=workers, timeout=timeout):
+        item_id, digest = submitted.popleft()
+        if result.error is not None:
+            logger.warning(f"OCR of clipboard item {item_id} failed: {result.error}")
+            stats['failed'] += 1
+        else:
+            db.store_ocr_result(digest, lang, opts, version, result.text)
+            _store_text(db, item_id, result.text)
+            stats['indexed'] += 1
+        # Results arrive in id order, so everything up to here is done
+        db.set_ocr_index_cursor(item_id)
+        if progress:
+            progress(sum(stats.values()))
+    if last_seen > start:
+        db.set_ocr_index_cursor(last_seen)
+    logger.info(f"OCR backfill: {stats}")
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='OCR all stored image clips so searches find their text.')
+    parser.add_argument('--db', default='clip_snippet_manager.db', help='database path')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_S, help='per-image Tesseract timeout')
+    args = parser.parse_args(argv)
+
+    from database import Database
+    db = Database(args.db)
+    saved_tess = db.get_setting('tesseract_path', '')
+    if saved_tess and os.path.exists(saved_tess):
+        pytesseract.pytesseract.tesseract_cmd = saved_tess
+    stats = backfill(db, workers=args.workers, timeout=args.timeout,
+                     progress=lambda n: print(f'\r{n} images processed', end='', flush=True))
+    print(f"\n{stats['indexed']} recognized, {stats['cached']} from cache, {stats['failed']} failed")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+"""Benchmark the OCR preprocessing backends on large screenshots.
+
+Times `preprocess_image` with the 'chain' (one PIL pass per step) and 'lut'
+(fused lookup tables) backends for a few option sets, checks that both
+produce identical pixels, and prints one row per image/option set.
+Without arguments it uses synthetic screenshots (text on light and dark
+panels over a gradient) at common multi-monitor sizes.
+
+For the synthetic images the text mask is known, so it also compares the
+binarization methods - global Otsu and the adaptive mean threshold - by
+F-measure of the text pixels they find, with and without uneven shading
+across the screen.
+
+With --recognition N it instead times N Tesseract runs on one small text
+line per available engine: what an image costs beyond recognition itself
+(process start, temp files, model loading) shows as the difference.
+
+Usage: python ocr_benchmark.py [--repeat N] [--recognition N] [IMAGE ...]
+"""
+import argparse
+import random
+import time
+from dataclasses import replace
+from typing import Dict, Iterator, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageDraw
+
+import ocr_utils
+from ocr_utils import OCRPreprocessOptions, preprocess_image, recognize_text
+
+SYNTHETIC_SIZES = ((1920, 1080), (3840, 2160), (7680, 2160))
+
+OPTION_SETS: Dict[str, OCRPreprocessOptions] = {
+    'extract (gray+contrast+sharpen)': OCRPreprocessOptions(grayscale=True, auto_contrast=True, sharpen=True),
+    'gray+contrast+otsu': OCRPreprocessOptions(grayscale=True, auto_contrast=True, strong_threshold=True),
+    'gray+equalize+threshold': OCRPreprocessOptions(grayscale=True, equalize=True, threshold=True),
+    'gray+adaptive': OCRPreprocessOptions(grayscale=True, adaptive_threshold=True),
+}
+
+BINARIZE_SETS: Dict[str, OCRPreprocessOptions] = {
+    'global otsu': OCRPreprocessOptions(grayscale=True, auto_contrast=True, strong_threshold=True),
+    'adaptive mean': OCRPreprocessOptions(grayscale=True, adaptive_threshold=True),
+}
+
+
+def synthetic_screenshot(width: int, height: int, seed: int = 0,
+                         shading: bool = False) -> Tuple[Image.Image, Image.Image]:
+    """A screenshot-like image and its text mask.
+
+    The mask is 255 on text pixels and 128 on their anti-aliased fringe,
+    which counts neither for nor against a binarization.
+
+    Gradient desktop with light and dark panels full of text; `shading`
+    darkens the screen towards one side, as in a photo of a monitor.
+    """
+    rng = random.Random(seed)
+    gradient = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    img = Image.blend(gradient, Image.new('RGB', (width, height), (40, 90, 160)), 0.6)
+    mask = Image.new('L', (width, height), 0)
+    draw, mask_draw = ImageDraw.Draw(img), ImageDraw.Draw(mask)
+    words = 'error warning timeout connection refused retry failed module line value'.split()
+    panel_w, panel_h = max(200, width // 4), max(150, height // 3)
+    for px in range(0, width - panel_w + 1, panel_w):
+        for py in range(0, height - panel_h + 1, panel_h):
+            dark = rng.random() < 0.5
+            bg, fg = ((30, 30, 30), (220, 220, 220)) if dark else ((245, 245, 245), (20, 20, 20))
+            draw.rectangle((px + 8, py + 8, px + panel_w - 8, py + panel_h - 8), fill=bg)
+            for y in range(py + 16, py + panel_h - 24, 14):
+                line = ' '.join(rng.choice(words) for _ in range(panel_w // 60))
+                draw.text((px + 16, y), line, fill=fg)
+                mask_draw.text((px + 16, y), line, fill=255)
+    if shading:
+        light = Image.linear_gradient('L').rotate(90).resize((width, height)).point(lambda v: 110 + v * 145 // 255)
+        img = ImageChops.multiply(img, light.convert('RGB'))
+    return img, mask.point(lambda v: 255 if v >= 128 else 128 if v else 0)
+
+
+def _images(paths) -> Iterator[Tuple[str, Image.Image, Optional[Image.Image]]]:
+    if paths:
+        for path in paths:
+            yield path, Image.open(path).convert('RGB'), None
+    else:
+        for w, h in SYNTHETIC_SIZES:
+            yield (f'synthetic {w}x{h}', *synthetic_screenshot(w, h))
+        w, h = SYNTHETIC_SIZES[0]
+        yield (f'shaded {w}x{h}', *synthetic_screenshot(w, h, shading=True))
+
+
+def f_measure(binary: Image.Image, mask: Image.Image) -> float:
+    """F-measure of the black pixels of `binary` against the text mask."""
+    ink = ImageChops.invert(binary.convert('L'))
+    text = mask.point(lambda v: 255 if v == 255 else 0)
+    fringe = mask.point(lambda v: 255 if v == 128 else 0)
+    found = ink.histogram()[255] - ImageChops.multiply(ink, fringe).histogram()[255]
+    truth = text.histogram()[255]
+    hits = ImageChops.multiply(ink, text).histogram()[255]
+    if not hits:
+        return 0.0
+    precision, recall = hits / found, hits / truth
+    return 2 * precision * recall / (precision + recall)
+
+
+def _best_time(img: Image.Image, opt: OCRPreprocessOptions, repeat: int) -> Tuple[float, Image.Image]:
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = preprocess_image(img, opt)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0, out
+
+
+def text_line() -> Image.Image:
+    """One short, crisp line of text: recognition itself costs next to nothing."""
+    img = Image.new('L', (360, 32), 255)
+    ImageDraw.Draw(img).text((8, 10), 'connection refused: retry 3 of 5', fill=0)
+    return img.resize((720, 64))
+
+
+def benchmark_recognition(runs: int) -> None:
+    img = text_line()
+    engines = ['pytesseract'] + (['tesserocr'] if ocr_utils.tesserocr is not None else [])
+    print(f"{'engine':<12} {'first ms':>9} {'per image ms':>13}  text")
+    for engine in engines:
+        ocr_utils.ENGINE = engine
+        try:
+            started = time.perf_counter()
+            text = recognize_text(img)
+            first = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            for _ in range(runs):
+                recognize_text(img)
+            each = (time.perf_counter() - started) * 1000 / max(1, runs)
+        except Exception as e:
+            print(f'{engine:<12} unavailable: {e}')
+            continue
+        print(f'{engine:<12} {first:9.1f} {each:13.1f}  {text.strip()!r}')
+    ocr_utils.ENGINE = 'auto'
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Compare the OCR preprocessing backends.')
+    parser.add_argument('images', nargs='*', help='screenshots to use instead of synthetic ones')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    parser.add_argument('--recognition', type=int, metavar='N', help='time N recognitions per OCR engine instead')
+    args = parser.parse_args(argv)
+    if args.recognition:
+        benchmark_recognition(args.recognition)
+        return 0
+
+    samples = list(_images(args.images))
+
+    print(f"{'image':<24} {'options':<32} {'chain ms':>9} {'lut ms':>9}  same")
+    for name, img, _ in samples:
+        for label, opt in OPTION_SETS.items():
+            results = [_best_time(img, replace(opt, backend=b), args.repeat) for b in ('chain', 'lut')]
+            same = len({out.tobytes() for _, out in results}) == 1
+            times = ' '.join(f'{ms:9.1f}' for ms, _ in results)
+            print(f'{name:<24} {label:<32} {times}  {same}')
+
+    print(f"\n{'image':<24} {'binarization':<32} {'ms':>9} {'F-measure':>9}")
+    for name, img, mask in samples:
+        if mask is None:
+            continue
+        for label, opt in BINARIZE_SETS.items():
+            ms, out = _best_time(img, opt, args.repeat)
+            print(f'{name:<24} {label:<32} {ms:9.1f} {f_measure(out, mask):9.3f}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
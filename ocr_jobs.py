@@ -0,0 +1,294 @@
+"""Background OCR: a queue of extraction jobs served by one worker thread.
+
+Jobs are submitted from the GUI thread with the raw image bytes; decoding,
+preprocessing and the Tesseract run all happen on the worker, and results
+come back through Qt signals, which are delivered on the GUI thread.
+Cancellation takes effect between pipeline stages; a job cancelled while
+Tesseract is running has its result discarded once the run returns.
+With a database attached, results are cached by image content hash,
+language, preprocessing options and Tesseract version, so repeat
+extractions skip the pipeline entirely.
+
+`OCRIndexer` separately backfills the text of image clips during idle time.
+"""
+import io
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import pytesseract
+from PIL import Image
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from metrics import REGISTRY as metrics
+from ocr_utils import (
+    OCRCancelled, OCRPreprocessOptions, ProgressCallback, image_hash, ocr_image, options_key, tesseract_version
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_S = 120
+
+# Options used for user-requested extraction and background indexing alike,
+# so both share cached results; `auto` drops the steps an image does not need
+EXTRACT_OPTIONS = OCRPreprocessOptions(upscale=1.5, grayscale=True, auto_contrast=True, sharpen=True, auto=True)
+
+# Background indexer: share of wall time spent recognizing, and how often
+# to re-check idleness / new images
+INDEX_DUTY_CYCLE = 0.25
+INDEX_POLL_S = 30
+
+
+def cached_ocr(db, image_bytes: bytes, lang: str = 'eng', opt: Optional[OCRPreprocessOptions] = None,
+               progress: Optional[ProgressCallback] = None, timeout: float = 0,
+               workers: Optional[int] = None, region: Optional[Tuple[int, int, int, int]] = None) -> str:
+    """OCR encoded image bytes, consulting and filling the database's OCR cache.
+
+    With `db` None this is just decode + `ocr_image`. Cache errors are logged
+    and never fail the extraction. `workers` caps the threads used for
+    tiled recognition of large images. `region` (left, top, right, bottom)
+    limits OCR to that crop of the full-resolution image; it is cached
+    separately from the whole image.
+    """
+    key = None
+    if db is not None:
+        digest = image_hash(image_bytes)
+        if region is not None:
+            digest += '@' + ','.join(str(v) for v in region)
+        key = (digest, lang, options_key(opt), tesseract_version())
+        try:
+            cached = db.get_ocr_result(*key)
+        except Exception as e:
+            logger.warning(f"OCR cache lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            metrics.counter('ocr.cache.hits').inc()
+            return cached
+        metrics.counter('ocr.cache.misses').inc()
+    if progress is not None:
+        progress('decode')
+    img = Image.open(io.BytesIO(image_bytes))
+    img.load()
+    if region is not None:
+        img = img.crop(region)
+    text = ocr_image(img, lang=lang, opt=opt, progress=progress, timeout=timeout, workers=workers)
+    if key is not None:
+        try:
+            db.store_ocr_result(*key, text)
+        except Exception as e:
+            logger.warning(f"OCR cache store failed: {e}")
+    return text
+
+
+class OCRJob:
+    __slots__ = ('id', 'image_bytes', 'label', 'lang', 'opt', 'region', 'cancel_event')
+
+    def __init__(self, job_id: int, image_bytes: bytes, label: str, lang: str,
+                 opt: Optional[OCRPreprocessOptions], region: Optional[Tuple[int, int, int, int]] = None):
+        self.id = job_id
+        self.image_bytes = image_bytes
+        self.label = label
+        self.lang = lang
+        self.opt = opt
+        self.region = region
+        self.cancel_event = threading.Event()
+
+
+class OCRJobRunner(QObject):
+    """Runs OCR jobs one at a time, in submission order, off the GUI thread."""
+
+    job_started = pyqtSignal(int, str)     # job id, label
+    job_progress = pyqtSignal(int, str)    # job id, stage name
+    job_finished = pyqtSignal(int, str)    # job id, extracted text
+    job_failed = pyqtSignal(int, str)      # job id, error message
+    job_cancelled = pyqtSignal(int)        # job id
+    queue_changed = pyqtSignal(int)        # jobs queued or running
+
+    def __init__(self, parent=None, db=None, timeout: float = DEFAULT_TIMEOUT_S):
+        super().__init__(parent)
+        self.db = db
+        self.timeout = timeout
+        self._queue: 'queue.Queue[Optional[OCRJob]]' = queue.Queue()
+        self._jobs: 'OrderedDict[int, OCRJob]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._current: Optional[OCRJob] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, image_bytes: bytes, label: str = '', lang: str = 'eng',
+               opt: Optional[OCRPreprocessOptions] = None,
+               region: Optional[Tuple[int, int, int, int]] = None) -> int:
+        """Queue an extraction, optionally of a region only; returns the job id used in the signals."""
+        with self._lock:
+            self._next_id += 1
+            job = OCRJob(self._next_id, image_bytes, label, lang, opt, region)
+            self._jobs[job.id] = job
+            pending = len(self._jobs)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ocr-worker', daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+        self.queue_changed.emit(pending)
+        return job.id
+
+    def cancel(self, job_id: int) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel_event.set()
+
+    def cancel_current(self) -> None:
+        job = self._current
+        if job is not None:
+            job.cancel_event.set()
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def shutdown(self) -> None:
+        """Cancel everything and stop the worker after its current stage."""
+        self.cancel_all()
+        if self._thread is not None:
+            self._queue.put(None)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._current = job
+            try:
+                self._process(job)
+            finally:
+                self._current = None
+                with self._lock:
+                    self._jobs.pop(job.id, None)
+                    pending = len(self._jobs)
+                self.queue_changed.emit(pending)
+
+    def _process(self, job: OCRJob) -> None:
+        if job.cancel_event.is_set():
+            self.job_cancelled.emit(job.id)
+            return
+
+        def progress(stage: str) -> None:
+            if job.cancel_event.is_set():
+                raise OCRCancelled()
+            self.job_progress.emit(job.id, stage)
+
+        self.job_started.emit(job.id, job.label)
+        try:
+            text = cached_ocr(self.db, job.image_bytes, job.lang, job.opt, progress, self.timeout,
+                              region=job.region)
+        except OCRCancelled:
+            self.job_cancelled.emit(job.id)
+            return
+        except Exception as e:
+            logger.error(f"OCR job {job.id} ({job.label}) failed: {e}")
+            self.job_failed.emit(job.id, str(e))
+            return
+        if job.cancel_event.is_set():
+            self.job_cancelled.emit(job.id)
+        else:
+            self.job_finished.emit(job.id, text)
+
+
+class OCRIndexer:
+    """Low-priority OCR of image clips so their text becomes searchable.
+
+    A daemon thread takes image items in id order, only while `is_idle()`
+    says the user is away, and stores the recognized text as the item's
+    content_text (which the FTS trigger indexes). After each image it sleeps
+    long enough to keep recognition at `duty_cycle` of wall time. The last
+    processed id is saved as the database's OCR index cursor whenever the
+    indexer pauses or stops, so indexing resumes there after a restart;
+    images captured later simply have higher ids. Work lost to a crash is
+    redone from the OCR cache.
+    """
+
+    def __init__(self, db, is_idle: Callable[[], bool] = lambda: True, lang: str = 'eng',
+                 opt: Optional[OCRPreprocessOptions] = None, duty_cycle: float = INDEX_DUTY_CYCLE,
+                 timeout: float = DEFAULT_TIMEOUT_S):
+        self.db = db
+        self.lang = lang
+        self.opt = opt
+        self.duty_cycle = max(0.01, min(1.0, duty_cycle))
+        self.timeout = timeout
+        self._is_idle = is_idle
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._stop.clear()
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name='ocr-indexer', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop after the current pipeline stage."""
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self) -> None:
+        """Check for work now (e.g. after an image was captured)."""
+        self._wake.set()
+
+    def _wait(self, seconds: float) -> None:
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def _check_stop(self, stage: str) -> None:
+        if self._stop.is_set():
+            raise OCRCancelled()
+
+    def _run(self) -> None:
+        cursor = saved = self.db.get_ocr_index_cursor()
+        try:
+            while not self._stop.is_set():
+                item = self.db.next_image_for_ocr(cursor) if self._is_idle() else None
+                if item is None:
+                    # Persist progress only when pausing, not once per image
+                    if cursor != saved:
+                        self.db.set_ocr_index_cursor(cursor)
+                        saved = cursor
+                    self._wait(INDEX_POLL_S)
+                    continue
+                started = time.perf_counter()
+                try:
+                    if item['content_data']:
+                        # One tile at a time: the indexer should never take every core
+                        text = cached_ocr(self.db, item['content_data'], self.lang, self.opt,
+                                          self._check_stop, self.timeout, workers=1).strip()
+                        if text:
+                            self.db.set_clipboard_ocr_text(item['id'], text)
+                    metrics.counter('ocr.indexed').inc()
+                except OCRCancelled:
+                    return
+                except pytesseract.TesseractNotFoundError:
+                    logger.warning("OCR indexing stopped: Tesseract not found")
+                    return
+                except Exception as e:
+                    # Unreadable or timed-out images are skipped, not retried forever
+                    logger.warning(f"OCR indexing skipped clipboard item {item['id']}: {e}")
+                cursor = item['id']
+                busy = time.perf_counter() - started
+                self._stop.wait(busy * (1.0 - self.duty_cycle) / self.duty_cycle)
+        finally:
+            if cursor != saved:
+                self.db.set_ocr_index_cursor(cursor)
@@ -1,9 +1,28 @@
-from dataclasses import dataclass
-from typing import Optional
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
-from PIL import Image, ImageFilter, ImageOps
+from PIL import Image, ImageChops, ImageFilter, ImageOps
 import pytesseract
 
+from metrics import REGISTRY as metrics
+
+try:
+    # Optional binding that keeps Tesseract and its language models loaded in-process
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class OCRPreprocessOptions:
@@ -19,6 +38,17 @@ class OCRPreprocessOptions:
     - threshold: Fixed binarization using threshold_value.
     - threshold_value: 0-255 cutoff for fixed threshold.
     - strong_threshold: Otsu-like auto threshold after enhancements.
+    - adaptive_threshold: Binarize against the local mean instead of one
+      global level (uneven backgrounds, dark-mode panels); replaces
+      threshold/strong_threshold when set.
+    - adaptive_window: Side of the local window in pixels (after upscaling).
+    - adaptive_offset: How far (0-255) a pixel must differ from its local
+      mean to count as text.
+    - auto: Measure the image first and skip requested steps it does not
+      need (see `auto_options`); the other fields are the most it may do.
+    - backend: how grayscale/contrast/threshold steps run - 'lut' (one fused
+      lookup-table pass) or 'chain' (one PIL pass per step). Both give
+      identical output.
     """
     upscale: float = 1.0
     denoise_median: bool = False
@@ -30,11 +60,154 @@ class OCRPreprocessOptions:
     threshold: bool = False
     threshold_value: int = 160
     strong_threshold: bool = False
+    adaptive_threshold: bool = False
+    adaptive_window: int = 31
+    adaptive_offset: int = 20
+    auto: bool = False
+    backend: str = 'lut'
+
+
+class OCRCancelled(Exception):
+    """Raised by a progress callback to abandon an OCR run between stages."""
+
+
+# progress(stage) is called before each pipeline stage; it may raise OCRCancelled
+ProgressCallback = Callable[[str], None]
+
+
+def _no_progress(stage: str) -> None:
+    pass
+
+
+# ----- recognition engines -----
+
+# 'auto' uses tesserocr when it is installed and finds language data, else
+# pytesseract, which runs the configured tesseract binary once per image;
+# 'tesserocr' and 'pytesseract' force one
+ENGINE = 'auto'
+
+_tesseract_versions: Dict[str, str] = {}
+_tesserocr_usable: Optional[bool] = None
+# Idle tesserocr APIs per language; an API serves one thread at a time
+_tesserocr_apis: Dict[str, List] = {}
+_tesserocr_lock = threading.Lock()
+
+
+class Word(NamedTuple):
+    text: str
+    left: int
+    top: int
+    width: int
+    height: int
+    block: int
+    line: Tuple[int, int]  # (paragraph, line) within the block
+
+
+def ocr_engine() -> str:
+    """The engine `ENGINE` resolves to: 'tesserocr' or 'pytesseract'."""
+    global _tesserocr_usable
+    if ENGINE == 'pytesseract':
+        return 'pytesseract'
+    if ENGINE == 'tesserocr':
+        return 'tesserocr'
+    if _tesserocr_usable is None:
+        try:
+            # Lists the tessdata directory without loading any model
+            _tesserocr_usable = tesserocr is not None and bool(tesserocr.get_languages()[1])
+        except Exception as e:
+            logger.warning(f"tesserocr unusable, falling back to pytesseract: {e}")
+            _tesserocr_usable = False
+    return 'tesserocr' if _tesserocr_usable else 'pytesseract'
+
+
+def tesseract_version() -> str:
+    """Version of the engine in use; for pytesseract probed once per command path."""
+    if ocr_engine() == 'tesserocr':
+        return 'tesserocr ' + tesserocr.tesseract_version().splitlines()[0]
+    cmd = pytesseract.pytesseract.tesseract_cmd
+    version = _tesseract_versions.get(cmd)
+    if version is None:
+        try:
+            version = str(pytesseract.get_tesseract_version())
+        except Exception:
+            version = 'unknown'
+        _tesseract_versions[cmd] = version
+    return version
+
+
+def _tesserocr_recognize(img: Image.Image, lang: str, timeout: float, read: Callable):
+    """Run `read(api)` on a recognized image with a pooled API for `lang`.
+
+    Creating an API loads the language models, which is most of what a
+    pytesseract call costs; afterwards they stay loaded for reuse.
+    """
+    with _tesserocr_lock:
+        idle = _tesserocr_apis.setdefault(lang, [])
+        api = idle.pop() if idle else None
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang=lang)
+    try:
+        api.SetImage(img)
+        # False when the timeout (ms, 0 = none) stopped recognition
+        if not api.Recognize(int(timeout * 1000)):
+            raise RuntimeError('Tesseract process timeout')
+        return read(api)
+    finally:
+        api.Clear()
+        with _tesserocr_lock:
+            _tesserocr_apis[lang].append(api)
+
+
+def _tesserocr_words(api) -> List[Word]:
+    words = []
+    block = par = line = 0
+    level = tesserocr.RIL.WORD
+    for it in tesserocr.iterate_level(api.GetIterator(), level):
+        if it.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+            block, par, line = block + 1, 0, 0
+        if it.IsAtBeginningOf(tesserocr.RIL.PARA):
+            par, line = par + 1, 0
+        if it.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+            line += 1
+        text = it.GetUTF8Text(level)
+        box = it.BoundingBox(level)
+        if text and box:
+            words.append(Word(text, box[0], box[1], box[2] - box[0], box[3] - box[1], block, (par, line)))
+    return words
+
+
+def recognize_text(img: Image.Image, lang: str = 'eng', timeout: float = 0) -> str:
+    """Tesseract text of an already preprocessed image."""
+    if ocr_engine() == 'tesserocr':
+        return _tesserocr_recognize(img, lang, timeout, lambda api: api.GetUTF8Text())
+    return pytesseract.image_to_string(img, lang=lang, timeout=timeout)
+
+
+def recognize_words(img: Image.Image, lang: str = 'eng', timeout: float = 0) -> List[Word]:
+    """Tesseract words with their boxes and layout position, in reading order."""
+    if ocr_engine() == 'tesserocr':
+        return _tesserocr_recognize(img, lang, timeout, _tesserocr_words)
+    data = pytesseract.image_to_data(img, lang=lang, timeout=timeout, output_type=pytesseract.Output.DICT)
+    return [Word(text, data['left'][i], data['top'][i], data['width'][i], data['height'][i],
+                 data['block_num'][i], (data['par_num'][i], data['line_num'][i]))
+            for i, text in enumerate(data['text']) if text.strip()]
+
+
+def image_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def options_key(opt: Optional[OCRPreprocessOptions]) -> str:
+    """Stable text form of the preprocessing options, for cache keys."""
+    return json.dumps(asdict(opt or OCRPreprocessOptions()), sort_keys=True)
 
 
 def _otsu_threshold(gray: Image.Image) -> int:
     """Compute an Otsu-like threshold level for a grayscale image."""
-    hist = gray.histogram()
+    return _otsu_level(gray.histogram())
+
+
+def _otsu_level(hist: List[int]) -> int:
     total = sum(hist)
     sumB = 0
     wB = 0
@@ -58,17 +231,320 @@ def _otsu_threshold(gray: Image.Image) -> int:
     return int(level)
 
 
-def preprocess_image(img: Image.Image, opt: Optional[OCRPreprocessOptions] = None) -> Image.Image:
+def _sharpen(img: Image.Image, opt: OCRPreprocessOptions) -> Image.Image:
+    try:
+        amt = max(0, min(300, int(opt.sharpen_percent)))
+        return img.filter(ImageFilter.UnsharpMask(radius=1.5, percent=amt, threshold=2))
+    except Exception:
+        return img
+
+
+def _adaptive_threshold(gray: Image.Image, opt: OCRPreprocessOptions) -> Image.Image:
+    """Binarize each pixel against the mean of the window around it.
+
+    Means come from box blurs, which keep running sums, so the cost is
+    O(pixels) whatever the window size. Text is the minority in a window,
+    so it sits on the side of the mean with the larger squared deviations:
+    brighter in dark-mode panels, darker elsewhere, even under shading that
+    pulls whole panels below mid-gray. Either way it is written out black
+    on white. Pixels within `adaptive_offset` of the mean (flat background)
+    become white.
+    """
+    blur = ImageFilter.BoxBlur(max(1, int(opt.adaptive_window) // 2))
+    mean = gray.filter(blur)
+    # ImageChops.subtract clips at 0, so each difference only sees one polarity
+    brighter = ImageChops.subtract(gray, mean)
+    darker = ImageChops.subtract(mean, gray)
+    square = [v * v // 255 for v in range(256)]
+    light_text = ImageChops.subtract(brighter.point(square).filter(blur), darker.point(square).filter(blur))
+    offset = int(opt.adaptive_offset)
+    paper = [255 if v <= offset else 0 for v in range(256)]
+    return Image.composite(brighter.point(paper), darker.point(paper),
+                           light_text.point([255 if v else 0 for v in range(256)]))
+
+
+# ----- lookup-table pipeline -----
+# Contrast stretch, equalization and both thresholds are 256-entry lookup
+# tables computed from the gray histogram. Composing them, and pushing the
+# histogram through each table instead of re-counting pixels, turns steps
+# 3-6 into one histogram and one table pass over the image (plus a second
+# round around sharpening, which is not a point operation).
+
+def _autocontrast_lut(hist: List[int]) -> List[int]:
+    """The table ImageOps.autocontrast (cutoff 0) applies to an 'L' image."""
+    used = [i for i, n in enumerate(hist) if n]
+    if not used or used[-1] <= used[0]:
+        return list(range(256))
+    lo, hi = used[0], used[-1]
+    scale = 255.0 / (hi - lo)
+    offset = -lo * scale
+    return [max(0, min(255, int(i * scale + offset))) for i in range(256)]
+
+
+def _equalize_lut(hist: List[int]) -> List[int]:
+    """The table ImageOps.equalize applies to an 'L' image."""
+    used = [n for n in hist if n]
+    if len(used) <= 1:
+        return list(range(256))
+    step = (sum(used) - used[-1]) // 255
+    if not step:
+        return list(range(256))
+    lut = []
+    n = step // 2
+    for count in hist:
+        lut.append(min(255, n // step))
+        n += count
+    return lut
+
+
+def _threshold_lut(level: int) -> List[int]:
+    return [255 if i > level else 0 for i in range(256)]
+
+
+class _LutChain:
+    """Composes lookup tables while tracking the histogram of the result.
+
+    The source histogram is only counted if a table actually needs it.
+    """
+
+    def __init__(self, source: Image.Image):
+        self._source = source
+        self._hist: Optional[List[int]] = None
+        self.lut: Optional[List[int]] = None
+
+    @property
+    def hist(self) -> List[int]:
+        if self._hist is None:
+            self._hist = self._source.histogram()
+            if self.lut is not None:
+                self._hist = self._remap(self._hist, self.lut)
+        return self._hist
+
+    @staticmethod
+    def _remap(hist: List[int], table: List[int]) -> List[int]:
+        remapped = [0] * 256
+        for value, count in zip(table, hist):
+            remapped[value] += count
+        return remapped
+
+    def push(self, table: List[int]) -> None:
+        self.lut = table if self.lut is None else [table[v] for v in self.lut]
+        if self._hist is not None:
+            self._hist = self._remap(self._hist, table)
+
+    def take(self) -> Optional[List[int]]:
+        lut, self.lut = self.lut, None
+        return lut
+
+
+def _lut_pipeline(gray: Image.Image, opt: OCRPreprocessOptions,
+                  sharpen: Callable[[Image.Image], Image.Image]) -> Image.Image:
+    """Steps 4-6 over a grayscale image, at most one table pass per side of sharpening."""
+    chain = _LutChain(gray)
+    if opt.auto_contrast:
+        chain.push(_autocontrast_lut(chain.hist))
+    if opt.equalize:
+        chain.push(_equalize_lut(chain.hist))
+    if opt.sharpen:
+        lut = chain.take()
+        if lut is not None:
+            gray = gray.point(lut)
+        gray = sharpen(gray)
+        chain = _LutChain(gray)
+    if opt.threshold:
+        chain.push(_threshold_lut(int(opt.threshold_value)))
+    if opt.strong_threshold:
+        chain.push(_threshold_lut(_otsu_level(chain.hist)))
+    lut = chain.take()
+    return gray if lut is None else gray.point(lut)
+
+
+def _can_fuse(opt: OCRPreprocessOptions, img: Image.Image) -> bool:
+    """True when steps 3-6 can be fused with output identical to the chain."""
+    if opt.backend != 'lut':
+        return False
+    if not (opt.grayscale or opt.auto_contrast or opt.equalize or opt.threshold or opt.strong_threshold
+            or opt.adaptive_threshold):
+        return False
+    # Colour contrast/sharpening work per channel in the chain; only gray input is equivalent
+    return opt.grayscale or img.mode == 'L' or not (opt.auto_contrast or opt.equalize or opt.sharpen)
+
+
+# ----- automatic step selection -----
+
+# Analysis runs on a copy narrowed to at most this width
+AUTO_ANALYSIS_WIDTH = 2048
+# Line height (px, baseline to baseline) below which upscaling pays off;
+# crisp screen text at 100% scaling measures 16-20 px and Tesseract reads
+# it as is
+AUTO_MIN_LINE_PX = 14
+# 1st-99th percentile spread, around text edges, at which the image is
+# already stretched
+AUTO_FULL_CONTRAST = 200
+# Median deviation from the local mean (gray levels) above which the image
+# is treated as noisy: denoise if allowed, never sharpen
+AUTO_NOISE_LEVEL = 4
+_NOISE_CROP = 512
+# Edge response that marks a text pixel, and share of a strip row that
+# must be edges to count as part of a text line
+_EDGE_LEVEL = 64
+_TEXT_ROW_DENSITY = 16  # of 255
+_STRIP_WIDTH = 128
+# Typical line height over the height of the edge run of one line
+_PITCH_PER_RUN = 1.5
+
+
+class ImageStats(NamedTuple):
+    line_height: Optional[int]    # median text line height in px, None if no text found
+    contrast: int                 # 1st-99th percentile gray spread around edges
+    noise: int                    # median deviation from the local mean
+
+
+def _percentile(hist: List[int], fraction: float) -> int:
+    target = sum(hist) * fraction
+    seen = 0
+    for value, count in enumerate(hist):
+        seen += count
+        if seen > target:
+            return value
+    return 255
+
+
+def _text_rows(flags: List[bool]) -> Tuple[List[int], List[int]]:
+    """(run heights, line pitches) of the text-row runs in one strip's profile."""
+    runs, pitches = [], []
+    start = last_start = None
+    n = len(flags)
+    for y in range(n + 1):
+        if y < n and flags[y]:
+            if start is None:
+                start = y
+            continue
+        # Close one-row gaps, e.g. between capitals and a lighter x-height band
+        if start is None or (y + 1 < n and flags[y + 1]):
+            continue
+        run = y - start
+        # A run spanning the whole strip is texture or a picture, not a line
+        if 2 <= run < n:
+            runs.append(run)
+            if last_start is not None and start - last_start <= 3 * run:
+                pitches.append(start - last_start)
+            last_start = start
+        else:
+            last_start = None
+        start = None
+    return runs, pitches
+
+
+def _median(values: List[int]) -> int:
+    return sorted(values)[len(values) // 2]
+
+
+def analyze_image(img: Image.Image) -> ImageStats:
+    """Cheap line height, contrast and noise estimates.
+
+    Line height is the median distance between the tops of consecutive
+    runs of rows that carry edges, counted in narrow vertical strips of a
+    narrowed copy so lines of side-by-side panels do not merge; with a
+    single line it is estimated from the run itself. Contrast is the gray
+    spread of the pixels next to edges, where text and its background are
+    both present whatever share of the image the text covers. Noise is
+    measured at full resolution on a central crop, where reduction would
+    average it away.
+    """
+    w, h = img.size
+    cx, cy, half = w // 2, h // 2, _NOISE_CROP // 2
+    crop = img.crop((max(0, cx - half), max(0, cy - half), min(w, cx + half), min(h, cy + half))).convert('L')
+    # Flat areas dominate the median difference from a 3x3 mean: 0 on clean
+    # screenshots, tracking the noise on photos and heavy JPEG
+    noise = _percentile(ImageChops.difference(crop, crop.filter(ImageFilter.BoxBlur(1))).histogram(), 0.5)
+
+    # Only the width is reduced: line heights are measured down the columns
+    factor = max(1, math.ceil(w / AUTO_ANALYSIS_WIDTH))
+    small = img.convert('L')
+    if factor > 1:
+        small = small.reduce((factor, 1))
+    gray = small
+    if noise > AUTO_NOISE_LEVEL:
+        small = small.filter(ImageFilter.BoxBlur(1))
+    edges = small.filter(ImageFilter.FIND_EDGES).point([255 if v > _EDGE_LEVEL else 0 for v in range(256)])
+    # Over the whole image a few lines of text fall inside the 1% tails.
+    # Filters copy the outermost pixels unchanged, so the frame is left out.
+    near_text = Image.new('L', edges.size, 0)
+    near_text.paste(edges.crop((1, 1, edges.width - 1, edges.height - 1)), (1, 1))
+    hist = gray.histogram(mask=near_text.filter(ImageFilter.MaxFilter(3)))
+    if not any(hist):
+        hist = gray.histogram()
+    contrast = _percentile(hist, 0.99) - _percentile(hist, 0.01)
+
+    # Edge density per row of each strip, one C pass
+    strips = max(1, small.width // _STRIP_WIDTH)
+    density = edges.resize((strips, small.height), Image.BOX).load()
+    runs, pitches = [], []
+    for x in range(strips):
+        strip_runs, strip_pitches = _text_rows([density[x, y] > _TEXT_ROW_DENSITY for y in range(small.height)])
+        runs += strip_runs
+        pitches += strip_pitches
+    if pitches:
+        line_height = _median(pitches)
+    elif runs:
+        line_height = round(_median(runs) * _PITCH_PER_RUN)
+    else:
+        line_height = None
+    return ImageStats(line_height, contrast, noise)
+
+
+def auto_options(img: Image.Image, opt: OCRPreprocessOptions) -> OCRPreprocessOptions:
+    """Resolve an `auto` option set for this image; other sets pass through.
+
+    Upscaling is kept only for small text, contrast stretching only for
+    washed-out images, sharpening only for upscaled or washed-out images
+    that are not noisy, and the median filter only for noisy ones.
+    Thresholds and grayscale are cheap and kept as requested.
+    """
+    if not opt.auto:
+        return opt
+    with metrics.timer('ocr.analyze'):
+        stats = analyze_image(img)
+    small_text = stats.line_height is not None and stats.line_height < AUTO_MIN_LINE_PX
+    noisy = stats.noise > AUTO_NOISE_LEVEL
+    upscale = opt.upscale if small_text else 1.0
+    flat = stats.contrast < AUTO_FULL_CONTRAST
+    chosen = replace(
+        opt, auto=False, upscale=upscale,
+        denoise_median=opt.denoise_median and noisy,
+        auto_contrast=opt.auto_contrast and flat,
+        equalize=opt.equalize and flat,
+        sharpen=opt.sharpen and (upscale > 1.0 or flat) and not noisy,
+    )
+    if upscale <= 1.0 and (opt.upscale or 1.0) > 1.0:
+        metrics.counter('ocr.auto.upscale_skipped').inc()
+    steps = [name for name, on in (('upscale', upscale > 1.0), ('denoise', chosen.denoise_median),
+                                   ('contrast', chosen.auto_contrast or chosen.equalize),
+                                   ('sharpen', chosen.sharpen)) if on]
+    lines = f'{stats.line_height}px' if stats.line_height is not None else 'none found'
+    logger.info(f"OCR auto preprocessing for {img.width}x{img.height}: text lines {lines}, "
+                f"contrast {stats.contrast}, noise {stats.noise:.0f} -> {', '.join(steps) or 'no optional steps'}")
+    return chosen
+
+
+def preprocess_image(img: Image.Image, opt: Optional[OCRPreprocessOptions] = None,
+                     progress: Optional[ProgressCallback] = None) -> Image.Image:
     """Apply a robust chain of offline preprocessing operations to improve OCR.
 
     The pipeline is conservative by default and configurable via `opt`.
+    `progress`, if given, is called with each stage name before it runs.
     """
     if opt is None:
         opt = OCRPreprocessOptions()
+    if progress is None:
+        progress = _no_progress
+    opt = auto_options(img, opt)
 
     out = img
 
     # 1) Upscale early to help small or slightly blurred text
+    progress('upscale')
     try:
         if opt.upscale and opt.upscale > 1.0:
             w, h = out.size
@@ -78,16 +554,35 @@ def preprocess_image(img: Image.Image, opt: Optional[OCRPreprocessOptions] = Non
 
     # 2) Denoise before sharpening/thresholding
     if opt.denoise_median:
+        progress('denoise')
         try:
             out = out.filter(ImageFilter.MedianFilter(size=3))
         except Exception:
             pass
 
+    # 3-6) Fused into lookup-table passes where the result is identical
+    if _can_fuse(opt, out):
+        if opt.auto_contrast or opt.equalize:
+            progress('contrast')
+
+        def sharpen(img):
+            progress('sharpen')
+            return _sharpen(img, opt)
+        fused = replace(opt, threshold=False, strong_threshold=False) if opt.adaptive_threshold else opt
+        gray = out if out.mode == 'L' else out.convert('L')
+        out = _lut_pipeline(gray, fused, sharpen)
+        if opt.adaptive_threshold:
+            progress('threshold')
+            out = _adaptive_threshold(out, opt)
+        return out
+
     # 3) Convert to grayscale if requested or if later steps need it
     if opt.grayscale:
         out = out.convert('L')
 
     # 4) Global/adaptive contrast improvements
+    if opt.auto_contrast or opt.equalize:
+        progress('contrast')
     if opt.auto_contrast:
         try:
             out = ImageOps.autocontrast(out)
@@ -101,13 +596,14 @@ def preprocess_image(img: Image.Image, opt: Optional[OCRPreprocessOptions] = Non
 
     # 5) Sharpen edges using unsharp mask (good after denoise/contrast)
     if opt.sharpen:
-        try:
-            amt = max(0, min(300, int(opt.sharpen_percent)))
-            out = out.filter(ImageFilter.UnsharpMask(radius=1.5, percent=amt, threshold=2))
-        except Exception:
-            pass
+        progress('sharpen')
+        out = _sharpen(out, opt)
 
-    # 6) Thresholding (fixed or strong/Otsu-like)
+    # 6) Thresholding (adaptive, or fixed and/or strong/Otsu-like)
+    if opt.threshold or opt.strong_threshold or opt.adaptive_threshold:
+        progress('threshold')
+    if opt.adaptive_threshold:
+        return _adaptive_threshold(out.convert('L'), opt)
     if opt.threshold:
         gray = out.convert('L')
         thr = int(opt.threshold_value)
@@ -124,12 +620,175 @@ def preprocess_image(img: Image.Image, opt: Optional[OCRPreprocessOptions] = Non
     return out
 
 
-def ocr_image(img: Image.Image, lang: str = 'eng', opt: Optional[OCRPreprocessOptions] = None) -> str:
+def ocr_image(img: Image.Image, lang: str = 'eng', opt: Optional[OCRPreprocessOptions] = None,
+              progress: Optional[ProgressCallback] = None, timeout: float = 0,
+              workers: Optional[int] = None) -> str:
     """Run offline OCR using Tesseract with optional preprocessing.
 
     - Ensure Tesseract is locally installed.
     - The caller may set `pytesseract.pytesseract.tesseract_cmd` externally if needed.
     - `lang` supports combinations (e.g., 'eng+hin') if language data is installed locally.
+    - `progress` is called before each stage ('upscale' ... 'recognize') and may
+      raise OCRCancelled; the Tesseract run itself is bounded only by `timeout`
+      seconds (0 = no limit).
+    - Images over TILE_MIN_PIXELS (after upscaling) are recognized in tiles
+      on up to `workers` threads (default: CPU count); see `_ocr_tiled`.
+    """
+    if opt is None:
+        opt = OCRPreprocessOptions()
+    if progress is None:
+        progress = _no_progress
+    with metrics.timer('ocr.image'):
+        # Resolved once here so every tile of a large image gets the same steps
+        opt = auto_options(img, opt)
+        scale = max(1.0, opt.upscale or 1.0)
+        if img.width * img.height * scale * scale > TILE_MIN_PIXELS:
+            return _ocr_tiled(img, lang, opt, progress, timeout, workers)
+        with metrics.timer('ocr.preprocess'):
+            pre = preprocess_image(img, opt, progress)
+        progress('recognize')
+        return recognize_text(pre, lang=lang, timeout=timeout)
+
+
+# ----- tiled OCR -----
+
+# Images with more pixels than this (after upscaling) are split into tiles
+TILE_MIN_PIXELS = 3840 * 2160
+# Largest tile core in source pixels; even splits of common multi-monitor
+# widths land on the monitor edges
+TILE_SIZE = (1920, 1080)
+# Margin each tile shares with its neighbours: a word on a seam is whole in
+# the tile that owns its centre, and dropped from the others
+TILE_OVERLAP = 64
+
+Box = Tuple[int, int, int, int]
+
+
+def _tile_boxes(width: int, height: int) -> List[Tuple[Box, Box]]:
+    """(crop box, core box) pairs in reading order: columns left to right, each top to bottom."""
+    cols, rows = math.ceil(width / TILE_SIZE[0]), math.ceil(height / TILE_SIZE[1])
+    xs = [width * i // cols for i in range(cols + 1)]
+    ys = [height * i // rows for i in range(rows + 1)]
+    boxes = []
+    for c in range(cols):
+        for r in range(rows):
+            core = (xs[c], ys[r], xs[c + 1], ys[r + 1])
+            crop = (max(0, core[0] - TILE_OVERLAP), max(0, core[1] - TILE_OVERLAP),
+                    min(width, core[2] + TILE_OVERLAP), min(height, core[3] + TILE_OVERLAP))
+            boxes.append((crop, core))
+    return boxes
+
+
+def _ocr_tile(img: Image.Image, crop: Box, core: Box, lang: str, opt: OCRPreprocessOptions,
+              timeout: float) -> str:
+    """Text of the words whose centre lies in `core`, one line per Tesseract line."""
+    tile = img.crop(crop)
+    with metrics.timer('ocr.preprocess'):
+        pre = preprocess_image(tile, opt)
+    scale = pre.width / tile.width
+    blocks: Dict[int, Dict[Tuple[int, int], List[str]]] = {}
+    for word in recognize_words(pre, lang=lang, timeout=timeout):
+        cx = crop[0] + (word.left + word.width / 2) / scale
+        cy = crop[1] + (word.top + word.height / 2) / scale
+        if core[0] <= cx < core[2] and core[1] <= cy < core[3]:
+            blocks.setdefault(word.block, {}).setdefault(word.line, []).append(word.text)
+    return '\n\n'.join('\n'.join(' '.join(words) for words in lines.values()) for lines in blocks.values())
+
+
+def _ocr_tiled(img: Image.Image, lang: str, opt: OCRPreprocessOptions, progress: ProgressCallback,
+               timeout: float, workers: Optional[int]) -> str:
+    """OCR a large image as overlapping tiles on a thread pool.
+
+    Tesseract runs as a subprocess, or inside tesserocr with the GIL
+    released, so threads scale with the cores; each
+    tile is cropped, upscaled and preprocessed by its own worker, and at
+    most `workers` tiles are in flight, so the full upscaled image never
+    exists. Text comes back column by column, top to bottom - the reading
+    order of side-by-side monitors. Per-tile contrast and thresholds adapt
+    to each region.
+    """
+    img.load()
+    boxes = _tile_boxes(img.width, img.height)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(boxes)))
+    texts = []
+    pending = deque()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ocr-tile')
+    try:
+        progress(f'recognize 0/{len(boxes)} tiles')
+        for crop, core in boxes:
+            if len(pending) >= workers:
+                texts.append(pending.popleft().result())
+                progress(f'recognize {len(texts)}/{len(boxes)} tiles')
+            pending.append(pool.submit(_ocr_tile, img, crop, core, lang, opt, timeout))
+        while pending:
+            texts.append(pending.popleft().result())
+            progress(f'recognize {len(texts)}/{len(boxes)} tiles')
+    finally:
+        # On cancel or error, running tiles finish in the background unwaited
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
+    return '\n\n'.join(t for t in texts if t)
+
+
+# ----- batch OCR -----
+
+class OCRResult(NamedTuple):
+    index: int                # position in the input sequence
+    text: Optional[str]       # None when recognition failed
+    error: Optional[str] = None
+
+
+def _init_ocr_worker(tesseract_cmd: str, engine: str) -> None:
+    # Pool processes do not inherit settings made at runtime, and one
+    # single-threaded Tesseract per process beats N processes of N threads
+    global ENGINE
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    ENGINE = engine
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _ocr_worker(image: Union[bytes, Image.Image], lang: str, opt: Optional[OCRPreprocessOptions],
+                timeout: float) -> str:
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+    # Each pool process already has a core to itself; large images tile serially
+    return ocr_image(image, lang=lang, opt=opt, timeout=timeout, workers=1)
+
+
+def ocr_images(images: Iterable[Union[bytes, Image.Image]], lang: str = 'eng',
+               opt: Optional[OCRPreprocessOptions] = None, workers: Optional[int] = None,
+               timeout: float = 120, max_pending: Optional[int] = None) -> Iterator[OCRResult]:
+    """OCR many images across a process pool, yielding results in input order.
+
+    `images` may be encoded image bytes (cheapest to ship to workers) or PIL
+    images, and is consumed lazily: at most `max_pending` (default twice
+    `workers`) images are in flight, so a long generator is never read far
+    ahead of the results. Each Tesseract run (one per tile of a large image)
+    is killed after `timeout` seconds and reported as an error; there is no
+    outer limit, as a task already running in the pool cannot be cancelled.
+    Failures are reported in `OCRResult.error` and do not stop the batch.
     """
-    pre = preprocess_image(img, opt)
-    return pytesseract.image_to_string(pre, lang=lang)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max(1, max_pending or 2 * workers)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker,
+                             initargs=(pytesseract.pytesseract.tesseract_cmd, ENGINE)) as pool:
+        def collect() -> OCRResult:
+            index, future = pending.popleft()
+            try:
+                return OCRResult(index, future.result())
+            except Exception as e:
+                return OCRResult(index, None, str(e) or type(e).__name__)
+
+        try:
+            for index, image in enumerate(images):
+                if len(pending) >= max_pending:
+                    yield collect()
+                pending.append((index, pool.submit(_ocr_worker, image, lang, opt, timeout)))
+            while pending:
+                yield collect()
+        finally:
+            # Consumer stopped early: drop work that has not started
+            for _, future in pending:
+                future.cancel()
@@ -0,0 +1,198 @@
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QCursor
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QApplication
+)
+
+from fuzzy_match import FuzzyIndex, FuzzyMatch
+from highlight_delegate import HighlightDelegate, HIGHLIGHT_ROLE
+from metrics import REGISTRY as metrics
+
+LOGGER = logging.getLogger(__name__)
+
+# Windows RegisterHotKey modifier flags
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+
+DEFAULT_HOTKEY = 'Ctrl+Shift+Space'
+
+_MODIFIERS = {'ctrl': MOD_CONTROL, 'control': MOD_CONTROL, 'alt': MOD_ALT,
+              'shift': MOD_SHIFT, 'win': MOD_WIN, 'meta': MOD_WIN}
+_NAMED_KEYS = {'space': 0x20, 'insert': 0x2D, 'ins': 0x2D, 'home': 0x24,
+               'end': 0x23, 'pause': 0x13, 'tab': 0x09, 'enter': 0x0D}
+
+
+def parse_hotkey(text: str) -> Optional[Tuple[int, int]]:
+    """Parse 'Ctrl+Shift+Space' style text into (modifiers, virtual key code).
+
+    Returns None if the text is not a valid hotkey.
+    """
+    parts = [p.strip().lower() for p in (text or '').split('+') if p.strip()]
+    if not parts:
+        return None
+    modifiers = 0
+    for part in parts[:-1]:
+        if part not in _MODIFIERS:
+            return None
+        modifiers |= _MODIFIERS[part]
+    key = parts[-1]
+    if len(key) == 1 and key.isalnum():
+        vk = ord(key.upper())
+    elif key in _NAMED_KEYS:
+        vk = _NAMED_KEYS[key]
+    elif key.startswith('f') and key[1:].isdigit() and 1 <= int(key[1:]) <= 24:
+        vk = 0x70 + int(key[1:]) - 1
+    else:
+        return None
+    return modifiers, vk
+
+
+def snippet_search_text(snippet: Dict[str, Any]) -> str:
+    """Text indexed for fuzzy snippet search: title, then category in parentheses."""
+    category = snippet.get('category') or ''
+    return f"{snippet['title']}  ({category})" if category else snippet['title']
+
+
+class QuickPasteIndex:
+    """Pre-warmed in-memory fuzzy index over recent clips and snippets.
+
+    Clip previews and snippet titles/categories are kept in `FuzzyIndex`
+    instances, so filtering on each keystroke never touches the database.
+    """
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self._clips = FuzzyIndex()
+        self._snippets = FuzzyIndex()
+        self._clip_types: Dict[int, str] = {}
+
+    @staticmethod
+    def _clip_prefix(content_type: str) -> str:
+        return f"[{(content_type or '').capitalize()}] "
+
+    def set_clips(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Replace clip entries from items ordered newest first."""
+        items = list(items)[:self.capacity]
+        self._clip_types = {i['id']: i.get('content_type') for i in items}
+        self._clips.set((i['id'], (i.get('preview') or '').replace('\n', ' ')) for i in items)
+
+    def add_clip(self, item: Dict[str, Any]) -> None:
+        self._clip_types[item['id']] = item.get('content_type')
+        self._clips.add(item['id'], (item.get('preview') or '').replace('\n', ' '), front=True)
+        self._clips.truncate(self.capacity)
+
+    def remove_clip(self, item_id: int) -> None:
+        self._clip_types.pop(item_id, None)
+        self._clips.remove(item_id)
+
+    def set_snippets(self, snippets: Iterable[Dict[str, Any]]) -> None:
+        self._snippets.set((s['id'], snippet_search_text(s)) for s in snippets)
+
+    def _clip_entry(self, match: FuzzyMatch) -> Dict[str, Any]:
+        prefix = self._clip_prefix(self._clip_types.get(match.key))
+        return {'kind': 'clip', 'id': match.key, 'label': prefix + match.text, 'score': match.score,
+                'positions': tuple(p + len(prefix) for p in match.positions)}
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Fuzzy-filter entries; ties rank recent clips above snippets."""
+        if not (query or '').strip():
+            clips = [FuzzyMatch(key, 0, (), text) for key, text in self._clips.items(limit)]
+            snippets = [FuzzyMatch(key, 0, (), text) for key, text in self._snippets.items(limit)]
+        else:
+            clips = self._clips.search(query, limit=limit)
+            snippets = self._snippets.search(query, limit=limit)
+        entries = [self._clip_entry(m) for m in clips]
+        entries += [{'kind': 'snippet', 'id': m.key, 'label': m.text, 'score': m.score,
+                     'positions': m.positions} for m in snippets]
+        # sort() is stable, so clips stay ahead of equally scored snippets
+        entries.sort(key=lambda e: -e['score'])
+        return entries[:limit]
+
+
+class QuickPastePopup(QDialog):
+    """Lightweight always-ready popup that filters the quick-paste index as the user types."""
+
+    def __init__(self, index: QuickPasteIndex, on_chosen: Callable[[str, int], None], parent=None):
+        super().__init__(parent)
+        self.index = index
+        self._on_chosen = on_chosen
+        self.setWindowTitle('Quick Paste')
+        self.setWindowFlags(Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.resize(520, 360)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText('Type to filter clips and snippets...')
+        self.query_edit.textChanged.connect(self.refresh_results)
+        self.query_edit.installEventFilter(self)
+        layout.addWidget(self.query_edit)
+
+        self.results_list = QListWidget()
+        self.results_list.setItemDelegate(HighlightDelegate(self.results_list))
+        self.results_list.itemActivated.connect(self._choose_item)
+        layout.addWidget(self.results_list)
+
+    def open_at_cursor(self):
+        """Show the popup near the mouse cursor with a fresh query."""
+        with metrics.timer('quick_paste.open'):
+            self.query_edit.blockSignals(True)
+            self.query_edit.clear()
+            self.query_edit.blockSignals(False)
+            self.refresh_results()
+            pos = QCursor.pos()
+            screen = QApplication.screenAt(pos) or QApplication.primaryScreen()
+            geo = screen.availableGeometry()
+            x = min(max(geo.left(), pos.x()), geo.right() - self.width())
+            y = min(max(geo.top(), pos.y()), geo.bottom() - self.height())
+            self.move(x, y)
+            self.show()
+            self.raise_()
+            self.activateWindow()
+            self.query_edit.setFocus()
+
+    def refresh_results(self, *_):
+        self.results_list.clear()
+        for entry in self.index.search(self.query_edit.text()):
+            item = QListWidgetItem(entry['label'])
+            item.setData(Qt.UserRole, (entry['kind'], entry['id']))
+            item.setData(HIGHLIGHT_ROLE, entry['positions'])
+            self.results_list.addItem(item)
+        if self.results_list.count() > 0:
+            self.results_list.setCurrentRow(0)
+
+    def eventFilter(self, obj, event):
+        # Arrow keys / Enter / Escape are handled while focus stays in the query box
+        if obj is self.query_edit and event.type() == event.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                row = self.results_list.currentRow() + (1 if key == Qt.Key_Down else -1)
+                if 0 <= row < self.results_list.count():
+                    self.results_list.setCurrentRow(row)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self._choose_item(self.results_list.currentItem())
+                return True
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _choose_item(self, item):
+        if item is None:
+            return
+        kind, item_id = item.data(Qt.UserRole)
+        self.hide()
+        self._on_chosen(kind, item_id)
+
+    def changeEvent(self, event):
+        # Dismiss when the user clicks elsewhere
+        if event.type() == event.ActivationChange and not self.isActiveWindow():
+            self.hide()
+        super().changeEvent(event)
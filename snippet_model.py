@@ -0,0 +1,143 @@
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+
+from highlight_delegate import HIGHLIGHT_ROLE
+
+CATEGORY_ROLE = Qt.UserRole + 2
+
+
+class SnippetListModel(QAbstractListModel):
+    """Snippet titles ordered by title, updated row by row.
+
+    Rows are kept sorted by (title, id); `upsert`, `remove` and the category
+    helpers emit fine-grained insert/remove/change signals so attached views
+    keep their selection and scroll position.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Dict[str, Any]] = []
+        self._keys: List[Tuple[str, int]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row['title']
+        if role == Qt.UserRole:
+            return row['id']
+        if role == CATEGORY_ROLE:
+            return row['category']
+        return None
+
+    def snippets(self) -> List[Dict[str, Any]]:
+        return list(self._rows)
+
+    def set_snippets(self, snippets: Iterable[Dict[str, Any]]) -> None:
+        rows = sorted((self._row(s) for s in snippets), key=self._key)
+        self.beginResetModel()
+        self._rows = rows
+        self._keys = [self._key(r) for r in rows]
+        self.endResetModel()
+
+    def upsert(self, snippet: Dict[str, Any]) -> None:
+        """Insert a snippet, or update it in place (moving it if its title changed)."""
+        row = self._row(snippet)
+        pos = self.row_of(row['id'])
+        if pos is not None:
+            if self._keys[pos] == self._key(row):
+                self._rows[pos] = row
+                index = self.index(pos)
+                self.dataChanged.emit(index, index)
+                return
+            self._remove_at(pos)
+        key = self._key(row)
+        pos = bisect.bisect_left(self._keys, key)
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._rows.insert(pos, row)
+        self._keys.insert(pos, key)
+        self.endInsertRows()
+
+    def remove(self, snippet_id: int) -> None:
+        pos = self.row_of(snippet_id)
+        if pos is not None:
+            self._remove_at(pos)
+
+    def rename_category(self, old: str, new: str) -> None:
+        """Move every row of category `old` to `new` ('' clears it)."""
+        for pos, row in enumerate(self._rows):
+            if row['category'] == old:
+                row['category'] = new
+                index = self.index(pos)
+                self.dataChanged.emit(index, index, [CATEGORY_ROLE])
+
+    def row_of(self, snippet_id: int) -> Optional[int]:
+        for pos, row in enumerate(self._rows):
+            if row['id'] == snippet_id:
+                return pos
+        return None
+
+    def _remove_at(self, pos: int) -> None:
+        self.beginRemoveRows(QModelIndex(), pos, pos)
+        del self._rows[pos]
+        del self._keys[pos]
+        self.endRemoveRows()
+
+    @staticmethod
+    def _row(snippet: Dict[str, Any]) -> Dict[str, Any]:
+        return {'id': snippet['id'], 'title': snippet['title'], 'category': snippet.get('category') or ''}
+
+    @staticmethod
+    def _key(row: Dict[str, Any]) -> Tuple[str, int]:
+        return row['title'], row['id']
+
+
+class SnippetFilterProxy(QSortFilterProxyModel):
+    """Filters a `SnippetListModel` by category and ranks it by search results.
+
+    With no ranking the source (title) order is kept; with a ranking only the
+    ranked snippets are shown, best first, and their matched title positions
+    are exposed under HIGHLIGHT_ROLE.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._category: Optional[str] = None
+        self._ranking: Optional[Dict[int, Tuple[int, Tuple[int, ...]]]] = None
+        self.setDynamicSortFilter(True)
+        self.sort(0)
+
+    def set_category(self, category: Optional[str]) -> None:
+        """Show only `category` (None shows all)."""
+        if category != self._category:
+            self._category = category
+            self.invalidateFilter()
+
+    def set_ranking(self, ranking: Optional[Dict[int, Tuple[int, Tuple[int, ...]]]]) -> None:
+        """Set snippet id -> (rank, highlight positions), or None to show everything."""
+        self._ranking = ranking
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self._category is not None and index.data(CATEGORY_ROLE) != self._category:
+            return False
+        return self._ranking is None or index.data(Qt.UserRole) in self._ranking
+
+    def lessThan(self, left, right):
+        if self._ranking is not None:
+            return self._ranking[left.data(Qt.UserRole)][0] < self._ranking[right.data(Qt.UserRole)][0]
+        return left.row() < right.row()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == HIGHLIGHT_ROLE:
+            if self._ranking is None:
+                return None
+            return self._ranking.get(super().data(index, Qt.UserRole), (0, None))[1]
+        return super().data(index, role)
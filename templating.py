@@ -0,0 +1,108 @@
+import re
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+# %name% placeholders, the same syntax as the World Clock %wc_*% parameters.
+# The closing % is only looked ahead at: it may also open the next placeholder
+# when this one turns out to have no value (e.g. %E9%name% in a URL).
+_PLACEHOLDER = re.compile(r'%([A-Za-z_][A-Za-z0-9_.:-]*)(?=%)')
+
+
+class CompiledTemplate:
+    """A template parsed once into candidate placeholder spans.
+
+    Rendering fills the placeholders that have values and copies the text
+    between them in a single pass. Placeholders with no value are kept
+    verbatim, so unknown %names% and stray percent signs pass through
+    untouched, and their closing % can still start the next placeholder.
+    """
+
+    __slots__ = ('source', '_slots')
+
+    def __init__(self, source: str):
+        self.source = source
+        # (start, end, name); spans may share a % with the next one
+        self._slots: Tuple[Tuple[int, int, str], ...] = tuple(
+            (m.start(), m.end() + 1, m.group(1)) for m in _PLACEHOLDER.finditer(source))
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(name for _, _, name in self._slots)
+
+    def render(self, variables: Mapping[str, Any]) -> str:
+        """Substitute placeholders from `variables`.
+
+        Values may be callables; they are only called if the template uses
+        them (e.g. reading the clipboard).
+        """
+        if not self._slots:
+            return self.source
+        out = []
+        pos = 0
+        for start, end, name in self._slots:
+            if start < pos:
+                continue  # Its opening % closed the placeholder just filled
+            value = variables.get(name)
+            if value is None:
+                continue
+            if callable(value):
+                value = value()
+                if value is None:
+                    continue
+            out.append(self.source[pos:start])
+            out.append(str(value))
+            pos = end
+        out.append(self.source[pos:])
+        return ''.join(out)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile an ad-hoc template string (memoized by content)."""
+    return CompiledTemplate(source or '')
+
+
+def render_template(source: str, variables: Mapping[str, Any]) -> str:
+    return compile_template(source or '').render(variables)
+
+
+class TemplateCache:
+    """LRU cache of compiled templates keyed by e.g. (snippet id, updated_at)."""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Hashable, CompiledTemplate]" = OrderedDict()
+
+    def get(self, key: Hashable, source: str) -> CompiledTemplate:
+        compiled = self._cache.get(key)
+        if compiled is None:
+            compiled = CompiledTemplate(source or '')
+            self._cache[key] = compiled
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return compiled
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def builtin_variables(now: Optional[datetime] = None,
+                      clipboard: Optional[Callable[[], str]] = None) -> Dict[str, Any]:
+    """Date/time placeholders plus a lazily read %clipboard%."""
+    now = now or datetime.now()
+    variables: Dict[str, Any] = {
+        'date': now.strftime('%Y-%m-%d'),
+        'time': now.strftime('%H:%M'),
+        'datetime': now.strftime('%Y-%m-%d %H:%M'),
+        'year': str(now.year),
+        'month': str(now.month).zfill(2),
+        'day': str(now.day).zfill(2),
+        'weekday': now.strftime('%A'),
+    }
+    if clipboard is not None:
+        variables['clipboard'] = clipboard
+    return variables
@@ -0,0 +1,84 @@
+import pytest
+
+import bulk_io
+from database import Database
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _cancel(count):
+    raise _Cancelled()
+
+
+def _snippet_rows(db):
+    return [(s['title'], s['content'], s['category'], s['expansion_trigger'], s['created_at'])
+            for s in db.iter_snippets()]
+
+
+def _clipboard_rows(db):
+    return [(i['content_type'], i['content_data'], i['content_text'], i['preview'], i['created_at'], i['formats'])
+            for i in db.iter_clipboard_items()]
+
+
+def _triggers(db):
+    with db._get_connection() as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+@pytest.mark.parametrize('ext', ['jsonl', 'csv'])
+def test_snippets_round_trip(tmp_path, ext):
+    source = Database(str(tmp_path / 'a.db'))
+    source.add_snippet('Sig', 'Regards,\nAnn "A" Smith', 'Mail', ';sig')
+    source.add_snippet('Plain', 'comma, separated', '')
+    path = str(tmp_path / f'snippets.{ext}')
+    assert bulk_io.export_snippets(source, path) == 2
+
+    target = Database(str(tmp_path / 'b.db'))
+    assert bulk_io.import_snippets(target, path) == 2
+    assert _snippet_rows(target) == _snippet_rows(source)
+    assert target.get_category_counts() == {'Mail': 1}
+    assert [s['title'] for s in target.search_snippets('separated')] == ['Plain']
+
+
+@pytest.mark.parametrize('ext', ['jsonl', 'csv'])
+def test_clipboard_round_trip_keeps_binary_payloads(tmp_path, ext):
+    source = Database(str(tmp_path / 'a.db'))
+    source.add_clipboard_item('text', content_text='hello', preview='hello',
+                              formats={'text/html': b'<b>hello</b>'})
+    source.add_clipboard_item('image', content_data=bytes(range(256)), content_text='[Image]', preview='[Image]')
+    path = str(tmp_path / f'clips.{ext}')
+    assert bulk_io.export_clipboard_history(source, path) == 2
+
+    target = Database(str(tmp_path / 'b.db'))
+    assert bulk_io.import_clipboard_history(target, path) == 2
+    assert _clipboard_rows(target) == _clipboard_rows(source)
+
+
+def test_cancelled_export_leaves_existing_file(tmp_path):
+    db = Database(str(tmp_path / 'a.db'))
+    db.add_snippet('One', '1')
+    path = tmp_path / 'snippets.jsonl'
+    path.write_text('previous export\n', encoding='utf-8')
+    with pytest.raises(_Cancelled):
+        bulk_io.export_snippets(db, str(path), progress=_cancel)
+    assert path.read_text(encoding='utf-8') == 'previous export\n'
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
+
+
+def test_cancelled_import_rolls_back(tmp_path):
+    source = Database(str(tmp_path / 'a.db'))
+    source.import_snippets({'title': f'T{i}', 'content': 'x', 'category': 'C'} for i in range(1500))
+    path = str(tmp_path / 'snippets.jsonl')
+    bulk_io.export_snippets(source, path)
+
+    target = Database(str(tmp_path / 'b.db'))
+    target.add_snippet('Existing', 'kept')
+    triggers = _triggers(target)
+    # progress first fires after the first batch of 1000 rows
+    with pytest.raises(_Cancelled):
+        bulk_io.import_snippets(target, path, progress=_cancel)
+    assert [s['title'] for s in target.iter_snippets()] == ['Existing']
+    assert target.get_category_counts() == {}
+    assert _triggers(target) == triggers
@@ -0,0 +1,49 @@
+from clipboard_cache import RecentClipboardItems
+
+
+def _item(item_id, created_at='2024-03-02 10:00:00', content_type='text', text='x', data=None):
+    return {'id': item_id, 'content_type': content_type, 'content_data': data, 'content_text': text,
+            'preview': text, 'created_at': created_at}
+
+
+def test_add_evicts_oldest_beyond_capacity():
+    ring = RecentClipboardItems(capacity=3)
+    for i in range(1, 6):
+        ring.add(_item(i))
+    assert len(ring) == 3
+    assert [item['id'] for item in ring.items()] == [5, 4, 3]
+    assert ring.get(2) is None
+    assert ring.latest()['id'] == 5
+
+
+def test_eviction_ends_date_coverage():
+    ring = RecentClipboardItems(capacity=2)
+    ring.add(_item(1, '2024-03-01 23:00:00'))
+    ring.add(_item(2, '2024-03-02 08:00:00'))
+    assert ring.covers_date('2024-03-01')
+    ring.add(_item(3, '2024-03-02 09:00:00'))
+    assert not ring.covers_date('2024-03-01')
+    assert not ring.covers_date('2024-03-02')  # the oldest kept item is from that day
+    assert ring.covers_date('2024-03-03')
+
+
+def test_prime_keeps_newest_rows():
+    ring = RecentClipboardItems(capacity=2)
+    ring.prime([_item(3), _item(2), _item(1)])
+    assert [item['id'] for item in ring.items()] == [3, 2]
+    assert not ring.covers_date('2024-03-02')
+
+
+def test_large_payloads_kept_as_metadata_only():
+    ring = RecentClipboardItems(capacity=5, payload_limit=10)
+    ring.add(_item(1, content_type='image', text='[Image]', data=b'\0' * 11))
+    ring.add(_item(2, text='y' * 11))
+    ring.add(_item(3, text='y' * 10))
+    for item_id in (1, 2):
+        assert ring.get(item_id)['content_data'] is None and ring.get(item_id)['content_text'] is None
+        assert ring.get(item_id, need_payload=True) is None
+    assert ring.get(3, need_payload=True)['content_text'] == 'y' * 10
+    assert [item['id'] for item in ring.items(content_type='image')] == [1]
+    # Re-adding with a small payload makes it servable again
+    ring.add(_item(2, text='short'))
+    assert ring.get(2, need_payload=True)['content_text'] == 'short'
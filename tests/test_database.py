@@ -0,0 +1,53 @@
+import sqlite3
+
+from database import Database
+
+_BASELINE_SNIPPETS_UPDATE = """CREATE TRIGGER snippets_fts_update AFTER UPDATE ON snippets BEGIN
+    INSERT INTO snippets_fts(snippets_fts, rowid, title, content) VALUES('delete', old.id, old.title, old.content);
+    INSERT INTO snippets_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END"""
+
+
+def _trigger_sql(path, name):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)).fetchone()[0]
+
+
+def test_update_triggers_replaced_on_existing_database(tmp_path):
+    path = str(tmp_path / 'app.db')
+    Database(path)
+    # A database whose update trigger predates the column list, stopped at version 5
+    with sqlite3.connect(path) as conn:
+        conn.execute('DROP TRIGGER snippets_fts_update')
+        conn.execute(_BASELINE_SNIPPETS_UPDATE)
+        conn.execute('DROP TRIGGER clipboard_fts_update')
+        conn.execute('PRAGMA user_version = 5')
+
+    db = Database(path)
+    assert 'AFTER UPDATE OF title, content ON snippets' in _trigger_sql(path, 'snippets_fts_update')
+    assert 'AFTER UPDATE OF content_text, preview' in _trigger_sql(path, 'clipboard_fts_update')
+    snippet_id = db.add_snippet('Greeting', 'hello world')
+    db.update_snippet(snippet_id, 'Greeting', 'goodbye world')
+    assert [s['id'] for s in db.search_snippets('goodbye')] == [snippet_id]
+    assert db.search_snippets('hello') == []
+
+
+def test_deleting_a_category_row_clears_snippet_references(tmp_path):
+    db = Database(str(tmp_path / 'app.db'))
+    kept = db.add_snippet('Kept', 'a', 'Work')
+    orphan = db.add_snippet('Orphan', 'b', 'Home')
+    with db._get_connection() as conn:
+        conn.execute("DELETE FROM categories WHERE name = 'Home'")
+    assert db.get_snippet(orphan)['category_id'] is None
+    assert db.get_snippet(kept)['category'] == 'Work'
+    assert [s['id'] for s in db.get_all_snippets('')] == [orphan]
+
+
+def test_delete_category_keeps_counts(tmp_path):
+    db = Database(str(tmp_path / 'app.db'))
+    for title in ('a', 'b'):
+        db.add_snippet(title, title, 'Work')
+    db.add_snippet('c', 'c', 'Home')
+    assert db.delete_snippet_category('Work') == 2
+    assert db.get_category_counts() == {'Home': 1}
+    assert len(db.get_all_snippets('')) == 2
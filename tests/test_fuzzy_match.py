@@ -0,0 +1,85 @@
+import random
+import statistics
+import time
+
+from fuzzy_match import SCORE_LIMIT, FuzzyIndex, char_mask, fold_case, fuzzy_match
+
+# Per-keystroke search time on 20k titles (best of 3 runs), median and worst
+KEYSTROKE_MEDIAN_MS = 5.0
+KEYSTROKE_MAX_MS = 15.0
+
+
+def test_fold_case_keeps_length():
+    for text in ('İstanbul office', 'İİİ abc', 'Straße', 'ﬁle ǅ', 'plain ascii'):
+        assert len(fold_case(text)) == len(text)
+
+
+def test_positions_index_original_text_after_expanding_lowercase():
+    assert fuzzy_match('off', 'İstanbul office') == fuzzy_match('off', 'Istanbul office')
+    assert fuzzy_match('off', 'İstanbul office')[1] == (9, 10, 11)
+    assert fuzzy_match('e', 'İstanbul office')[1] == (14,)
+    assert fuzzy_match('abc', 'İİİ abc')[1] == (4, 5, 6)
+
+
+def test_non_ascii_titles_searchable():
+    index = FuzzyIndex([(1, 'İstanbul office'), (2, 'Café menu'), (3, 'Ürün listesi')])
+    assert [m.key for m in index.search('café')] == [2]
+    assert [m.key for m in index.search('ürün')] == [3]
+    match, = index.search('office')
+    assert match.key == 1
+    assert ''.join(match.text[p] for p in match.positions) == 'office'
+    assert [m.key for m in index.search('İst')] == [1]
+
+
+def test_char_mask_of_folded_text():
+    assert char_mask(fold_case('AbC')) == char_mask('abc')
+
+
+def _titles(n: int, seed: int = 29):
+    rng = random.Random(seed)
+    # Roughly English letter frequencies, so common letters match most titles
+    letters = 'eeeeeeeeeeeettttttttaaaaaaaaooooooooiiiiiiinnnnnnnssssssrrrrrrhhhhhlllldddcccuuummwwffggyyppbbvk'
+    words = lambda: ''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))).capitalize()
+    return [(i, ' '.join(words() for _ in range(rng.randint(2, 6)))) for i in range(n)]
+
+
+def test_search_narrows_before_scoring_and_keeps_every_match():
+    index = FuzzyIndex(_titles(5000))
+    results = index.search('e')
+    expected = [key for key, text in index.items() if 'e' in text.lower()]
+    assert sorted(m.key for m in results) == sorted(expected)
+    assert len(results) > SCORE_LIMIT
+    scores = [m.score for m in results]
+    assert scores == sorted(scores, reverse=True)
+    assert all(m.text.lower()[m.positions[0]] == 'e' for m in results)
+    # Typing on, and starting over, find the same matches as a fresh index
+    assert [m.key for m in index.search('et', limit=20)] == [m.key for m in FuzzyIndex(_titles(5000)).search('et', limit=20)]
+    assert [m.key for m in index.search('t', limit=20)] == [m.key for m in FuzzyIndex(_titles(5000)).search('t', limit=20)]
+
+
+def test_keystroke_budget_on_20k_titles():
+    index = FuzzyIndex(_titles(20000))
+    times = []
+    for query in ('pwdrst', 'customer', 'steps', 'invoice', 'emailtab', 'hello'):
+        for k in range(1, len(query) + 1):
+            best = float('inf')
+            for _ in range(3):
+                # Each run continues from the previous keystroke, as typing does
+                if k > 1:
+                    index.search(query[:k - 1], limit=50)
+                else:
+                    index.search('', limit=50)
+                started = time.perf_counter()
+                index.search(query[:k], limit=50)
+                best = min(best, (time.perf_counter() - started) * 1000)
+            times.append(best)
+    assert statistics.median(times) <= KEYSTROKE_MEDIAN_MS, times
+    assert max(times) <= KEYSTROKE_MAX_MS, times
+
+
+def test_later_word_boundary_beats_mid_word_match():
+    # 's' first occurs mid-word in "Reset"; "Steps" starts a word further on
+    assert fuzzy_match('st', 'Reset Steps')[1] == (6, 7)
+    assert fuzzy_match('st', 'Password Reset Steps')[1] == (15, 16)
+    index = FuzzyIndex([(1, 'Mister Tom'), (2, 'Reset Steps')])
+    assert [m.key for m in index.search('st')] == [2, 1]
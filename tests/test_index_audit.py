@@ -0,0 +1,34 @@
+import database
+from database import Database
+
+
+def _indexes(db):
+    with db._get_connection() as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_drop_rolled_back_when_a_query_would_lose_its_index(tmp_path, monkeypatch):
+    db = Database(str(tmp_path / 'app.db'))
+    with db._get_connection() as conn:
+        conn.execute('CREATE INDEX idx_snippets_content ON snippets(content)')
+    # The orphan blob purge scans clipboard_formats once per blob without this index
+    monkeypatch.setattr(database, 'REDUNDANT_INDEXES', ('idx_snippets_content', 'idx_clipboard_formats_blob'))
+    audit = db.audit_indexes()
+    assert 'idx_snippets_content' in audit['unused']
+    assert audit['used']['idx_clipboard_formats_blob'] == ['clipboard: orphan blobs']
+
+    report = db.optimize_indexes()
+    assert report['dropped'] == ['idx_snippets_content']
+    assert report['kept'] == ['idx_clipboard_formats_blob']
+    indexes = _indexes(db)
+    assert 'idx_clipboard_formats_blob' in indexes and 'idx_snippets_content' not in indexes
+    assert db.optimize_indexes() == {'dropped': [], 'kept': ['idx_clipboard_formats_blob'], 'bytes_freed': 0}
+
+
+def test_superseded_index_dropped(tmp_path):
+    db = Database(str(tmp_path / 'app.db'))
+    with db._get_connection() as conn:
+        conn.execute('CREATE INDEX idx_snippets_category_id ON snippets(category_id)')
+    # idx_snippets_category_title serves the same lookups
+    assert db.optimize_indexes()['dropped'] == ['idx_snippets_category_id']
+    assert 'idx_snippets_category_id' not in _indexes(db)
@@ -0,0 +1,48 @@
+import io
+import json
+
+from database import Database
+from legacy_migration import _JsonStream, migrate_file
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+def test_clipboard_migration_is_idempotent(tmp_path):
+    entries = [
+        {'type': 'text', 'text': 'first', 'timestamp': '2023-05-01T09:30:00'},
+        {'type': 'text', 'text': 'second', 'timestamp': '2023-05-01T09:31:00'},
+        {'type': 'text', 'text': 'first', 'timestamp': '2023-05-01T09:30:00'},
+        {'type': 'image', 'text': '', 'timestamp': '2023-05-01T09:32:00'},
+    ]
+    path = _write(tmp_path / 'clipboard_history.json', entries)
+    db = Database(str(tmp_path / 'app.db'))
+
+    first = migrate_file(db, path)
+    assert (first['kind'], first['imported'], first['duplicates'], first['skipped']) == ('clipboard', 2, 1, 1)
+    again = migrate_file(db, path)
+    assert (again['imported'], again['duplicates'], again['skipped']) == (0, 3, 1)
+    assert sorted(i['content_text'] for i in db.iter_clipboard_items()) == ['first', 'second']
+
+
+def test_snippet_migration_is_idempotent(tmp_path):
+    path = _write(tmp_path / 'snippets.json', {'Greeting': 'Hello', 'Sig': 'Regards', 'Bad': 3})
+    db = Database(str(tmp_path / 'app.db'))
+    db.add_snippet('Greeting', 'Hello')
+
+    first = migrate_file(db, path)
+    assert (first['kind'], first['imported'], first['duplicates'], first['skipped']) == ('snippets', 1, 1, 1)
+    assert migrate_file(db, path)['imported'] == 0
+    assert sorted(s['title'] for s in db.iter_snippets()) == ['Greeting', 'Sig']
+
+
+def test_values_split_across_read_chunks():
+    text = json.dumps([{'text': 'a long value spanning chunks'}, 12.5e3, 'x'])
+    stream = _JsonStream(io.StringIO(text), chunk_size=3)
+    stream.expect('[')
+    values = [stream.value()]
+    while stream.expect(',]') == ',':
+        values.append(stream.value())
+    assert values == json.loads(text)
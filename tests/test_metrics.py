@@ -0,0 +1,49 @@
+import threading
+
+from metrics import Counter, Histogram, MetricsRegistry
+
+
+def _hammer(func, threads=8, calls=20000):
+    workers = [threading.Thread(target=lambda: [func() for _ in range(calls)]) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * calls
+
+
+def test_counter_increments_from_many_threads_are_not_lost():
+    counter = Counter()
+    total = _hammer(counter.inc)
+    assert counter.value == total
+
+
+def test_histogram_observations_from_many_threads_are_not_lost():
+    histogram = Histogram()
+    total = _hammer(lambda: histogram.observe(3.0))
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == total == sum(snapshot['buckets'].values())
+    assert snapshot['sum'] == 3.0 * total
+
+
+def test_registry_snapshot():
+    registry = MetricsRegistry()
+    registry.counter('a').inc(2)
+    with registry.timer('t'):
+        pass
+    snapshot = registry.snapshot()
+    assert snapshot['counters'] == {'a': 2}
+    assert snapshot['histograms']['t']['count'] == 1
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    registry.counter('ocr.cache.hits').inc()
+    registry.histogram('h').observe(5.0)
+    with registry.timer('t'):
+        pass
+    snapshot = registry.snapshot()
+    assert snapshot['counters'] == {} and snapshot['histograms'] == {}
+    registry.enabled = True
+    registry.counter('ocr.cache.hits').inc()
+    assert registry.snapshot()['counters'] == {'ocr.cache.hits': 1}
@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+from migrations import Migration, run_migrations, schema_version
+
+
+def _create(table):
+    return lambda cursor: cursor.execute(f'CREATE TABLE {table} (id INTEGER)')
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_pending_steps_run_in_order_once():
+    conn = sqlite3.connect(':memory:')
+    applied = []
+    steps = [Migration(v, f'step {v}', lambda cursor, v=v: applied.append(v)) for v in (1, 2, 3)]
+    assert run_migrations(conn, steps[:2]) == 2
+    assert run_migrations(conn, steps) == 3
+    assert run_migrations(conn, steps) == 3
+    assert applied == [1, 2, 3]
+    assert schema_version(conn) == 3
+
+
+def test_failing_step_rolls_back_to_last_good_version():
+    conn = sqlite3.connect(':memory:')
+
+    def broken(cursor):
+        cursor.execute('CREATE TABLE half_done (id INTEGER)')
+        raise RuntimeError('boom')
+
+    steps = [Migration(1, 'a', _create('a')), Migration(2, 'broken', broken), Migration(3, 'b', _create('b'))]
+    with pytest.raises(RuntimeError):
+        run_migrations(conn, steps)
+    assert schema_version(conn) == 1
+    assert _tables(conn) == {'a'}
+    # The connection is usable and the fixed step applies on the next run
+    steps[1] = Migration(2, 'fixed', _create('c'))
+    assert run_migrations(conn, steps) == 3
+    assert _tables(conn) == {'a', 'b', 'c'}
+    assert conn.isolation_level == ''
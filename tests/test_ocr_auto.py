@@ -0,0 +1,30 @@
+from PIL import Image, ImageDraw
+
+from ocr_utils import AUTO_FULL_CONTRAST, OCRPreprocessOptions, analyze_image, auto_options
+
+
+def _sparse_text(background: int, ink: int) -> Image.Image:
+    """One short line of glyph-like strokes on a large, otherwise empty screenshot."""
+    img = Image.new('RGB', (1600, 1000), (background,) * 3)
+    draw = ImageDraw.Draw(img)
+    for x in range(40, 400, 9):
+        draw.rectangle((x, 40, x + 2, 56), fill=(ink,) * 3)
+        draw.rectangle((x, 40, x + 6, 42), fill=(ink,) * 3)
+    return img
+
+
+def test_sparse_text_contrast_is_measured():
+    assert analyze_image(_sparse_text(255, 0)).contrast >= AUTO_FULL_CONTRAST
+    assert analyze_image(_sparse_text(30, 230)).contrast >= AUTO_FULL_CONTRAST
+
+
+def test_sparse_washed_out_text_is_flat():
+    assert analyze_image(_sparse_text(200, 170)).contrast < AUTO_FULL_CONTRAST
+
+
+def test_auto_skips_contrast_steps_for_crisp_sparse_text():
+    opt = OCRPreprocessOptions(auto=True, auto_contrast=True, equalize=True)
+    chosen = auto_options(_sparse_text(255, 0), opt)
+    assert not chosen.auto_contrast and not chosen.equalize
+    chosen = auto_options(_sparse_text(200, 170), opt)
+    assert chosen.auto_contrast and chosen.equalize
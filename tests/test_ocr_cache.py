@@ -0,0 +1,58 @@
+import io
+
+import pytest
+from PIL import Image
+
+import ocr_jobs
+from database import Database
+from ocr_utils import OCRPreprocessOptions
+
+
+def _png(color):
+    buf = io.BytesIO()
+    Image.new('RGB', (40, 20), color).save(buf, 'PNG')
+    return buf.getvalue()
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    calls = []
+
+    def fake_ocr_image(img, lang='eng', opt=None, **kwargs):
+        calls.append((img.size, lang))
+        return f'text {len(calls)}'
+
+    monkeypatch.setattr(ocr_jobs, 'ocr_image', fake_ocr_image)
+    monkeypatch.setattr(ocr_jobs, 'tesseract_version', lambda: '5.3.0')
+    return calls
+
+
+def test_repeat_extraction_served_from_cache(tmp_path, runs):
+    db = Database(str(tmp_path / 'app.db'))
+    image = _png('white')
+    assert ocr_jobs.cached_ocr(db, image) == 'text 1'
+    assert ocr_jobs.cached_ocr(db, image) == 'text 1'
+    # Same pixels re-encoded identically hit too; other bytes do not
+    assert ocr_jobs.cached_ocr(db, _png('white')) == 'text 1'
+    assert ocr_jobs.cached_ocr(db, _png('black')) == 'text 2'
+    assert len(runs) == 2
+
+
+def test_key_includes_language_options_engine_and_region(tmp_path, runs, monkeypatch):
+    db = Database(str(tmp_path / 'app.db'))
+    image = _png('white')
+    ocr_jobs.cached_ocr(db, image)
+    assert ocr_jobs.cached_ocr(db, image, lang='deu') == 'text 2'
+    assert ocr_jobs.cached_ocr(db, image, opt=OCRPreprocessOptions(grayscale=True)) == 'text 3'
+    assert ocr_jobs.cached_ocr(db, image, opt=OCRPreprocessOptions(grayscale=True)) == 'text 3'
+    assert ocr_jobs.cached_ocr(db, image, region=(0, 0, 10, 10)) == 'text 4'
+    assert ocr_jobs.cached_ocr(db, image, region=(0, 0, 10, 10)) == 'text 4'
+    assert runs[-1] == ((10, 10), 'eng')
+    monkeypatch.setattr(ocr_jobs, 'tesseract_version', lambda: '5.4.0')
+    assert ocr_jobs.cached_ocr(db, image, opt=OCRPreprocessOptions(grayscale=True)) == 'text 5'
+
+
+def test_no_database_always_recognizes(runs):
+    image = _png('white')
+    assert ocr_jobs.cached_ocr(None, image) == 'text 1'
+    assert ocr_jobs.cached_ocr(None, image) == 'text 2'
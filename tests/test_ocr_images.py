@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ocr_utils
+
+
+def _fake_worker(image, lang, opt, timeout):
+    if image == 'hang':
+        # What pytesseract raises once it has killed a Tesseract run past `timeout`
+        raise RuntimeError('Tesseract process timeout')
+    if image == 0:
+        time.sleep(0.1)  # finishes after the images submitted behind it
+    return f'text {image}'
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    monkeypatch.setattr(ocr_utils, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(ocr_utils, '_init_ocr_worker', lambda *args: None)
+    monkeypatch.setattr(ocr_utils, '_ocr_worker', _fake_worker)
+
+
+def test_results_yielded_in_input_order(fake_pool):
+    results = list(ocr_utils.ocr_images(range(8), workers=4))
+    assert [r.index for r in results] == list(range(8))
+    assert [r.text for r in results] == [f'text {i}' for i in range(8)]
+
+
+def test_input_read_at_most_max_pending_ahead(fake_pool):
+    read = []
+
+    def images():
+        for i in range(20):
+            read.append(i)
+            yield i
+
+    ahead = [len(read) - result.index for result in ocr_utils.ocr_images(images(), workers=2, max_pending=3)]
+    # The image in hand waits for a free slot before it is submitted
+    assert ahead[0] == 4
+    assert max(ahead) <= 4
+
+
+def test_tesseract_timeout_reported_without_stopping_the_batch(fake_pool):
+    results = list(ocr_utils.ocr_images([1, 'hang', 3], workers=2, timeout=5))
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[1].text is None and 'timeout' in results[1].error
+    assert results[2].text == 'text 3'
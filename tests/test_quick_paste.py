@@ -0,0 +1,56 @@
+import random
+import statistics
+import time
+
+from quick_paste import QuickPasteIndex
+
+# Per-keystroke query time over 200 clips and 20k snippets (best of 3 runs)
+QUERY_MEDIAN_MS = 20.0
+QUERY_MAX_MS = 50.0
+
+
+def _phrases(n: int, seed: int = 28):
+    rng = random.Random(seed)
+    letters = 'eeeeeeeeeeeettttttttaaaaaaaaooooooooiiiiiiinnnnnnnssssssrrrrrrhhhhhlllldddcccuuummwwffggyyppbbvk'
+    word = lambda: ''.join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+    return [' '.join(word() for _ in range(rng.randint(2, 6))) for _ in range(n)]
+
+
+def _index():
+    index = QuickPasteIndex(capacity=200)
+    index.set_clips({'id': i, 'content_type': 'text', 'preview': p} for i, p in enumerate(_phrases(500, seed=1)))
+    categories = ['Work', 'Support', 'Personal', '']
+    index.set_snippets({'id': i, 'title': t.capitalize(), 'category': categories[i % 4]}
+                       for i, t in enumerate(_phrases(20000)))
+    return index
+
+
+def test_clips_labelled_and_ranked_ahead_of_equal_snippets():
+    index = QuickPasteIndex(capacity=2)
+    index.set_clips([{'id': 1, 'content_type': 'text', 'preview': 'reset steps'},
+                     {'id': 2, 'content_type': 'text', 'preview': 'older'},
+                     {'id': 3, 'content_type': 'text', 'preview': 'dropped'}])
+    index.set_snippets([{'id': 7, 'title': 'reset steps', 'category': ''}])
+    entries = index.search('reset')
+    assert [(e['kind'], e['id']) for e in entries] == [('clip', 1), ('snippet', 7)]
+    label, positions = entries[0]['label'], entries[0]['positions']
+    assert label == '[Text] reset steps'
+    assert ''.join(label[p] for p in positions) == 'reset'
+    assert [(e['kind'], e['id']) for e in index.search('')] == [('clip', 1), ('clip', 2), ('snippet', 7)]
+
+
+def test_query_latency_on_large_index():
+    index = _index()
+    times = []
+    for query in ('invoice', 'reset', 'support', 'hello'):
+        for k in range(1, len(query) + 1):
+            best = float('inf')
+            for _ in range(3):
+                index.search(query[:k - 1])
+                started = time.perf_counter()
+                entries = index.search(query[:k])
+                best = min(best, (time.perf_counter() - started) * 1000)
+            assert len(entries) <= 50
+            times.append(best)
+    assert statistics.median(times) <= QUERY_MEDIAN_MS, times
+    assert max(times) <= QUERY_MAX_MS, times
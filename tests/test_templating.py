@@ -0,0 +1,32 @@
+from templating import CompiledTemplate, render_template
+
+
+def test_percent_encoded_url_keeps_following_placeholder():
+    url = 'https://maps.example/?q=%E9%wc_city_name%'
+    assert render_template(url, {'wc_city_name': 'Paris'}) == 'https://maps.example/?q=%E9Paris'
+    assert render_template('%20%wc_city_name%%2C%wc_country%', {'wc_city_name': 'Paris', 'wc_country': 'FR'}) \
+        == '%20Paris%2CFR'
+
+
+def test_adjacent_placeholders():
+    assert render_template('%date%%time%', {'date': 'D', 'time': 'T'}) == 'DT'
+    assert render_template('%a%%b%', {'b': 'B'}) == '%a%B'
+    assert render_template('%unknown%name%', {'name': 'N'}) == '%unknownN'
+
+
+def test_filled_placeholder_consumes_its_closing_percent():
+    assert render_template('%a%b%', {'a': 'A', 'b': 'B'}) == 'Ab%'
+
+
+def test_unknown_placeholders_and_stray_percents_pass_through():
+    for source in ('100% sure', '%nope%', '50%% off %x', '%a%b%c%'):
+        assert render_template(source, {}) == source
+    assert CompiledTemplate('plain text').render({'x': 1}) == 'plain text'
+
+
+def test_callables_only_called_when_used():
+    calls = []
+    variables = {'clipboard': lambda: calls.append(1) or 'clip', 'date': 'D'}
+    assert render_template('%date% %clipboard%', variables) == 'D clip'
+    assert render_template('%date%', variables) == 'D'
+    assert calls == [1]
@@ -0,0 +1,61 @@
+from text_expansion import ExpansionEngine, TriggerAutomaton
+
+
+def _engine(triggers, **kwargs):
+    return ExpansionEngine(TriggerAutomaton(triggers), **kwargs)
+
+
+def test_overlapping_triggers_report_longest_match():
+    engine = _engine({'he': 1, 'she': 2, 'hers': 3, 'ushers': 4}, require_boundary=False)
+    assert engine.feed_text('ushe') == [('she', 2)]
+    engine.reset()
+    assert engine.feed_text('ushers') == [('she', 2)]  # matching resets after a hit
+    engine.reset()
+    assert engine.feed_text('xhers') == [('he', 1)]
+    engine.reset()
+    assert engine.feed_text('ushXushers') == [('she', 2)]
+
+
+def test_suffix_triggers_found_via_failure_links():
+    engine = _engine({'abcd': 1, 'bc': 2}, require_boundary=False)
+    assert engine.feed_text('abc') == [('bc', 2)]
+    engine = _engine({'abcd': 1, 'bcx': 2}, require_boundary=False)
+    assert engine.feed_text('abcx') == [('bcx', 2)]
+
+
+def test_word_triggers_need_a_boundary():
+    engine = _engine({'brb': 'be right back', ';sig': 'Regards'})
+    assert engine.feed_text('brb') == [('brb', 'be right back')]
+    assert engine.feed_text('xbrb') == []
+    engine.reset()
+    assert engine.feed_text('ok brb') == [('brb', 'be right back')]
+    assert engine.feed_text('name;sig') == [(';sig', 'Regards')]
+
+
+def test_trigger_started_before_reset_does_not_fire():
+    engine = _engine({'brb': 1})
+    engine.feed_text('xb')
+    engine.reset()
+    assert engine.feed_text('rb') == []
+
+
+def test_update_applies_diff():
+    automaton = TriggerAutomaton({'aa': 1, 'bb': 2, 'cc': 3})
+    assert automaton.update({'aa': 1, 'bb': 20, 'dd': 4}) == (2, 1)
+    assert automaton.triggers() == {'aa': 1, 'bb': 20, 'dd': 4}
+    assert 'cc' not in automaton
+    assert automaton.update({'aa': 1, 'bb': 20, 'dd': 4}) == (0, 0)
+    engine = ExpansionEngine(automaton)
+    assert engine.feed_text('cc dd bb') == [('dd', 4), ('bb', 20)]
+
+
+def test_stream_continues_across_compaction():
+    automaton = TriggerAutomaton({'qqqqq': 1, 'brb': 2})
+    engine = ExpansionEngine(automaton)
+    assert engine.feed_text(' qq') == []
+    generation = automaton.generation
+    automaton.remove('qqqqq')  # removed path dominates the trie -> compaction
+    assert automaton.generation != generation
+    # 'brb' now reuses the old 'qq' node ids; a stale state would fire here
+    assert engine.feed_text('b') == []
+    assert engine.feed_text(' brb') == [('brb', 2)]
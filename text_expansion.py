@@ -0,0 +1,287 @@
+import ctypes
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TriggerAutomaton:
+    """Aho-Corasick automaton matching every snippet trigger in one pass.
+
+    The trie is updated in place when triggers are added or removed; failure
+    links are recomputed lazily (one BFS over the trie) on the next step after
+    a change. Transitions are memoized per (state, char), so once warm each
+    keystroke costs a single dict lookup regardless of the number of triggers.
+    Compaction renumbers nodes and bumps `generation`; states obtained before
+    that are no longer valid.
+    """
+
+    def __init__(self, triggers: Optional[Dict[str, Any]] = None):
+        self.generation = 0
+        self._clear()
+        if triggers:
+            for trigger, value in triggers.items():
+                self.add(trigger, value)
+
+    def _clear(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._terminal: List[Optional[str]] = [None]
+        self._fail: List[int] = [0]
+        self._out: List[Optional[str]] = [None]
+        self._delta: List[Dict[str, int]] = [{}]
+        self._values: Dict[str, Any] = {}
+        self._dead_nodes = 0
+        self._dirty = False
+        self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, trigger: str) -> bool:
+        return trigger in self._values
+
+    @property
+    def max_length(self) -> int:
+        return max((len(t) for t in self._values), default=0)
+
+    def triggers(self) -> Dict[str, Any]:
+        return dict(self._values)
+
+    def add(self, trigger: str, value: Any) -> None:
+        """Add or replace a trigger."""
+        if not trigger:
+            return
+        node = 0
+        for ch in trigger:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._terminal.append(None)
+                self._fail.append(0)
+                self._out.append(None)
+                self._delta.append({})
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._terminal[node] = trigger
+        self._values[trigger] = value
+        self._dirty = True
+
+    def remove(self, trigger: str) -> None:
+        if trigger not in self._values:
+            return
+        del self._values[trigger]
+        node = 0
+        for ch in trigger:
+            node = self._goto[node][ch]
+        self._terminal[node] = None
+        self._dead_nodes += len(trigger)
+        # Compact once removed paths dominate the trie
+        if self._dead_nodes > len(self._goto) // 2:
+            values = self._values
+            self._clear()
+            for t, v in values.items():
+                self.add(t, v)
+        self._dirty = True
+
+    def update(self, triggers: Dict[str, Any]) -> Tuple[int, int]:
+        """Apply the difference to a new trigger -> value mapping.
+
+        Returns (added_or_changed, removed) counts.
+        """
+        removed = [t for t in self._values if t not in triggers]
+        for trigger in removed:
+            self.remove(trigger)
+        changed = 0
+        for trigger, value in triggers.items():
+            if self._values.get(trigger, object()) != value:
+                self.add(trigger, value)
+                changed += 1
+        return changed, len(removed)
+
+    def _build(self) -> None:
+        """Recompute failure and output links breadth-first."""
+        goto, fail, out, terminal = self._goto, self._fail, self._out, self._terminal
+        queue = deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            out[child] = terminal[child]
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0) if goto[f].get(ch, 0) != child else 0
+                # Longest trigger ending here: our own, else the one via the failure link
+                out[child] = terminal[child] or out[fail[child]]
+                queue.append(child)
+        self._delta = [{} for _ in goto]
+        self._dirty = False
+
+    def step(self, state: int, ch: str) -> Tuple[int, Optional[str]]:
+        """Advance from `state` by `ch`; returns (new_state, matched trigger or None)."""
+        if self._dirty:
+            self._build()
+        nxt = self._delta[state].get(ch)
+        if nxt is None:
+            node = state
+            while True:
+                nxt = self._goto[node].get(ch)
+                if nxt is not None or node == 0:
+                    break
+                node = self._fail[node]
+            if nxt is None:
+                nxt = 0
+            self._delta[state][ch] = nxt
+        return nxt, self._out[nxt]
+
+    def value(self, trigger: str) -> Any:
+        return self._values.get(trigger)
+
+
+class ExpansionEngine:
+    """Feeds typed characters through a `TriggerAutomaton` and reports expansions.
+
+    A trigger that begins with a word character only fires at a word boundary
+    (start of input or after a non-word character): 'brb' fires in 'ok brb'
+    but not in 'xbrb'. Triggers starting with punctuation (';sig') fire
+    anywhere. Headless: drive it with `feed()` from any key source,
+    including synthetic keystroke streams.
+    """
+
+    def __init__(self, automaton: Optional[TriggerAutomaton] = None, require_boundary: bool = True):
+        self.automaton = automaton or TriggerAutomaton()
+        self.require_boundary = require_boundary
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget typed context (e.g. on Backspace, navigation keys or focus change)."""
+        self._state = 0
+        self._generation = self.automaton.generation
+        self._recent = deque(maxlen=64)
+
+    def feed(self, ch: str) -> Optional[Tuple[str, Any]]:
+        """Process one typed character; returns (trigger, value) when one completes."""
+        if self._generation != self.automaton.generation:
+            # The trie was compacted; our node id is stale. Keep `_recent` for the boundary check.
+            self._state = 0
+            self._generation = self.automaton.generation
+        self._recent.append(ch)
+        self._state, trigger = self.automaton.step(self._state, ch)
+        if trigger is None:
+            return None
+        if self.require_boundary and (trigger[0].isalnum() or trigger[0] == '_'):
+            n = len(trigger)
+            if n < len(self._recent):
+                before = self._recent[-n - 1]
+                if before.isalnum() or before == '_':
+                    return None
+            elif len(self._recent) < n:
+                # Part of the trigger was typed before the last reset
+                return None
+        self.reset()
+        return trigger, self.automaton.value(trigger)
+
+    def feed_text(self, text: str) -> List[Tuple[str, Any]]:
+        """Feed a string one character at a time; returns all expansions."""
+        hits = []
+        for ch in text:
+            hit = self.feed(ch)
+            if hit:
+                hits.append(hit)
+        return hits
+
+
+# ===== Windows keyboard hook glue =====
+
+WH_KEYBOARD_LL = 13
+WM_KEYDOWN = 0x0100
+WM_SYSKEYDOWN = 0x0104
+LLKHF_INJECTED = 0x10
+# Keys that move the caret or change focus; typed context is discarded
+_RESET_KEYS = {0x08, 0x09, 0x0D, 0x1B, 0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2E}
+
+
+class KeyboardExpansionHook:
+    """Low-level Windows keyboard hook feeding typed characters into an `ExpansionEngine`.
+
+    `on_expand(trigger, value)` is called from the hook; it must return quickly
+    (e.g. schedule the real work with QTimer.singleShot). Injected keystrokes
+    (our own backspaces and paste) are ignored.
+    """
+
+    def __init__(self, engine: ExpansionEngine, on_expand: Callable[[str, Any], None]):
+        self.engine = engine
+        self.on_expand = on_expand
+        self._hook = None
+        self._proc = None
+
+    @property
+    def installed(self) -> bool:
+        return self._hook is not None
+
+    def install(self) -> None:
+        if self._hook is not None:
+            return
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [('vkCode', wintypes.DWORD), ('scanCode', wintypes.DWORD),
+                        ('flags', wintypes.DWORD), ('time', wintypes.DWORD),
+                        ('dwExtraInfo', ctypes.c_void_p)]
+
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.CallNextHookEx.argtypes = [wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+        user32.CallNextHookEx.restype = LRESULT
+        user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD]
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        key_state = (ctypes.c_ubyte * 256)()
+        buf = ctypes.create_unicode_buffer(8)
+
+        def proc(n_code, w_param, l_param):
+            try:
+                if n_code == 0 and w_param in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                    kb = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+                    if not kb.flags & LLKHF_INJECTED:
+                        self._handle_key(user32, kb.vkCode, kb.scanCode, key_state, buf)
+            except Exception as e:
+                LOGGER.debug(f"Expansion hook error: {e}")
+            return user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        self._proc = HOOKPROC(proc)  # keep a reference or the callback is freed
+        self._hook = user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._proc, kernel32.GetModuleHandleW(None), 0)
+        if not self._hook:
+            self._proc = None
+            raise RuntimeError('SetWindowsHookEx failed')
+
+    def _handle_key(self, user32, vk, scan, key_state, buf):
+        if vk in _RESET_KEYS:
+            self.engine.reset()
+            return
+        user32.GetKeyboardState(key_state)
+        # Ctrl/Alt shortcuts are not typing
+        if key_state[0x11] & 0x80 or key_state[0x12] & 0x80:
+            return
+        # Flag 0x4: do not change the keyboard state (keeps dead keys intact)
+        count = user32.ToUnicodeEx(vk, scan, key_state, buf, len(buf), 0x4, user32.GetKeyboardLayout(0))
+        if count == 1:
+            hit = self.engine.feed(buf.value[0])
+            if hit:
+                self.on_expand(*hit)
+
+    def uninstall(self) -> None:
+        if self._hook is None:
+            return
+        try:
+            ctypes.windll.user32.UnhookWindowsHookEx(self._hook)
+        except Exception:
+            pass
+        self._hook = None
+        self._proc = None
+        self.engine.reset()
@@ -2034,30 +2034,26 @@ class WorldClockTab(QWidget):
             import webbrowser
             from urllib.parse import quote
             
+            from templating import render_template
+            
             # Get available parameters for substitution
             param_mapping = {
-                '%wc_city_name%': widget.city_name,
-                '%wc_timezone%': widget.timezone_name,
-                '%wc_local_time%': self.current_time.strftime('%Y-%m-%d %H:%M'),
-                '%wc_target_time%': widget.get_target_time().strftime('%Y-%m-%d %H:%M'),
-                '%wc_date%': self.current_time.strftime('%Y-%m-%d'),
-                '%wc_time%': self.current_time.strftime('%H:%M'),
-                '%wc_year%': str(self.current_time.year),
-                '%wc_month%': str(self.current_time.month).zfill(2),
-                '%wc_day%': str(self.current_time.day).zfill(2),
-                '%wc_hour%': str(self.current_time.hour).zfill(2),
-                '%wc_minute%': str(self.current_time.minute).zfill(2),
+                'wc_city_name': widget.city_name,
+                'wc_timezone': widget.timezone_name,
+                'wc_local_time': self.current_time.strftime('%Y-%m-%d %H:%M'),
+                'wc_target_time': widget.get_target_time().strftime('%Y-%m-%d %H:%M'),
+                'wc_date': self.current_time.strftime('%Y-%m-%d'),
+                'wc_time': self.current_time.strftime('%H:%M'),
+                'wc_year': str(self.current_time.year),
+                'wc_month': str(self.current_time.month).zfill(2),
+                'wc_day': str(self.current_time.day).zfill(2),
+                'wc_hour': str(self.current_time.hour).zfill(2),
+                'wc_minute': str(self.current_time.minute).zfill(2),
             }
             
-            # Substitute parameters in URL
-            final_url = url
-            for param, value in param_mapping.items():
-                final_url = final_url.replace(param, str(value))
-            
-            # Substitute parameters in parameters string
-            final_params = parameters
-            for param, value in param_mapping.items():
-                final_params = final_params.replace(param, str(value))
+            # Substitute parameters in URL and parameters string (single pass each)
+            final_url = render_template(url, param_mapping)
+            final_params = render_template(parameters, param_mapping)
             
             # Remove leading slash if present (common when users want to append to URL path)
             if final_params.startswith('/'):